@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget for the Streamlit dashboard.
+
+Usage:
+  python3 benchmarks/cold_start.py [--rows 50] [--repeat 3] [--json]
+
+Each sample runs in a fresh interpreter, so nothing is cached between samples. A sample records:
+
+- import:    `import streamlit` plus the modules the app imports at the top (dashboard.*, compact_rows);
+             page- and panel-specific ones (alerts, analytics, regional, snapshot) are
+             left to the first run, which pays for them as a real cold start does;
+- first run: the first dashboard script run under Streamlit's AppTest, i.e. first paint;
+- rerun:     a second run in the same process, as on every widget interaction;
+- whether the XLSX parser (`parse_xlsx`) was imported; a dashboard view must not need it.
+
+The medians are compared against the budgets below (override with --budget-*).
+The script exits with status 1 when a budget is exceeded or the parser was loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synth import rank_document, satisfaction_document  # noqa: E402
+
+BUDGET_IMPORT_MS = 1500.0
+BUDGET_FIRST_RUN_MS = 1500.0
+BUDGET_RERUN_MS = 600.0
+
+# Runs in the child interpreter; prints one JSON line
+_SAMPLE = r"""
+import json, sys, time
+root = sys.argv[1]
+t0 = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+sys.path.insert(0, root)
+sys.path.insert(0, root + "/server/scripts")
+import compact_rows, dashboard.components, dashboard.leaderboard, dashboard.profiling, dashboard.storage, dashboard.theme
+t1 = time.perf_counter()
+at = AppTest.from_file(root + "/streamlit_app.py", default_timeout=120)
+at.run()
+t2 = time.perf_counter()
+at.run()
+t3 = time.perf_counter()
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "first_run_ms": (t2 - t1) * 1000,
+    "rerun_ms": (t3 - t2) * 1000,
+    "parser_loaded": "parse_xlsx" in sys.modules,
+}))
+"""
+
+
+def sample(storage_dir: str) -> Dict[str, float]:
+    env = dict(os.environ, DASHBOARD_STORAGE_DIR=storage_dir)
+    out = subprocess.run(
+        [sys.executable, "-c", _SAMPLE, str(ROOT)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--rows", type=int, default=50, help="advisors and technicians in the sample documents")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--budget-import-ms", type=float, default=BUDGET_IMPORT_MS)
+    p.add_argument("--budget-first-run-ms", type=float, default=BUDGET_FIRST_RUN_MS)
+    p.add_argument("--budget-rerun-ms", type=float, default=BUDGET_RERUN_MS)
+    p.add_argument("--json", action="store_true", help="print a machine-readable report")
+    args = p.parse_args(argv[1:])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = {
+            "latest.json": rank_document(args.rows),
+            "technicians.json": rank_document(args.rows, seed=11),
+            "satisfaction_score.json": satisfaction_document(),
+        }
+        for name, doc in docs.items():
+            (Path(tmp) / name).write_text(json.dumps(doc), encoding="utf-8")
+        samples = [sample(tmp) for _ in range(args.repeat)]
+
+    budgets = {
+        "import_ms": args.budget_import_ms,
+        "first_run_ms": args.budget_first_run_ms,
+        "rerun_ms": args.budget_rerun_ms,
+    }
+    report = {
+        "rows": args.rows,
+        "samples": len(samples),
+        "parser_loaded": any(s["parser_loaded"] for s in samples),
+        "metrics": {},
+    }
+    ok = not report["parser_loaded"]
+    for name, budget in budgets.items():
+        median = statistics.median(s[name] for s in samples)
+        within = median <= budget
+        ok = ok and within
+        report["metrics"][name] = {"median": round(median, 1), "budget": budget, "ok": within}
+    report["ok"] = ok
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, m in report["metrics"].items():
+            flag = "ok" if m["ok"] else "OVER BUDGET"
+            print(f"{name:<13} {m['median']:>8.1f} ms  (budget {m['budget']:.0f} ms)  {flag}")
+        print(f"{'parser':<13} {'loaded' if report['parser_loaded'] else 'not loaded':>11}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Parse time with and without column projection (`parse_xlsx_bytes(columns=...)`).
+
+Usage:
+  python3 benchmarks/column_projection.py [--rows 500 5000 50000] [--repeat 3]
+
+The projection is the TV-mode set: Employee, Rank, Satisfaction Score and the three
+KPIs on the collapsed advisor card. Each projected document is checked against the
+full parse restricted to the same columns; the script exits with status 1 on a mismatch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(ROOT / "server" / "scripts"))
+from parse_xlsx import parse_xlsx_bytes  # noqa: E402
+from synth import rank_workbook  # noqa: E402
+from xlsx_backends import BACKENDS  # noqa: E402
+
+TV_COLUMNS = [
+    "Employee",
+    "Rank",
+    "Satisfaction Score",
+    "Fixed right first time",
+    "Spoke to advisor immediately",
+    "Kept informed",
+]
+
+
+def projected_matches(full: Dict[str, Any], projected: Dict[str, Any]) -> bool:
+    cols = projected["dataset"]["columns"]
+    expected = [{c: row[c] for c in cols} for row in full["dataset"]["rows"]]
+    return [dict(r) for r in projected["dataset"]["rows"]] == expected and projected["fieldTypes"] == {
+        c: full["fieldTypes"][c] for c in cols
+    }
+
+
+def median_seconds(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--rows", type=int, nargs="+", default=[500, 5000, 50000])
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(argv[1:])
+
+    ok = True
+    print(f"{'rows':>6}  {'backend':<7}  {'all columns':>12}  {'projected':>10}  {'speedup':>7}  match")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            path = Path(tmp) / f"rank_{n}.xlsx"
+            rank_workbook(path, n)
+            data = path.read_bytes()
+            for backend in BACKENDS:
+                same = projected_matches(
+                    parse_xlsx_bytes(data, backend=backend),
+                    parse_xlsx_bytes(data, backend=backend, columns=TV_COLUMNS),
+                )
+                ok = ok and same
+                full = median_seconds(lambda: parse_xlsx_bytes(data, backend=backend), args.repeat)
+                proj = median_seconds(lambda: parse_xlsx_bytes(data, backend=backend, columns=TV_COLUMNS), args.repeat)
+                print(
+                    f"{n:>6}  {backend:<7}  {full * 1000:>9.0f} ms  {proj * 1000:>7.0f} ms  {full / proj:>6.1f}x  "
+                    f"{'yes' if same else 'NO'}"
+                )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
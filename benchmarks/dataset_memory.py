@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare the memory held by a parsed export as row dicts vs. `CompactRows`.
+
+Usage:
+  python3 benchmarks/dataset_memory.py [--rows 500 5000 50000]
+
+A synthesized regional Service Employee Rank document is loaded from JSON both ways,
+along the path `dashboard.storage` takes: `json.loads` alone for the dicts, and
+`json.loads` then `compact_document` for `CompactRows`. Each build is traced with
+tracemalloc from the same JSON text, so the compact peak includes the row dicts it
+starts from and the per-column lists `CompactRows.from_rows` fills before packing
+them. Reported per representation: memory retained once built, and the peak while
+building.
+
+Both peaks are set by `json.loads` materializing the row dicts. `compact_document`
+releases each dict as its values are copied out, so CompactRows peaks no higher than
+the dicts (within a few KB) and then retains about 2-2.5x less.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "server" / "scripts"))
+from compact_rows import compact_document  # noqa: E402
+from synth import rank_document  # noqa: E402
+
+
+def synth_json(n: int) -> str:
+    return json.dumps(rank_document(n))
+
+
+def measure(build: Callable[[], Any]) -> Tuple[int, int]:
+    """Return (retained bytes, peak bytes) allocated while building."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current, peak
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--rows", type=int, nargs="+", default=[500, 5000, 50000])
+    args = p.parse_args(argv[1:])
+
+    print(
+        f"{'rows':>8}  {'dicts retained':>15}  {'dicts peak':>11}  "
+        f"{'compact retained':>16}  {'compact peak':>13}  {'retained ratio':>14}"
+    )
+    for n in args.rows:
+        raw = synth_json(n)
+        dict_retained, dict_peak = measure(lambda: json.loads(raw))
+        compact_retained, compact_peak = measure(lambda: compact_document(json.loads(raw)))
+        print(
+            f"{n:>8}  {dict_retained / 1e6:>12.2f} MB  {dict_peak / 1e6:>8.2f} MB  "
+            f"{compact_retained / 1e6:>13.2f} MB  {compact_peak / 1e6:>10.2f} MB  "
+            f"{dict_retained / max(compact_retained, 1):>13.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Initial render time and memory of the Streamlit leaderboard at growing roster sizes.
+
+Usage:
+  python3 benchmarks/leaderboard_render.py [--rows 50 500 5000] [--repeat 3]
+
+Each size is published as advisor + technician documents in a temporary storage
+directory (DASHBOARD_STORAGE_DIR) and the app is run headless with Streamlit's
+AppTest, once paged (the default page size) and once with ?page_size=0, which
+renders every card as the dashboard used to. Reported per run: median wall time of
+the first script run, peak Python allocation (tracemalloc) and elements emitted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synth import rank_document, satisfaction_document  # noqa: E402
+
+
+def write_storage(directory: Path, n: int) -> None:
+    docs = {
+        "latest.json": rank_document(n),
+        "technicians.json": rank_document(n, seed=11),
+        "satisfaction_score.json": satisfaction_document(),
+    }
+    for name, doc in docs.items():
+        (directory / name).write_text(json.dumps(doc), encoding="utf-8")
+
+
+def render_once(page_size: str) -> Tuple[float, int, int]:
+    """Return (seconds, peak bytes, element count) for one cold script run."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "streamlit_app.py"), default_timeout=600)
+    if page_size:
+        at.query_params["page_size"] = page_size
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed, peak, len(at.markdown) + len(at.button)
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--rows", type=int, nargs="+", default=[50, 500, 5000])
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(argv[1:])
+
+    modes: Dict[str, str] = {"paged": "", "all rows": "0"}
+    # Warm-up so the first timed run does not pay for importing Streamlit and the app
+    with tempfile.TemporaryDirectory() as tmp:
+        write_storage(Path(tmp), min(args.rows))
+        os.environ["DASHBOARD_STORAGE_DIR"] = tmp
+        render_once("")
+
+    print(f"{'rows':>6}  {'mode':<9}  {'first run':>10}  {'peak alloc':>11}  {'elements':>8}")
+    for n in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_storage(Path(tmp), n)
+            os.environ["DASHBOARD_STORAGE_DIR"] = tmp
+            for mode, page_size in modes.items():
+                runs = [render_once(page_size) for _ in range(args.repeat)]
+                seconds = statistics.median(r[0] for r in runs)
+                peak = max(r[1] for r in runs)
+                print(f"{n:>6}  {mode:<9}  {seconds * 1000:>7.0f} ms  {peak / 1e6:>8.1f} MB  {runs[0][2]:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Load test for the dashboard server (`server/src/index.js`): TVs polling plus uploads.
+
+Usage:
+  python3 benchmarks/load_test.py [--displays 20] [--poll 2] [--uploads-per-min 6]
+                                  [--duration 30] [--dealers 1] [--rows 200]
+                                  [--url http://localhost:5179] [--pid N]
+                                  [--save report.json] [--compare previous.json] [--json]
+                                  [--budget-p95-ms N]
+
+Without --url a private server is started (`node server/src/index.js`) on a free port
+with a scratch DASHBOARD_STORAGE_DIR, so the real `storage/` is never touched; `npm
+install` must have been run in `server/`. Everything runs on this machine.
+
+- displays: each polls `GET /api/dealers/<id>/data` every --poll seconds (with jitter),
+  spread over --dealers synthetic dealers, like a TV reloading its dashboard;
+- uploads:  synthetic Employee Rank workbooks (`synth.rank_workbook`, a new seed each
+  time so the server cannot skip the parse) are posted to `/api/upload` at
+  --uploads-per-min;
+- server RSS is sampled from the server process (the one started here, or --pid).
+
+The server has no event stream; displays reload by polling, which is what is simulated.
+The report has p50/p95/p99/max latency, throughput and errors per route, and RSS;
+--save writes it as JSON and --compare prints the change against a saved report, for
+comparisons between releases. With --budget-p95-ms the script exits with status 1
+when the data route's p95 is over budget or any request failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synth import rank_workbook  # noqa: E402
+
+SERVER_SCRIPT = ROOT / "server" / "src" / "index.js"
+STARTUP_TIMEOUT_S = 30.0
+REQUEST_TIMEOUT_S = 60.0
+# Workbook variants generated per dealer; uploads cycle through them
+UPLOAD_VARIANTS = 4
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of `pid` in MB, or None where it can't be read."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True, check=True).stdout
+        return int(out.strip()) / 1024
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class Recorder:
+    """Latency, status and size of every request, per route; shared by all workers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.bytes: Dict[str, int] = defaultdict(int)
+
+    def add(self, route: str, seconds: float, status: str, size: int = 0) -> None:
+        with self._lock:
+            self.latencies[route].append(seconds * 1000)
+            self.statuses[route][status] += 1
+            self.bytes[route] += size
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        with self._lock:
+            for route, values in sorted(self.latencies.items()):
+                ordered = sorted(values)
+                statuses = self.statuses[route]
+                errors = sum(n for status, n in statuses.items() if not status.startswith("2"))
+                out[route] = {
+                    "requests": len(ordered),
+                    "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+                    "errors": errors,
+                    "error_rate": round(errors / len(ordered), 4) if ordered else 0.0,
+                    "statuses": dict(sorted(statuses.items())),
+                    "p50_ms": round(percentile(ordered, 0.50), 1),
+                    "p95_ms": round(percentile(ordered, 0.95), 1),
+                    "p99_ms": round(percentile(ordered, 0.99), 1),
+                    "max_ms": round(ordered[-1], 1) if ordered else 0.0,
+                    "mean_bytes": round(self.bytes[route] / len(ordered)) if ordered else 0,
+                }
+        return out
+
+
+class Client:
+    """One keep-alive connection, reopened after errors (as a browser would)."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.conn: Optional[http.client.HTTPConnection] = None
+
+    def request(self, method: str, path: str, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT_S)
+        try:
+            self.conn.request(method, path, body=body or None, headers=headers or {})
+            resp = self.conn.getresponse()
+            return resp.status, resp.read()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def timed(client: Client, recorder: Recorder, route: str, method: str, path: str, **kwargs: Any) -> Optional[bytes]:
+    t0 = time.perf_counter()
+    try:
+        status, body = client.request(method, path, **kwargs)
+    except (OSError, http.client.HTTPException) as e:
+        recorder.add(route, time.perf_counter() - t0, type(e).__name__)
+        return None
+    recorder.add(route, time.perf_counter() - t0, str(status), len(body))
+    return body if 200 <= status < 300 else None
+
+
+def multipart(filename: str, payload: bytes) -> Tuple[bytes, Dict[str, str]]:
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n\r\n"
+    ).encode()
+    body = head + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"Content-Type": f"multipart/form-data; boundary={boundary}", "Content-Length": str(len(body))}
+
+
+def dealer_level(i: int) -> Tuple[str, str]:
+    """(dealer id, Level filter) of synthetic dealer `i`; the id is what the parser derives."""
+    ident = str(426085 + i)
+    return ident, f"{ident} - Load Test Dealer {i}"
+
+
+def make_workbooks(directory: Path, dealers: int, rows: int) -> Dict[str, List[bytes]]:
+    """UPLOAD_VARIANTS workbooks per dealer id, each with different scores."""
+    books: Dict[str, List[bytes]] = {}
+    for i in range(dealers):
+        ident, level = dealer_level(i)
+        books[ident] = []
+        for v in range(UPLOAD_VARIANTS):
+            path = directory / f"{ident}-{v}.xlsx"
+            rank_workbook(path, rows, seed=1000 * i + v, level=level)
+            books[ident].append(path.read_bytes())
+    return books
+
+
+def start_server(storage_dir: Path) -> Tuple[subprocess.Popen, str]:
+    node = shutil.which("node")
+    if node is None:
+        raise SystemExit("node is not on PATH; pass --url to test a server that is already running")
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port), DASHBOARD_STORAGE_DIR=str(storage_dir))
+    proc = subprocess.Popen(
+        [node, str(SERVER_SCRIPT)],
+        cwd=str(ROOT / "server"),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    client = Client(base_url)
+    deadline = time.monotonic() + STARTUP_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"server exited during startup:\n{proc.stderr.read() if proc.stderr else ''}")
+        try:
+            if client.request("GET", "/api/health")[0] == 200:
+                client.close()
+                return proc, base_url
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit(f"server did not answer /api/health within {STARTUP_TIMEOUT_S:.0f} s")
+
+
+def run_load(args: argparse.Namespace, base_url: str, pid: Optional[int], books: Dict[str, List[bytes]]) -> Dict[str, Any]:
+    recorder = Recorder()
+    dealers = sorted(books)
+
+    # Every dealer needs a document before the displays start
+    seeder = Client(base_url)
+    for ident in dealers:
+        body, headers = multipart(f"{ident}.xlsx", books[ident][0])
+        if timed(seeder, recorder, "seed", "POST", "/api/upload", body=body, headers=headers) is None:
+            raise SystemExit(f"seeding dealer {ident} failed: {dict(recorder.statuses['seed'])}")
+    seeder.close()
+
+    stop = threading.Event()
+    rss: List[float] = []
+    rss_start = rss_mb(pid) if pid else None
+
+    def display(i: int) -> None:
+        rnd = random.Random(i)
+        client = Client(base_url)
+        path = f"/api/dealers/{dealers[i % len(dealers)]}/data"
+        # Displays don't all start in the same instant
+        if stop.wait(rnd.uniform(0, args.poll)):
+            return
+        while not stop.is_set():
+            timed(client, recorder, "data", "GET", path)
+            stop.wait(args.poll * rnd.uniform(0.9, 1.1))
+        client.close()
+
+    def uploader() -> None:
+        client = Client(base_url)
+        interval = 60.0 / args.uploads_per_min
+        n = 0
+        while not stop.wait(interval):
+            n += 1
+            ident = dealers[n % len(dealers)]
+            body, headers = multipart(f"{ident}.xlsx", books[ident][n % UPLOAD_VARIANTS])
+            timed(client, recorder, "upload", "POST", "/api/upload", body=body, headers=headers)
+        client.close()
+
+    def sampler() -> None:
+        while pid and not stop.wait(0.5):
+            value = rss_mb(pid)
+            if value is not None:
+                rss.append(value)
+
+    workers = [threading.Thread(target=display, args=(i,), daemon=True) for i in range(args.displays)]
+    if args.uploads_per_min > 0:
+        workers.append(threading.Thread(target=uploader, daemon=True))
+    workers.append(threading.Thread(target=sampler, daemon=True))
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    time.sleep(args.duration)
+    stop.set()
+    for w in workers:
+        w.join(REQUEST_TIMEOUT_S)
+    elapsed = time.perf_counter() - started
+
+    routes = recorder.summary(elapsed)
+    routes.pop("seed", None)
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "routes": routes,
+        "rss_mb": {
+            "start": round(rss_start, 1) if rss_start is not None else None,
+            "peak": round(max(rss), 1) if rss else None,
+            "end": round(rss[-1], 1) if rss else None,
+            "median": round(statistics.median(rss), 1) if rss else None,
+        },
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{report['config']['displays']} displays, {report['config']['uploads_per_min']} uploads/min, {report['elapsed_s']:.0f} s")
+    print(f"{'route':<8} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+    for route, r in report["routes"].items():
+        print(
+            f"{route:<8} {r['requests']:>7} {r['throughput_rps']:>8.1f} {100 * r['error_rate']:>6.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}"
+        )
+        failed = {s: n for s, n in r["statuses"].items() if not s.startswith("2")}
+        if failed:
+            print(f"{'':<8} failed: {failed}")
+    rss = report["rss_mb"]
+    if rss["peak"] is not None:
+        print(f"server RSS  start {rss['start']} MB, peak {rss['peak']} MB, end {rss['end']} MB")
+
+
+def print_comparison(report: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    print(f"\nvs {previous.get('revision') or 'previous'} ({previous.get('createdAt', '?')})")
+    for route, r in report["routes"].items():
+        before = previous.get("routes", {}).get(route)
+        if not before:
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "error_rate"):
+            old, new = before.get(key), r.get(key)
+            if old:
+                changes.append(f"{key} {old} -> {new} ({100 * (new - old) / old:+.0f}%)")
+            elif old is not None:
+                changes.append(f"{key} {old} -> {new}")
+        print(f"{route:<8} " + ", ".join(changes))
+    old_peak, new_peak = previous.get("rss_mb", {}).get("peak"), report["rss_mb"]["peak"]
+    if old_peak and new_peak:
+        print(f"{'rss':<8} peak {old_peak} -> {new_peak} MB ({100 * (new_peak - old_peak) / old_peak:+.0f}%)")
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--displays", type=int, default=20, help="polling TVs to simulate")
+    p.add_argument("--poll", type=float, default=2.0, help="seconds between a display's requests")
+    p.add_argument("--uploads-per-min", type=float, default=6.0, help="upload rate (0 = no uploads)")
+    p.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    p.add_argument("--dealers", type=int, default=1, help="synthetic dealers the displays are spread over")
+    p.add_argument("--rows", type=int, default=200, help="advisors in each synthetic workbook")
+    p.add_argument("--url", default=None, help="test a running server instead of starting one")
+    p.add_argument("--pid", type=int, default=None, help="process to sample RSS from when --url is given")
+    p.add_argument("--save", type=Path, default=None, help="write the report as JSON")
+    p.add_argument("--compare", type=Path, default=None, help="a report saved earlier with --save")
+    p.add_argument("--budget-p95-ms", type=float, default=None, help="fail when the data route's p95 is over this")
+    p.add_argument("--json", action="store_true", help="print a machine-readable report")
+    args = p.parse_args(argv[1:])
+    if args.displays < 1 or args.dealers < 1 or args.poll <= 0 or args.duration <= 0:
+        p.error("--displays and --dealers must be at least 1; --poll and --duration must be positive")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        books = make_workbooks(Path(tmp), args.dealers, args.rows)
+        server = None
+        pid = args.pid
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            server, base_url = start_server(Path(tmp) / "storage")
+            pid = server.pid
+        try:
+            result = run_load(args, base_url, pid, books)
+        finally:
+            if server is not None:
+                server.terminate()
+                try:
+                    server.wait(10)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+
+    report = {
+        "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "platform": {"system": platform.system(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {
+            "displays": args.displays,
+            "poll_s": args.poll,
+            "uploads_per_min": args.uploads_per_min,
+            "duration_s": args.duration,
+            "dealers": args.dealers,
+            "rows": args.rows,
+            "external": bool(args.url),
+        },
+        **result,
+    }
+    data = report["routes"].get("data", {})
+    ok = not any(r["errors"] for r in report["routes"].values())
+    if args.budget_p95_ms is not None:
+        ok = ok and data.get("p95_ms", 0.0) <= args.budget_p95_ms
+    report["ok"] = ok
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        if args.compare:
+            print_comparison(report, json.loads(args.compare.read_text(encoding="utf-8")))
+    return 0 if ok or args.budget_p95_ms is None else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Compare reading on-disk exports through mmap vs. a buffered file in `parse_xlsx.py`.
+
+Usage:
+  python3 benchmarks/mmap_input.py [--rows 5000 50000] [--repeat 3]
+
+For each synthetic Employee Rank export, and for each input mode (mmap, the default,
+or `--no-mmap`), this reports:
+
+- members: in-process time to inflate every zip member, i.e. the I/O part alone;
+- warm:    a full `parse_xlsx.py` run with the file already in the page cache,
+  as when the same export is parsed repeatedly;
+- cold:    the same run after evicting the file from the page cache
+  (posix_fadvise DONTNEED; Linux only, skipped elsewhere).
+
+Full runs are separate processes, like the server's parser pool. Reported per run:
+median wall time and the child's peak RSS.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "server" / "scripts" / "parse_xlsx.py"
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(SCRIPT.parent))
+from parse_xlsx import _open_workbook  # noqa: E402
+from synth import rank_workbook  # noqa: E402
+
+MODES = {"mmap": [], "buffered": ["--no-mmap"]}
+
+
+def evict(path: Path) -> bool:
+    """Drop a file's pages from the page cache; False where that isn't supported."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def inflate_members(path: Path, use_mmap: bool) -> float:
+    t0 = time.perf_counter()
+    with _open_workbook(path, use_mmap=use_mmap) as z:
+        for name in z.namelist():
+            with z.open(name) as f:
+                while f.read(1 << 16):
+                    pass
+    return time.perf_counter() - t0
+
+
+def parse_run(path: Path, out: Path, extra: List[str]) -> Tuple[float, int]:
+    """Run the parser once; return (seconds, peak RSS in bytes)."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(SCRIPT), str(path), str(out), *extra])
+    _pid, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - t0
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise RuntimeError(f"parse_xlsx.py exited with {proc.returncode}")
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return elapsed, rss
+
+
+def summarize(runs: List[Tuple[float, int]]) -> str:
+    seconds = statistics.median(r[0] for r in runs)
+    rss = max(r[1] for r in runs)
+    return f"{seconds * 1000:>8.0f} ms {rss / 1e6:>6.0f} MB"
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--rows", type=int, nargs="+", default=[5000, 50000])
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(argv[1:])
+
+    print(f"{'rows':>6}  {'size':>7}  {'mode':<8}  {'members':>9}  {'warm (wall, rss)':>18}  {'cold (wall, rss)':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            path = Path(tmp) / f"rank_{n}.xlsx"
+            out = Path(tmp) / "out.json"
+            rank_workbook(path, n)
+            size = path.stat().st_size
+            for mode, extra in MODES.items():
+                use_mmap = not extra
+                inflate_members(path, use_mmap)
+                members = statistics.median(inflate_members(path, use_mmap) for _ in range(args.repeat))
+                warm = [parse_run(path, out, extra) for _ in range(args.repeat)]
+                cold: Optional[List[Tuple[float, int]]] = []
+                for _ in range(args.repeat):
+                    if not evict(path):
+                        cold = None
+                        break
+                    cold.append(parse_run(path, out, extra))
+                print(
+                    f"{n:>6}  {size / 1e6:>5.1f}MB  {mode:<8}  {members * 1000:>6.1f} ms  {summarize(warm):>18}  "
+                    f"{summarize(cold) if cold else 'n/a':>18}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
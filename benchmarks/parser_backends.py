@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Check the XLSX reader backends against each other and time them side by side.
+
+Usage:
+  python3 benchmarks/parser_backends.py [--rows 500 5000 50000] [--repeat 5]
+
+Every workbook (the sample export in the repo root, synthetic Employee Rank exports of
+each size, and a small workbook of edge cases: rich text, phonetic runs, inline
+strings, formulas, entities, missing cell refs) is read with each backend in
+`xlsx_backends.BACKENDS`. The script exits with status 1 if any backend's shared
+strings or sheet rows differ from the `etree` reference. Reported per backend: median
+time to read every sheet and peak Python allocation while doing so.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from typing import Any, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(ROOT / "server" / "scripts"))
+from parse_xlsx import _parse_workbook_sheets  # noqa: E402
+from synth import rank_workbook  # noqa: E402
+from xlsx_backends import BACKENDS, DEFAULT_LIMITS, XlsxBackend  # noqa: E402
+
+REFERENCE = "etree"
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_EDGE_SHARED = (
+    f'<sst xmlns="{_MAIN_NS}">'
+    "<si><t>Employee</t></si>"
+    '<si><r><rPr><b/></rPr><t>Ra</t></r><r><t xml:space="preserve">nk </t></r></si>'
+    "<si><t>Jos&#233; &amp; Ann&#233;e &lt;3</t><rPh sb=\"0\" eb=\"1\"><t>ph</t></rPh></si>"
+    "<si><t/></si>"
+    "</sst>"
+)
+_EDGE_SHEET = (
+    f'<worksheet xmlns="{_MAIN_NS}"><sheetPr/><dimension ref="A1:D5"/><sheetData>'
+    '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="C1" t="s"><v>1</v></c></row>'
+    '<row r="2"><c r="A2" t="s"><v>2</v></c><c r="B2"><f>SUM(1,2)</f><v>3</v></c>'
+    '<c r="C2" t="inlineStr"><is><t>inline</t></is></c><c r="D2" t="s"><v>3</v></c></row>'
+    '<row r="3"/>'
+    '<row r="4"><c t="s"><v>0</v></c><c r="AB4" t="str"><v>  spaced  </v></c><c r="B4" t="s"><v>99</v></c>'
+    '<c r="C4"><v></v></c><c r="D4" t="e"><v>#N/A</v></c></row>'
+    '<row r="5"><c r="A5" t="s"><v>x</v></c><c r="B5"><v>1</v><v>2</v></c></row>'
+    '</sheetData><mergeCells count="0"/></worksheet>'
+)
+
+
+def edge_case_workbook(path: Path) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{_MAIN_NS}" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        )
+        z.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="worksheet" Target="worksheets/sheet1.xml"/></Relationships>',
+        )
+        z.writestr("xl/worksheets/sheet1.xml", _EDGE_SHEET)
+        z.writestr("xl/sharedStrings.xml", _EDGE_SHARED)
+
+
+def read_all(path: Path, backend: XlsxBackend) -> Tuple[List[str], List[Any]]:
+    with zipfile.ZipFile(path) as z:
+        shared = backend.shared_strings(z)
+        return shared, [backend.sheet_rows(z, p, shared) for _name, p in _parse_workbook_sheets(z, DEFAULT_LIMITS)]
+
+
+def timed(path: Path, backend: XlsxBackend, repeat: int) -> Tuple[float, int]:
+    seconds = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        read_all(path, backend)
+        seconds.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    read_all(path, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(seconds), peak
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--rows", type=int, nargs="+", default=[500, 5000, 50000])
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args(argv[1:])
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        books: List[Tuple[str, Path]] = [(f.name[:40], f) for f in sorted(ROOT.glob("*.xlsx"))]
+        edge = Path(tmp) / "edge.xlsx"
+        edge_case_workbook(edge)
+        books.append(("edge cases", edge))
+        for n in args.rows:
+            path = Path(tmp) / f"rank_{n}.xlsx"
+            rank_workbook(path, n)
+            books.append((f"synthetic {n} rows", path))
+
+        print(f"{'workbook':<42}  {'backend':<7}  {'median':>10}  {'peak alloc':>11}  match")
+        for label, path in books:
+            expected = read_all(path, BACKENDS[REFERENCE])
+            for name, backend in BACKENDS.items():
+                same = read_all(path, backend) == expected
+                ok = ok and same
+                seconds, peak = timed(path, backend, args.repeat)
+                print(
+                    f"{label:<42}  {name:<7}  {seconds * 1000:>7.1f} ms  {peak / 1e6:>8.2f} MB  "
+                    f"{'yes' if same else 'NO'}"
+                )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
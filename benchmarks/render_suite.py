@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Render-path benchmark suite for `streamlit_app.py`, run headless with Streamlit's AppTest.
+
+Usage:
+  python3 benchmarks/render_suite.py [--rows 50 500 2000] [--repeat 3] [--page-size N]
+                                     [--json] [--save report.json]
+                                     [--baseline report.json] [--tolerance 0.25]
+
+For each roster size, advisor, technician and satisfaction documents are published to
+a temporary DASHBOARD_STORAGE_DIR and three scenarios are timed (median of --repeat):
+
+- dashboard: the first script run of a fresh session, then one rerun;
+- upload:    the first run of a session opened on the upload page;
+- expand:    clicking the first advisor's expand button, and clicking it again to
+             collapse (each is one script run, as on a TV remote or mouse click).
+
+Every scenario also counts the elements it emitted, by type (markdown, button,
+columns, ...), so a change that adds work to the render path shows up even when the
+machine is too noisy to time it. --json prints the report and --save writes it; with
+--baseline the script exits with status 1 when a median is slower than the saved one
+by more than --tolerance, or an element count changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synth import rank_document, satisfaction_document  # noqa: E402
+
+SCENARIOS = ("dashboard", "upload", "expand")
+
+
+def write_storage(directory: Path, n: int) -> None:
+    docs = {
+        "latest.json": rank_document(n),
+        "technicians.json": rank_document(n, seed=11),
+        "satisfaction_score.json": satisfaction_document(),
+    }
+    for name, doc in docs.items():
+        (directory / name).write_text(json.dumps(doc), encoding="utf-8")
+
+
+def count_elements(at: Any) -> Dict[str, int]:
+    """Elements in the rendered tree by type; layout blocks are counted as well."""
+    counts: Counter = Counter()
+    stack = [at.main]
+    while stack:
+        node = stack.pop()
+        children = getattr(node, "children", None)
+        if children is not None:
+            stack.extend(children.values())
+            if node is not at.main:
+                counts[f"block:{getattr(node, 'type', 'block')}"] += 1
+        else:
+            counts[getattr(node, "type", type(node).__name__)] += 1
+    return dict(sorted(counts.items()))
+
+
+def new_app(page_size: Optional[str], page: str = "dashboard") -> Any:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "streamlit_app.py"), default_timeout=600)
+    if page_size is not None:
+        at.query_params["page_size"] = page_size
+    at.session_state["page"] = page
+    return at
+
+
+def timed_run(run: Callable[[], Any], at: Any) -> float:
+    t0 = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed * 1000
+
+
+def expand_button(at: Any) -> Any:
+    for button in at.button:
+        if (button.key or "").startswith("expand_"):
+            return button
+    raise RuntimeError("no advisor expand button was rendered")
+
+
+def sample(page_size: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """One sample of every scenario, each in a fresh session."""
+    out: Dict[str, Dict[str, Any]] = {}
+
+    at = new_app(page_size)
+    first = timed_run(at.run, at)
+    elements = count_elements(at)
+    rerun = timed_run(at.run, at)
+    out["dashboard"] = {"first_run_ms": first, "rerun_ms": rerun, "elements": elements}
+
+    at = new_app(page_size, page="upload")
+    first = timed_run(at.run, at)
+    out["upload"] = {"first_run_ms": first, "elements": count_elements(at)}
+
+    at = new_app(page_size)
+    at.run()
+    expand = timed_run(lambda: expand_button(at).click().run(), at)
+    elements = count_elements(at)
+    collapse = timed_run(lambda: expand_button(at).click().run(), at)
+    out["expand"] = {"expand_ms": expand, "collapse_ms": collapse, "elements": elements}
+    return out
+
+
+def summarize(samples: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    report: Dict[str, Dict[str, Any]] = {}
+    for scenario in SCENARIOS:
+        runs = [s[scenario] for s in samples]
+        timings = {k: round(statistics.median(r[k] for r in runs), 1) for k in runs[0] if k.endswith("_ms")}
+        elements = runs[0]["elements"]
+        report[scenario] = {**timings, "elements": elements, "total_elements": sum(elements.values())}
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of `report` against `baseline`, as printable lines."""
+    problems = []
+    for size, scenarios in report["sizes"].items():
+        before_size = baseline.get("sizes", {}).get(size)
+        if not before_size:
+            continue
+        for scenario, result in scenarios.items():
+            before = before_size.get(scenario) or {}
+            for key, value in result.items():
+                old = before.get(key)
+                if key.endswith("_ms") and old and value > old * (1 + tolerance):
+                    problems.append(f"{size} rows {scenario} {key}: {old} -> {value} ms (+{100 * (value / old - 1):.0f}%)")
+            old_total = before.get("total_elements")
+            if old_total is not None and old_total != result["total_elements"]:
+                problems.append(f"{size} rows {scenario} elements: {old_total} -> {result['total_elements']}")
+    return problems
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--rows", type=int, nargs="+", default=[50, 500, 2000])
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--page-size", default=None, help="?page_size= for every run (default: the app's own)")
+    p.add_argument("--json", action="store_true", help="print a machine-readable report")
+    p.add_argument("--save", type=Path, default=None, help="write the report as JSON")
+    p.add_argument("--baseline", type=Path, default=None, help="a report saved earlier with --save")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against --baseline (0.25 = 25%%)")
+    args = p.parse_args(argv[1:])
+
+    # Warm-up so the first timed run does not pay for importing Streamlit and the app
+    with tempfile.TemporaryDirectory() as tmp:
+        write_storage(Path(tmp), min(args.rows))
+        os.environ["DASHBOARD_STORAGE_DIR"] = tmp
+        sample(args.page_size)
+
+    report: Dict[str, Any] = {
+        "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "repeat": args.repeat,
+        "page_size": args.page_size,
+        "sizes": {},
+    }
+    for n in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_storage(Path(tmp), n)
+            os.environ["DASHBOARD_STORAGE_DIR"] = tmp
+            report["sizes"][str(n)] = summarize([sample(args.page_size) for _ in range(args.repeat)])
+
+    problems = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance) if args.baseline else []
+    report["regressions"] = problems
+    report["ok"] = not problems
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'rows':>6}  {'scenario':<9}  {'timings (median ms)':<38}  {'elements':>8}")
+        for size, scenarios in report["sizes"].items():
+            for scenario, result in scenarios.items():
+                timings = ", ".join(f"{k[:-3]} {v:.0f}" for k, v in result.items() if k.endswith("_ms"))
+                print(f"{size:>6}  {scenario:<9}  {timings:<38}  {result['total_elements']:>8}")
+        for line in problems:
+            print(f"REGRESSION  {line}")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
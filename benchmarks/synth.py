@@ -0,0 +1,170 @@
+"""
+Synthetic Tekion-style documents and workbooks for the benchmarks in this folder.
+
+`advisor_rows` / `rank_document` mimic what `parse_xlsx.py` produces for a Service
+Employee Rank export; `satisfaction_document` mimics the Satisfaction Score summary.
+`rank_workbook` / `satisfaction_workbook` write the matching `.xlsx` inputs.
+Everything is seeded so runs are comparable between releases.
+"""
+
+from __future__ import annotations
+
+import random
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Union
+from xml.sax.saxutils import escape, quoteattr
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+KPIS = [
+    "Fixed right first time",
+    "Spoke to advisor immediately",
+    "Desired appointment date",
+    "Kept informed",
+    "Vehicle ready when promised",
+    "Work performed explained",
+    "Advisor reviewed MPI",
+    "Vehicle settings unchanged",
+    "Vehicle returned cleaner",
+    "Paperwork <7 minutes",
+    "Advisor provided video",
+    "Escorted to vehicle",
+]
+COLUMNS = [
+    "Employee",
+    "Dealer",
+    "Area",
+    "Region",
+    "Total Records",
+    "Completes",
+    "Satisfaction Score",
+    "Rank",
+    "Impact",
+] + KPIS
+FIELD_TYPES: Dict[str, str] = {c: "number" for c in COLUMNS[1:9]}
+FIELD_TYPES.update({"Employee": "string", "Area": "string", "Region": "string"})
+FIELD_TYPES.update({k: "percent" for k in KPIS})
+
+
+def advisor_rows(n: int, seed: int = 7, dealers: int = 40) -> List[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    scores = sorted((round(rnd.uniform(600, 1000), 1) for _ in range(n)), reverse=True)
+    rows = []
+    for i in range(n):
+        row: Dict[str, Any] = {
+            "Employee": f"ADVISOR {i:05d}",
+            "Dealer": 426000 + i % dealers,
+            "Area": f"{i % 9}F",
+            "Region": ["PAR", "NE", "SW"][i % 3],
+            "Total Records": rnd.randint(10, 200),
+            "Completes": rnd.randint(1, 30),
+            "Satisfaction Score": scores[i],
+            "Rank": i + 1,
+            "Impact": rnd.randint(-20, 20),
+        }
+        for k in KPIS:
+            row[k] = rnd.choice([0.0, 25.0, 50.0, 66.7, 75.0, 100.0])
+        rows.append(row)
+    rnd.shuffle(rows)
+    return rows
+
+
+def rank_document(n: int, seed: int = 7, level: str = "426085 - Stevens Creek Volkswagen") -> Dict[str, Any]:
+    return {
+        "meta": {
+            "Exported": "Dec 22 2025  5:17:17:583PM",
+            "Period Type": "1D",
+            "Level": level,
+            "Exported Raw": "Dec 22 2025  5:17:17:583PM",
+        },
+        "dataset": {"title": "Service Employee Rank", "columns": list(COLUMNS), "rows": advisor_rows(n, seed)},
+        "fieldTypes": dict(FIELD_TYPES),
+        "source": {"dataSheet": "Data", "filtersSheet": "Filters"},
+        "generatedAt": "2025-12-23T01:17:17Z",
+    }
+
+
+def satisfaction_document() -> Dict[str, Any]:
+    return {"score": 901.2, "national": 880.5, "region": 890.1, "area": 870.2, "generatedAt": "2025-12-23T01:17:17Z"}
+
+
+def _column_letters(i: int) -> str:
+    out = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        out = chr(65 + r) + out
+    return out
+
+
+Cell = Union[str, int, float, None]
+
+
+def write_workbook(path: Union[str, Path], sheets: Sequence[Tuple[str, Sequence[Sequence[Cell]]]]) -> None:
+    """Write a minimal .xlsx: strings go to the shared-strings table, numbers inline."""
+    shared: List[str] = []
+    index: Dict[str, int] = {}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        rels, entries = [], []
+        for n, (name, rows) in enumerate(sheets, 1):
+            out = [f'<?xml version="1.0" encoding="UTF-8"?><worksheet xmlns="{_MAIN_NS}"><sheetData>']
+            for r, row in enumerate(rows, 1):
+                out.append(f'<row r="{r}">')
+                for c, v in enumerate(row):
+                    if v == "" or v is None:
+                        continue
+                    ref = f"{_column_letters(c)}{r}"
+                    if isinstance(v, str):
+                        if v not in index:
+                            index[v] = len(shared)
+                            shared.append(v)
+                        out.append(f'<c r="{ref}" t="s"><v>{index[v]}</v></c>')
+                    else:
+                        out.append(f'<c r="{ref}"><v>{v}</v></c>')
+                out.append("</row>")
+            out.append("</sheetData></worksheet>")
+            z.writestr(f"xl/worksheets/sheet{n}.xml", "".join(out))
+            rels.append(f'<Relationship Id="rId{n}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{n}.xml"/>')
+            entries.append(f'<sheet name={quoteattr(name)} sheetId="{n}" r:id="rId{n}"/>')
+        z.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>{"".join(entries)}</sheets></workbook>',
+        )
+        z.writestr("xl/_rels/workbook.xml.rels", f'<Relationships xmlns="{_PKG_REL_NS}">{"".join(rels)}</Relationships>')
+        z.writestr(
+            "xl/sharedStrings.xml",
+            f'<sst xmlns="{_MAIN_NS}">' + "".join(f"<si><t>{escape(v)}</t></si>" for v in shared) + "</sst>",
+        )
+
+
+def _filters_sheet(level: str) -> List[List[Cell]]:
+    return [
+        ["Parameters"],
+        ["Exported", "Dec 22 2025  5:17:17:583PM"],
+        ["Period Type", "1D"],
+        ["Level", level],
+    ]
+
+
+def rank_workbook(path: Union[str, Path], n: int, seed: int = 7, level: str = "426085 - Stevens Creek Volkswagen") -> None:
+    """An Employee Rank export with `n` advisors, percent KPIs stored as "75%" strings."""
+    rows: List[List[Cell]] = [["Data Classification: Confidential"], ["Service Employee Rank"], list(COLUMNS)]
+    for row in advisor_rows(n, seed):
+        rows.append([f"{row[c]:g}%" if c in KPIS else row[c] for c in COLUMNS])
+    write_workbook(path, [("Data", rows), ("Filters", _filters_sheet(level))])
+
+
+def satisfaction_workbook(path: Union[str, Path], padding: int = 0, seed: int = 7) -> None:
+    """A Satisfaction Score export; `padding` adds question rows after the summary row."""
+    rnd = random.Random(seed)
+    rows: List[List[Cell]] = [
+        ["Exported on 12/22/2025"],
+        ["", "Score", "National", "Region", "Area"],
+        ["Overall Performance", 901.2, 880.5, 890.1, 870.2],
+    ]
+    for i in range(padding):
+        rows.append([f"Question {i}", round(rnd.uniform(600, 1000), 1), 880.5, 890.1, 870.2])
+    write_workbook(path, [("Data", rows), ("Filters", _filters_sheet("426085 - Stevens Creek Volkswagen"))])
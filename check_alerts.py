@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Run one published advisors document through a dealer's KPI alert state.
+
+Usage:
+  python3 check_alerts.py DOCUMENT.json [--storage DIR] [--dealer ID]
+
+The Node server runs this once per upload, on a copy of the document it just
+published, before the dealer's TV snapshot is re-rendered (see `dashboard.alerts`).
+Prints the number of new alerts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+_SCRIPTS_DIR = str(Path(__file__).resolve().parent / "server" / "scripts")
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+from dashboard.alerts import process_alerts  # noqa: E402
+from dashboard.storage import valid_dealer  # noqa: E402
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("document", type=Path, help="the advisors document as published")
+    p.add_argument("--storage", default=None, help="storage directory (default: DASHBOARD_STORAGE_DIR or ./storage)")
+    p.add_argument("--dealer", default=None, help="dealer id (default: the single-dealer layout)")
+    args = p.parse_args(argv[1:])
+
+    dealer = valid_dealer(args.dealer) if args.dealer else None
+    if args.dealer and dealer is None:
+        print(f"Not a dealer id: {args.dealer}", file=sys.stderr)
+        return 2
+    storage_dir = Path(args.storage).expanduser().resolve() if args.storage else None
+    with open(args.document, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    print(len(process_alerts(doc, storage_dir, dealer)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -1,7 +1,8 @@
-import React, { useEffect, useMemo, useRef, useState } from "react";
+import React, { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import { fetchDashboardData } from "./api.js";
 import { cx, formatPercent, formatScore, safeNumber } from "./utils.js";
 import UploadPage from "./UploadPage.jsx";
+import VirtualList from "./VirtualList.jsx";
 
 function guessKey(columns, candidates) {
   const lowerMap = new Map(columns.map((c) => [c.toLowerCase(), c]));
@@ -27,6 +28,13 @@ export default function App() {
   const [expandedIds, setExpandedIds] = useState(() => new Set());
   const abortRef = useRef(null);
   const requestIdRef = useRef(0);
+  // TV rotation: ?rotate=<seconds> pages through long leaderboards on a timer
+  // Each dealer has its own dashboard URL: ?dealer=<id> (the most recent upload without it)
+  const dealer = useMemo(() => new URLSearchParams(window.location.search).get("dealer") || "", []);
+  const rotateMs = useMemo(() => {
+    const seconds = Number(new URLSearchParams(window.location.search).get("rotate"));
+    return Number.isFinite(seconds) && seconds > 0 ? Math.max(5, seconds) * 1000 : 0;
+  }, []);
 
   async function load() {
     const reqId = ++requestIdRef.current;
@@ -36,7 +44,7 @@ export default function App() {
     const controller = new AbortController();
     abortRef.current = controller;
     try {
-      const data = await fetchDashboardData({ signal: controller.signal });
+      const data = await fetchDashboardData({ signal: controller.signal, dealer });
       if (reqId === requestIdRef.current) setDoc(data);
     } catch (e) {
       // Ignore normal request cancellations (common in dev/StrictMode or rapid reloads)
@@ -92,8 +100,8 @@ export default function App() {
   if (pathname === "/upload") {
     return (
       <UploadPage
-        onDone={() => {
-          window.location.href = "/";
+        onDone={(uploadedDealer) => {
+          window.location.href = uploadedDealer ? `/?dealer=${encodeURIComponent(uploadedDealer)}` : "/";
         }}
       />
     );
@@ -132,11 +140,89 @@ export default function App() {
     // Fallback dealer number from sheet if Level is missing.
     if (!dealerNumber && keyDealer) dealerNumber = String(first[keyDealer] ?? "").trim();
 
-    return { dealerNumber, dealerName, area, region };
+    // Reporting period from the Filters sheet, e.g. "MTD" or "1M (December)".
+    const periodType = String(meta?.["Period Type"] ?? "").trim();
+    const periodDate = String(meta?.["Period Date"] ?? "").trim();
+    const period = periodType && periodDate ? `${periodType} (${periodDate})` : periodType;
+
+    return { dealerNumber, dealerName, area, region, period };
   }, [meta, sorted, keyDealer, keyArea, keyRegion]);
 
+  const rowKey = useCallback(
+    (row, idx) => `${safeNumber(keyRank ? row[keyRank] : null) ?? "na"}-${String((keyEmployee ? row[keyEmployee] : "") || "na")}-${idx}`,
+    [keyRank, keyEmployee]
+  );
+
+  function renderRow(row, idx) {
+    const rank = safeNumber(keyRank ? row[keyRank] : null);
+    const name = keyEmployee ? row[keyEmployee] : "";
+    const score = keyScore ? row[keyScore] : null;
+    const impact = keyImpact ? row[keyImpact] : null;
+    const completes = keyCompletes ? row[keyCompletes] : null;
+    const total = keyTotal ? row[keyTotal] : null;
+    const id = rowKey(row, idx);
+    const open = expandedIds.has(id);
+
+    return (
+      <div className={cx("card", "accordionCard", rankColor(rank), open && "open")}>
+        <button
+          type="button"
+          className="accordionButton"
+          onClick={() =>
+            setExpandedIds((prev) => {
+              const next = new Set(prev);
+              if (next.has(id)) next.delete(id);
+              else next.add(id);
+              return next;
+            })
+          }
+          aria-expanded={open}
+        >
+          <div className="rowLeft">
+            <div className="rankSmall">#{rank ?? "—"}</div>
+            <div className="nameSmall">{String(name || "—")}</div>
+          </div>
+          <div className="rowRight">
+            <div className="chip">
+              <div className="chipLabel">Satisfaction Score</div>
+              <div className="chipValue">{formatScore(score)}</div>
+            </div>
+            <div className="chip">
+              <div className="chipLabel">Impact</div>
+              <div className="chipValue">{safeNumber(impact) ?? "—"}</div>
+            </div>
+            <div className="chip">
+              <div className="chipLabel">Records</div>
+              <div className="chipValue">{safeNumber(total) ?? "—"}</div>
+            </div>
+            <div className="chip">
+              <div className="chipLabel">Completes</div>
+              <div className="chipValue">{safeNumber(completes) ?? "—"}</div>
+            </div>
+          </div>
+          <div className="chev" aria-hidden="true">
+            {open ? "▾" : "▸"}
+          </div>
+        </button>
+
+        {open ? (
+          <div className="accordionBody">
+            <div className="kpiGrid">
+              {allDetailColumns.map((col) => (
+                <div key={col} className="kpiItem">
+                  <div className="kpiLabel">{col}</div>
+                  <div className="kpiValue">{renderCell(row[col], fieldTypes[col], col)}</div>
+                </div>
+              ))}
+            </div>
+          </div>
+        ) : null}
+      </div>
+    );
+  }
+
   return (
-    <div className="screen">
+    <div className="screen fitViewport">
       <header className="topbar">
         <div className="titleBlock">
           <div className="titleRow">
@@ -155,8 +241,8 @@ export default function App() {
             <span className="muted">{headerInfo.area ? `Area: ${headerInfo.area}` : ""}</span>
             {headerInfo.region ? <span className="dot">•</span> : null}
             <span className="muted">{headerInfo.region ? `Region: ${headerInfo.region}` : ""}</span>
-            <span className="dot">•</span>
-            <span className="muted">Period: 1D</span>
+            {headerInfo.period ? <span className="dot">•</span> : null}
+            <span className="muted">{headerInfo.period ? `Period: ${headerInfo.period}` : ""}</span>
           </div>
         </div>
         <div className="status">
@@ -184,75 +270,7 @@ export default function App() {
               No rows found. Upload a new `.xlsx` via <span className="mono">/upload</span>.
             </div>
           ) : (
-            <div className="leaderboard">
-              {sorted.map((row, idx) => {
-                const rank = safeNumber(keyRank ? row[keyRank] : null);
-                const name = keyEmployee ? row[keyEmployee] : "";
-                const score = keyScore ? row[keyScore] : null;
-                const impact = keyImpact ? row[keyImpact] : null;
-                const completes = keyCompletes ? row[keyCompletes] : null;
-                const total = keyTotal ? row[keyTotal] : null;
-                const id = `${rank ?? "na"}-${String(name || "na")}-${idx}`;
-                const open = expandedIds.has(id);
-
-                return (
-                  <div key={id} className={cx("card", "accordionCard", rankColor(rank), open && "open")}>
-                    <button
-                      type="button"
-                      className="accordionButton"
-                      onClick={() =>
-                        setExpandedIds((prev) => {
-                          const next = new Set(prev);
-                          if (next.has(id)) next.delete(id);
-                          else next.add(id);
-                          return next;
-                        })
-                      }
-                      aria-expanded={open}
-                    >
-                      <div className="rowLeft">
-                        <div className="rankSmall">#{rank ?? "—"}</div>
-                        <div className="nameSmall">{String(name || "—")}</div>
-                      </div>
-                      <div className="rowRight">
-                        <div className="chip">
-                          <div className="chipLabel">Satisfaction Score</div>
-                          <div className="chipValue">{formatScore(score)}</div>
-                        </div>
-                        <div className="chip">
-                          <div className="chipLabel">Impact</div>
-                          <div className="chipValue">{safeNumber(impact) ?? "—"}</div>
-                        </div>
-                        <div className="chip">
-                          <div className="chipLabel">Records</div>
-                          <div className="chipValue">{safeNumber(total) ?? "—"}</div>
-                        </div>
-                        <div className="chip">
-                          <div className="chipLabel">Completes</div>
-                          <div className="chipValue">{safeNumber(completes) ?? "—"}</div>
-                        </div>
-                      </div>
-                      <div className="chev" aria-hidden="true">
-                        {open ? "▾" : "▸"}
-                      </div>
-                    </button>
-
-                    {open ? (
-                      <div className="accordionBody">
-                        <div className="kpiGrid">
-                          {allDetailColumns.map((col) => (
-                            <div key={col} className="kpiItem">
-                              <div className="kpiLabel">{col}</div>
-                              <div className="kpiValue">{renderCell(row[col], fieldTypes[col], col)}</div>
-                            </div>
-                          ))}
-                        </div>
-                      </div>
-                    ) : null}
-                  </div>
-                );
-              })}
-            </div>
+            <VirtualList items={sorted} getKey={rowKey} renderItem={renderRow} rotateMs={rotateMs} />
           )}
         </section>
       </main>
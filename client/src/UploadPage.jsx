@@ -31,7 +31,7 @@ export default function UploadPage({ onDone }) {
     try {
       const res = await uploadXlsx(file);
       setOk(`Uploaded. Exported: ${res?.meta?.["Exported Raw"] || res?.meta?.Exported || "—"}`);
-      setTimeout(() => onDone?.(), 400);
+      setTimeout(() => onDone?.(res?.dealer), 400);
     } catch (e2) {
       setError(e2?.message || "Upload failed.");
     } finally {
@@ -0,0 +1,153 @@
+import React, { useEffect, useLayoutEffect, useMemo, useRef, useState } from "react";
+
+// Index of the first row whose bottom edge is below `y` (offsets[i] is the top of row i).
+function rowAt(offsets, y) {
+  let lo = 0;
+  let hi = offsets.length - 2;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (offsets[mid + 1] > y) hi = mid;
+    else lo = mid + 1;
+  }
+  return lo;
+}
+
+// Windowed list for long leaderboards.
+//
+// Only rows intersecting the scroll viewport, plus `overscan` rows on either side, are
+// mounted. Each mounted row is measured with a ResizeObserver and its height cached by
+// key; rows not seen yet count as `estimateHeight`, so expanding a card just re-measures
+// that one row. With `rotateMs` > 0 the list pages itself for TV rotation: every tick it
+// scrolls so the first partly hidden row is at the top, and wraps after the last page.
+export default function VirtualList({
+  items,
+  getKey,
+  renderItem,
+  estimateHeight = 72,
+  gap = 10,
+  overscan = 4,
+  rotateMs = 0,
+}) {
+  const viewportRef = useRef(null);
+  const heightsRef = useRef(new Map());
+  const nodesRef = useRef(new Map());
+  const refCallbacksRef = useRef(new Map());
+  const observerRef = useRef(null);
+  const offsetsRef = useRef(null);
+  const [layoutVersion, setLayoutVersion] = useState(0);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(0);
+
+  const offsets = useMemo(() => {
+    const out = new Float64Array(items.length + 1);
+    for (let i = 0; i < items.length; i += 1) {
+      const h = heightsRef.current.get(getKey(items[i], i)) ?? estimateHeight;
+      out[i + 1] = out[i] + h + gap;
+    }
+    return out;
+    // layoutVersion changes whenever a measured height does
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [items, getKey, estimateHeight, gap, layoutVersion]);
+  offsetsRef.current = offsets;
+
+  useLayoutEffect(() => {
+    const observer = new ResizeObserver((entries) => {
+      let changed = false;
+      for (const entry of entries) {
+        const key = entry.target.dataset.vkey;
+        const h = entry.target.offsetHeight;
+        if (heightsRef.current.get(key) !== h) {
+          heightsRef.current.set(key, h);
+          changed = true;
+        }
+      }
+      if (changed) setLayoutVersion((v) => v + 1);
+    });
+    observerRef.current = observer;
+    for (const el of nodesRef.current.values()) observer.observe(el);
+    return () => observer.disconnect();
+  }, []);
+
+  useLayoutEffect(() => {
+    const el = viewportRef.current;
+    if (!el) return undefined;
+    const observer = new ResizeObserver(() => setViewportHeight(el.clientHeight));
+    observer.observe(el);
+    setViewportHeight(el.clientHeight);
+    return () => observer.disconnect();
+  }, []);
+
+  useEffect(() => {
+    if (!rotateMs) return undefined;
+    const timer = setInterval(() => {
+      const el = viewportRef.current;
+      const rowTops = offsetsRef.current;
+      if (!el || !rowTops || rowTops.length < 2) return;
+      const atEnd = el.scrollTop + el.clientHeight >= el.scrollHeight - 2;
+      const next = atEnd ? 0 : rowTops[rowAt(rowTops, el.scrollTop + el.clientHeight - 1)];
+      // A row taller than the viewport would pin the list; fall back to a plain page scroll
+      const top = next > el.scrollTop || atEnd ? next : el.scrollTop + el.clientHeight;
+      el.scrollTo({ top, behavior: "smooth" });
+    }, rotateMs);
+    return () => clearInterval(timer);
+  }, [rotateMs]);
+
+  // One ref callback per key for as long as its row is mounted, so React doesn't detach
+  // and re-attach every row's ref (and its observer) on each render.
+  function measureRef(key) {
+    let callback = refCallbacksRef.current.get(key);
+    if (callback) return callback;
+    callback = (el) => {
+      const prev = nodesRef.current.get(key);
+      if (prev && prev !== el) {
+        observerRef.current?.unobserve(prev);
+        nodesRef.current.delete(key);
+      }
+      if (el && prev !== el) {
+        nodesRef.current.set(key, el);
+        observerRef.current?.observe(el);
+      }
+      if (!el) refCallbacksRef.current.delete(key);
+    };
+    refCallbacksRef.current.set(key, callback);
+    return callback;
+  }
+
+  const count = items.length;
+  const totalHeight = count ? offsets[count] - gap : 0;
+  const firstVisible = count ? rowAt(offsets, scrollTop) : 0;
+  const lastVisible = count ? rowAt(offsets, scrollTop + Math.max(viewportHeight - 1, 0)) : -1;
+  const start = Math.max(0, firstVisible - overscan);
+  const end = Math.min(count, lastVisible + 1 + overscan);
+
+  const mounted = [];
+  for (let i = start; i < end; i += 1) {
+    const key = getKey(items[i], i);
+    mounted.push(
+      <div
+        key={key}
+        ref={measureRef(key)}
+        data-vkey={key}
+        className="virtualRow"
+        style={{ transform: `translateY(${offsets[i]}px)` }}
+      >
+        {renderItem(items[i], i)}
+      </div>
+    );
+  }
+
+  return (
+    <>
+      <div ref={viewportRef} className="virtualViewport" onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}>
+        <div className="virtualSpacer" style={{ height: totalHeight }}>
+          {mounted}
+        </div>
+      </div>
+      {count > lastVisible - firstVisible + 1 ? (
+        <div className="virtualStatus muted">
+          Rows {firstVisible + 1}–{Math.min(lastVisible + 1, count)} of {count}
+        </div>
+      ) : null}
+    </>
+  );
+}
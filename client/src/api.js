@@ -1,5 +1,6 @@
-export async function fetchDashboardData({ signal } = {}) {
-  const res = await fetch("/api/data", { signal });
+export async function fetchDashboardData({ signal, dealer } = {}) {
+  const url = dealer ? `/api/dealers/${encodeURIComponent(dealer)}/data` : "/api/data";
+  const res = await fetch(url, { signal });
   if (!res.ok) {
     const text = await res.text().catch(() => "");
     throw new Error(text || `Request failed: ${res.status}`);
@@ -0,0 +1 @@
+"""Helpers for the Streamlit dashboard (`streamlit_app.py`) that don't depend on Streamlit."""
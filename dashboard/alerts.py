@@ -0,0 +1,313 @@
+"""
+Alerts when an advisor's Satisfaction Score falls below target or a KPI drops well below its recent average.
+
+Each ingested advisors export updates a rolling state per advisor and KPI: an
+exponentially weighted mean and variance (`Ewma`, three numbers). The cost of an
+ingest therefore grows with the rows of that export, never with history. A KPI is
+checked against its state before the state takes the new value in:
+
+- a Satisfaction Score under `SCORE_FLOOR` raises `below_target` when the advisor
+  falls below it (not again on every export while they stay there);
+- once `MIN_SAMPLES` exports have been seen, a value `DROP_SIGMAS` standard deviations
+  under the mean, and at least the minimum drop for its scale under it, raises `drop`.
+
+State is kept in the dealer's directory, one small file per period
+(`alert_state.<period>.json`, `alert_state.none.json` for exports without one), so a
+1D export is never compared with MTD averages and an ingest rewrites only the state
+it updates. The last `RECENT_EXPORTS` export keys of a period are remembered, and an
+export among them, such as the same file uploaded twice or an older export ingested
+again, is skipped. An advisor missing from `MAX_MISSED_EXPORTS` exports in a row is
+dropped from the state, so it holds only the current roster.
+
+Alerts are appended to `alerts.jsonl` next to it: an append-only queue the dashboards
+read back with `recent_alerts`, and other tools can tail. Only the newest alerts are
+kept.
+
+The Streamlit app, the watch-folder daemon and the Node server's alert script may
+ingest for the same dealer at once, so every update of the state and the queue holds
+an exclusive lock on `.alerts.lock` in the dealer's directory.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from dashboard.components import guess_key, normalize_display_name, safe_number
+from dashboard.storage import dealer_dir, document_period
+
+ALERTS_FILE = "alerts.jsonl"
+STATE_FILE_PATTERN = "alert_state.{}.json"
+# Older layout, every period in one file; read once per period to carry its state over
+LEGACY_STATE_FILE = "alert_state.json"
+LOCK_FILE = ".alerts.lock"
+
+# Same line as analytics.SCORE_TARGET and the red score rings
+SCORE_FLOOR = 895.0
+# Weight of the newest export in the rolling mean and variance
+ALPHA = 0.3
+DROP_SIGMAS = 2.5
+MIN_SAMPLES = 3
+# Smallest drop worth an alert: percentage points, and Satisfaction Score points
+MIN_DROP_PERCENT = 10.0
+MIN_DROP_SCORE = 25.0
+# alerts.jsonl is cut back to its newer half beyond this size
+MAX_ALERTS_BYTES = 512 * 1024
+# Export keys remembered per period, for skipping re-ingested exports
+RECENT_EXPORTS = 32
+# An advisor absent from this many exports in a row is forgotten
+MAX_MISSED_EXPORTS = 5
+
+BELOW_TARGET = "below_target"
+DROP = "drop"
+
+# Threads of one process queue here before taking the file lock
+_lock = threading.Lock()
+
+
+@dataclass
+class Ewma:
+    """Exponentially weighted mean and variance of one advisor's KPI."""
+
+    mean: float = 0.0
+    var: float = 0.0
+    n: int = 0
+
+    def is_drop(self, x: float, min_drop: float) -> bool:
+        if self.n < MIN_SAMPLES:
+            return False
+        return self.mean - x >= max(min_drop, DROP_SIGMAS * math.sqrt(self.var))
+
+    def update(self, x: float, alpha: float = ALPHA) -> None:
+        if self.n == 0:
+            self.mean, self.var = x, 0.0
+        else:
+            diff = x - self.mean
+            incr = alpha * diff
+            self.mean += incr
+            self.var = (1 - alpha) * (self.var + diff * incr)
+        self.n += 1
+
+    def to_list(self) -> List[float]:
+        return [round(self.mean, 6), round(self.var, 6), self.n]
+
+    @classmethod
+    def from_list(cls, raw: Any) -> "Ewma":
+        try:
+            mean, var, n = raw
+            return cls(float(mean), float(var), int(n))
+        except (TypeError, ValueError):
+            return cls()
+
+
+def export_key(doc: Dict[str, Any]) -> str:
+    """Identity of an export: its Exported time, else when it was parsed."""
+    meta = doc.get("meta", {})
+    return str(meta.get("Exported ISO") or meta.get("Exported Raw") or meta.get("Exported") or doc.get("generatedAt") or "")
+
+
+def check_document(
+    doc: Dict[str, Any], period_state: Dict[str, Any], dealer: Optional[str] = None, now: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Alerts for one advisors export; updates `period_state` ({advisor: {...}}) in place.
+
+    One pass over the rows; each row touches only its own advisor's state. Advisors
+    not in the export count a miss, and are dropped after `MAX_MISSED_EXPORTS`.
+    """
+    dataset = doc.get("dataset", {})
+    columns = dataset.get("columns", [])
+    field_types = doc.get("fieldTypes", {})
+    key_employee = guess_key(columns, ["Employee", "Advisor", "Service Advisor", "Name"])
+    key_score = guess_key(columns, ["Satisfaction Score", "Score"])
+    if key_employee is None:
+        return []
+    # (column, scale, smallest drop worth an alert)
+    kpis = [(key_score, "score", MIN_DROP_SCORE)] if key_score else []
+    kpis += [(c, "percent", MIN_DROP_PERCENT) for c in columns if field_types.get(c) == "percent" and c != key_score]
+
+    base = {
+        "at": now or datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "dealer": dealer,
+        "period": document_period(doc),
+        "export": export_key(doc),
+    }
+    alerts: List[Dict[str, Any]] = []
+    seen = set()
+    for row in dataset.get("rows", []):
+        employee = str(normalize_display_name(row.get(key_employee)) or "").strip()
+        if not employee:
+            continue
+        seen.add(employee)
+        advisor = period_state.setdefault(employee, {"kpis": {}, "below": False})
+        advisor["missed"] = 0
+        for kpi, scale, min_drop in kpis:
+            value = safe_number(row.get(kpi))
+            if value is None:
+                continue
+            ewma = Ewma.from_list(advisor["kpis"].get(kpi))
+            if kpi == key_score:
+                below = value < SCORE_FLOOR
+                if below and not advisor.get("below"):
+                    alerts.append(
+                        {**base, "kind": BELOW_TARGET, "employee": employee, "kpi": kpi, "scale": scale,
+                         "value": value, "threshold": SCORE_FLOOR}
+                    )
+                advisor["below"] = below
+            if ewma.is_drop(value, min_drop):
+                alerts.append(
+                    {**base, "kind": DROP, "employee": employee, "kpi": kpi, "scale": scale,
+                     "value": value, "mean": round(ewma.mean, 1)}
+                )
+            ewma.update(value)
+            advisor["kpis"][kpi] = ewma.to_list()
+    for employee in [e for e in period_state if e not in seen]:
+        advisor = period_state[employee]
+        advisor["missed"] = advisor.get("missed", 0) + 1
+        if advisor["missed"] >= MAX_MISSED_EXPORTS:
+            del period_state[employee]
+    return alerts
+
+
+@contextmanager
+def _locked(directory: Path) -> Iterator[None]:
+    """Hold the dealer's alert lock, across threads and processes."""
+    with _lock, open(directory / LOCK_FILE, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after about 10 seconds
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _state_path(directory: Path, period: Optional[str]) -> Path:
+    return directory / STATE_FILE_PATTERN.format(period or "none")
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _load_state(directory: Path, period: Optional[str]) -> Dict[str, Any]:
+    """{"exports": [...], "advisors": {...}} of one period."""
+    state = _read_json(_state_path(directory, period))
+    if not state:
+        # The older layout kept only the last export key
+        legacy = _read_json(directory / LEGACY_STATE_FILE).get("periods", {}).get(period or "")
+        if isinstance(legacy, dict):
+            exports = [legacy["export"]] if legacy.get("export") else []
+            state = {"exports": exports, "advisors": legacy.get("advisors", {})}
+        else:
+            state = {}
+    state.setdefault("exports", [])
+    state.setdefault("advisors", {})
+    return state
+
+
+def _save_state(path: Path, state: Dict[str, Any]) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _append_alerts(path: Path, alerts: List[Dict[str, Any]]) -> None:
+    # Called with the dealer's alert lock held, so the trim never loses another writer's lines
+    with open(path, "a", encoding="utf-8") as f:
+        for alert in alerts:
+            f.write(json.dumps(alert) + "\n")
+    if path.stat().st_size > MAX_ALERTS_BYTES:
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text("".join(lines[len(lines) // 2:]), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def process_alerts(
+    doc: Optional[Dict[str, Any]], storage_dir: Optional[Path] = None, dealer: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Run an ingested advisors document through the dealer's alert state; returns the new alerts."""
+    if doc is None:
+        return []
+    directory = dealer_dir(dealer, storage_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    period = document_period(doc)
+    with _locked(directory):
+        state = _load_state(directory, period)
+        export = export_key(doc)
+        if export and export in state["exports"]:
+            return []
+        alerts = check_document(doc, state["advisors"], dealer)
+        if export:
+            state["exports"] = (state["exports"] + [export])[-RECENT_EXPORTS:]
+        if alerts:
+            _append_alerts(directory / ALERTS_FILE, alerts)
+        _save_state(_state_path(directory, period), state)
+    return alerts
+
+
+def recent_alerts(
+    storage_dir: Optional[Path] = None,
+    dealer: Optional[str] = None,
+    export: Optional[str] = None,
+    limit: int = 20,
+    tail_bytes: int = 64 * 1024,
+) -> List[Dict[str, Any]]:
+    """The newest alerts of a dealer, newest first; only those of `export` when given.
+
+    Reads just the end of `alerts.jsonl`, so it is cheap to call on every render.
+    """
+    path = dealer_dir(dealer, storage_dir) / ALERTS_FILE
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - tail_bytes))
+            chunk = f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return []
+    lines = chunk.splitlines()
+    if size > tail_bytes:
+        lines = lines[1:]  # the first line may be cut
+    alerts: List[Dict[str, Any]] = []
+    for line in reversed(lines):
+        try:
+            alert = json.loads(line)
+        except ValueError:
+            continue
+        if export is not None and alert.get("export") != export:
+            continue
+        alerts.append(alert)
+        if len(alerts) >= limit:
+            break
+    return alerts
@@ -0,0 +1,139 @@
+"""
+Team-level aggregates for an advisor rank document, computed with NumPy.
+
+All KPI columns are gathered into one (advisors x KPIs) float matrix and every
+aggregate is derived from it with array operations, so the cost per render is a
+handful of vectorized passes rather than Python loops over rows. Rows held as
+`CompactRows` are read straight from their `array('d')` column buffers.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from dashboard.components import guess_key, percent_threshold_for_column
+
+# Satisfaction Score below this is shown in red across the dashboard
+SCORE_TARGET = 895.0
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+@dataclass(frozen=True)
+class TeamSummary:
+    advisors: int
+    completes: float
+    # Completes-weighted Satisfaction Score and the distance to SCORE_TARGET (positive = short)
+    weighted_score: Optional[float]
+    score_gap: Optional[float]
+    below_target: int
+    score_percentiles: Dict[int, float] = field(default_factory=dict)
+    # Percent KPIs in column order: Completes-weighted average and share of advisors at threshold
+    kpi_weighted: Dict[str, float] = field(default_factory=dict)
+    kpi_share_at_goal: Dict[str, float] = field(default_factory=dict)
+
+
+def _finite_or_none(x: float) -> Optional[float]:
+    return float(x) if np.isfinite(x) else None
+
+
+def _to_float(v: Any) -> float:
+    if isinstance(v, bool):
+        return np.nan
+    if isinstance(v, (int, float)):
+        return float(v)
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def column_matrix(rows: Sequence, names: List[str]) -> np.ndarray:
+    """Return an (n_rows, len(names)) float array; blanks and text become NaN."""
+    n = len(rows)
+    if not names:
+        return np.empty((n, 0))
+    numeric_values = getattr(rows, "numeric_values", None)
+    if numeric_values is not None:
+        cols = []
+        for name in names:
+            buf = numeric_values(name)
+            if buf is not None:
+                cols.append(np.frombuffer(buf, dtype=np.float64, count=n))
+            else:
+                cols.append(np.fromiter((_to_float(r.get(name)) for r in rows), dtype=np.float64, count=n))
+        return np.column_stack(cols)
+    return np.array([[_to_float(r.get(name)) for name in names] for r in rows], dtype=np.float64).reshape(n, len(names))
+
+
+def team_summary(
+    columns: List[str],
+    rows: Sequence,
+    field_types: Dict[str, str],
+    key_score: Optional[str],
+    key_completes: Optional[str],
+    threshold_for: Callable[[str], float],
+) -> Optional[TeamSummary]:
+    """Compute every team aggregate in one vectorized pass over the KPI columns."""
+    if not rows:
+        return None
+
+    kpis = [c for c in columns if field_types.get(c) == "percent"]
+    names = kpis + [c for c in (key_score, key_completes) if c]
+    m = column_matrix(rows, names)
+    k = len(kpis)
+    x = m[:, :k]
+    score = m[:, names.index(key_score)] if key_score else np.full(len(rows), np.nan)
+    weights = m[:, names.index(key_completes)] if key_completes else np.ones(len(rows))
+    weights = np.where(np.isfinite(weights) & (weights > 0), weights, 0.0)
+
+    # Completes-weighted means: sum(w * x) / sum(w) over the cells that have a value
+    present = np.isfinite(x)
+    wsum = present.T.astype(np.float64) @ weights
+    wx = np.where(present, x, 0.0).T @ weights
+    with np.errstate(invalid="ignore", divide="ignore"):
+        kpi_weighted = wx / wsum
+
+    thresholds = np.array([threshold_for(c) for c in kpis], dtype=np.float64)
+    at_goal = (np.where(present, x, -np.inf) >= thresholds).sum(axis=0)
+    counted = present.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = at_goal / counted
+
+    score_present = np.isfinite(score)
+    score_w = weights[score_present].sum()
+    weighted_score = float(score[score_present] @ weights[score_present] / score_w) if score_w > 0 else np.nan
+    if score_present.any():
+        pct = np.percentile(score[score_present], PERCENTILES)
+        score_percentiles = {p: float(v) for p, v in zip(PERCENTILES, pct)}
+    else:
+        score_percentiles = {}
+
+    ws = _finite_or_none(weighted_score)
+    return TeamSummary(
+        advisors=len(rows),
+        completes=float(weights.sum()),
+        weighted_score=ws,
+        score_gap=(SCORE_TARGET - ws) if ws is not None else None,
+        below_target=int((score[score_present] < SCORE_TARGET).sum()),
+        score_percentiles=score_percentiles,
+        kpi_weighted={c: float(v) for c, v in zip(kpis, kpi_weighted) if np.isfinite(v)},
+        kpi_share_at_goal={c: float(v) for c, v in zip(kpis, share) if np.isfinite(v)},
+    )
+
+
+def document_team_summary(doc: Dict[str, Any]) -> Optional[TeamSummary]:
+    """`team_summary` of an advisors document, with the dashboard's column names and KPI goals."""
+    dataset = doc.get("dataset", {})
+    columns = dataset.get("columns", [])
+    return team_summary(
+        columns,
+        dataset.get("rows", []),
+        doc.get("fieldTypes", {}),
+        key_score=guess_key(columns, ["Satisfaction Score", "Score"]),
+        key_completes=guess_key(columns, ["Completes"]),
+        threshold_for=percent_threshold_for_column,
+    )
@@ -0,0 +1,307 @@
+"""
+HTML fragments of the dashboard: progress rings, score bars, cards and the header line.
+
+Plain functions returning HTML strings, shared by the Streamlit app (`st.markdown`)
+and by the static TV snapshots (`dashboard.snapshot`), so both draw the same thing.
+Nothing here needs Streamlit or NumPy.
+"""
+
+import html
+import re
+
+# ============================================================================
+# UTILITY FUNCTIONS (from utils.js)
+# ============================================================================
+
+def safe_number(v):
+    """Convert value to number or return None"""
+    if v is None or v == "":
+        return None
+    if isinstance(v, (int, float)):
+        return v if not (isinstance(v, float) and (v != v or v == float('inf') or v == float('-inf'))) else None
+    try:
+        n = float(v)
+        return n if not (n != n or n == float('inf') or n == float('-inf')) else None
+    except:
+        return None
+
+
+def format_percent(v):
+    """Format number as percentage"""
+    n = safe_number(v)
+    if n is None:
+        return "—"
+    return f"{n:.1f}%"
+
+
+def format_score(v):
+    """Format score with appropriate decimals"""
+    n = safe_number(v)
+    if n is None:
+        return "—"
+    if n >= 100:
+        return f"{int(n)}"
+    return f"{n:.1f}"
+
+
+def guess_key(columns, candidates):
+    """Find column name from candidates (case-insensitive)"""
+    lower_map = {c.lower(): c for c in columns}
+    for c in candidates:
+        hit = lower_map.get(c.lower())
+        if hit:
+            return hit
+    return None
+
+
+def rank_color(rank):
+    """Get color class for rank"""
+    if rank == 1:
+        return "gold"
+    if rank == 2:
+        return "silver"
+    if rank == 3:
+        return "bronze"
+    return "neutral"
+
+
+def normalize_column_name(name):
+    """Normalize column name for comparison"""
+    return re.sub(r"\s+", " ", str(name or "").strip().lower())
+
+
+def normalize_display_name(name):
+    """Normalize employee name to title case for consistent display"""
+    if not name or name == "—":
+        return name
+    # Convert to title case (first letter of each word capitalized)
+    return str(name).strip().title()
+
+
+def percent_threshold_for_column(column_name):
+    """Get threshold for green/red coloring"""
+    key = normalize_column_name(column_name)
+    
+    if key == "vehicle returned cleaner":
+        return 50
+    if key == "paperwork <7 minutes":
+        return 75
+    if key == "advisor provided video":
+        return 75
+    if key == "escorted to vehicle":
+        return 75
+    
+    return 100
+
+
+# ============================================================================
+# UI COMPONENTS
+# ============================================================================
+
+def render_circular_progress(value, column_name=""):
+    """Render circular progress indicator for percentages"""
+    n = safe_number(value)
+    if n is None:
+        return "—"
+    
+    clamped = max(0, min(100, n))
+    r = 12
+    c = 2 * 3.14159 * r
+    dash = (clamped / 100) * c
+    threshold = percent_threshold_for_column(column_name)
+    good = n >= threshold
+    pct_color = "#10B981" if good else "#EF4444"
+    
+    # Return clean HTML without extra whitespace
+    svg = f'<div class="progress-container"><svg class="progress-svg" viewBox="0 0 36 36"><circle cx="18" cy="18" r="{r}" fill="none" stroke="#E5E7EB" stroke-width="4"/><circle cx="18" cy="18" r="{r}" fill="none" stroke="{pct_color}" stroke-width="4" stroke-linecap="round" stroke-dasharray="{dash} {c - dash}"/></svg><span class="mono progress-text">{format_percent(n)}</span></div>'
+    return svg
+
+
+def render_score_progress(value):
+    """Render circular progress indicator for satisfaction score (out of 1100)"""
+    n = safe_number(value)
+    if n is None:
+        return "—"
+    
+    # Calculate percentage out of 1100
+    percentage = (n / 1100) * 100
+    clamped = max(0, min(100, percentage))
+    
+    r = 12
+    c = 2 * 3.14159 * r
+    dash = (clamped / 100) * c
+    
+    # Red if under 895, green otherwise
+    score_color = "#EF4444" if n < 895 else "#10B981"
+    
+    # Display the raw score, not percentage
+    score_display = format_score(n)
+    
+    # Return clean HTML without extra whitespace
+    svg = f'<div class="progress-container"><svg class="progress-svg" viewBox="0 0 36 36"><circle cx="18" cy="18" r="{r}" fill="none" stroke="#E5E7EB" stroke-width="4"/><circle cx="18" cy="18" r="{r}" fill="none" stroke="{score_color}" stroke-width="4" stroke-linecap="round" stroke-dasharray="{dash} {c - dash}"/></svg><span class="mono progress-text">{score_display}</span></div>'
+    return svg
+
+
+def render_cell(value, cell_type, column_name=""):
+    """Render cell based on type"""
+    if cell_type == "percent":
+        return render_circular_progress(value, column_name)
+    if cell_type == "number":
+        n = safe_number(value)
+        return f'<span class="mono">{n if n is not None else "—"}</span>'
+    return f'<span>{value if value not in ["", None] else "—"}</span>'
+
+
+def technician_card_html(rank, name, rendered_value):
+    """Compact single-line card: rank, name and one KPI value"""
+    return f"""
+        <div style='border: 1px solid #E5E7EB; border-radius: 8px; padding: 6px 10px; 
+                    background: linear-gradient(180deg, #FFFFFF, #F9FAFB); margin-bottom: 4px;
+                    box-shadow: 0 1px 3px rgba(0, 0, 0, 0.05);'>
+            <div style='display: flex; align-items: center; gap: 6px; justify-content: space-between;'>
+                <div style='display: flex; align-items: center; gap: 6px; flex: 1; min-width: 0;'>
+                    <div style='font-size: 13px; font-weight: 950; min-width: 22px;'>#{int(rank) if rank else '—'}</div>
+                    <div style='font-size: 12px; font-weight: 700; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;'>{name}</div>
+                </div>
+                <div style='flex-shrink: 0;'>{rendered_value}</div>
+            </div>
+        </div>
+        """
+
+
+def technician_value_html(row, key_fixed_first, field_types):
+    """Fixed Right First Time of a technician row, as a ring when it is a percent"""
+    fixed_first = row.get(key_fixed_first) if key_fixed_first else None
+    fixed_first_type = field_types.get(key_fixed_first, 'string') if key_fixed_first else 'string'
+    if fixed_first_type == 'percent':
+        return render_circular_progress(fixed_first, key_fixed_first or "Fixed right first time")
+    return f'<span class="mono" style="font-weight: 800;">{safe_number(fixed_first) if safe_number(fixed_first) is not None else "—"}</span>'
+
+
+def advisor_chip_value_html(value, field_type, column_name):
+    """A KPI value in an advisor card's metric chip"""
+    if field_type == 'percent':
+        return render_circular_progress(value, column_name or "")
+    return f'<span class="mono chip-value">{safe_number(value) if safe_number(value) is not None else "—"}</span>'
+
+
+def satisfaction_score_bar_html(doc):
+    """Horizontal satisfaction score bar with Nation/Region/Area scores"""
+    score = doc.get('score', 0)
+    national = doc.get('national', 0)
+    region = doc.get('region', 0)
+    area = doc.get('area', 0)
+    
+    # Calculate percentage for bar (out of 1000)
+    percentage = (score / 1000) * 100
+    clamped = max(0, min(100, percentage))
+    
+    # Color: red if under 895, green otherwise
+    bar_color = "#EF4444" if score < 895 else "#10B981"
+    
+    # Build the HTML string - more compact version
+    return f"""<div style='border: 1px solid #E5E7EB; border-radius: 10px; padding: 12px 16px; background: linear-gradient(180deg, #FFFFFF, #F9FAFB); box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05); margin-bottom: 0px;'><div style='font-size: 14px; font-weight: 800; color: #111827; margin-bottom: 10px;'>Overall Service Satisfaction Score</div><div style='margin-bottom: 10px;'><div style='display: flex; align-items: center; gap: 10px;'><div style='font-family: ui-monospace, monospace; font-size: 20px; font-weight: 950; color: {bar_color}; min-width: 70px;'>{score:.1f}</div><div style='flex: 1; height: 24px; background: #E5E7EB; border-radius: 12px; position: relative; overflow: hidden;'><div style='position: absolute; top: 0; left: 0; height: 100%; background: {bar_color}; width: {clamped}%; border-radius: 12px; transition: width 0.3s ease;'></div></div><div style='font-size: 13px; font-weight: 700; color: #6B7280; min-width: 50px;'>/ 1000</div></div></div><div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 12px; border-top: 1px solid #E5E7EB; padding-top: 10px;'><div style='text-align: center;'><div style='font-size: 11px; font-weight: 700; color: #6B7280; margin-bottom: 4px;'>Nation</div><div style='display: flex; align-items: center; justify-content: center; gap: 3px;'><span style='font-size: 10px; color: #6B7280;'>{'▼' if score < national else '▲'}</span><span style='font-family: ui-monospace, monospace; font-size: 16px; font-weight: 800; color: {'#EF4444' if score < national else '#10B981'};'>{national:.1f}</span></div></div><div style='text-align: center;'><div style='font-size: 11px; font-weight: 700; color: #6B7280; margin-bottom: 4px;'>Region</div><div style='display: flex; align-items: center; justify-content: center; gap: 3px;'><span style='font-size: 10px; color: #6B7280;'>{'▼' if score < region else '▲'}</span><span style='font-family: ui-monospace, monospace; font-size: 16px; font-weight: 800; color: {'#EF4444' if score < region else '#10B981'};'>{region:.1f}</span></div></div><div style='text-align: center;'><div style='font-size: 11px; font-weight: 700; color: #6B7280; margin-bottom: 4px;'>Area</div><div style='display: flex; align-items: center; justify-content: center; gap: 3px;'><span style='font-size: 10px; color: #6B7280;'>{'▼' if score < area else '▲'}</span><span style='font-family: ui-monospace, monospace; font-size: 16px; font-weight: 800; color: {'#EF4444' if score < area else '#10B981'};'>{area:.1f}</span></div></div></div></div>"""
+
+
+def team_summary_strip_html(summary, score_target):
+    """One-line strip of team aggregates (weighted score, distribution, KPI averages)"""
+    chip_style = "border: 1px solid #E5E7EB; border-radius: 8px; padding: 6px 10px; background: #FFFFFF; min-width: 0;"
+    label_style = "font-size: 10px; font-weight: 700; color: #6B7280; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;"
+    value_style = "font-family: ui-monospace, monospace; font-size: 15px; font-weight: 800;"
+    
+    chips = []
+    if summary.weighted_score is not None:
+        good = summary.score_gap <= 0
+        color = "#10B981" if good else "#EF4444"
+        gap_text = f"▲ {-summary.score_gap:.1f} over {score_target:.0f}" if good else f"▼ {summary.score_gap:.1f} to {score_target:.0f}"
+        chips.append(f"<div style='{chip_style}'><div style='{label_style}'>Team score (weighted)</div><div style='{value_style} color: {color};'>{summary.weighted_score:.1f} <span style='font-size: 11px; color: #6B7280;'>{gap_text}</span></div></div>")
+    chips.append(f"<div style='{chip_style}'><div style='{label_style}'>Below {score_target:.0f}</div><div style='{value_style}'>{summary.below_target} / {summary.advisors}</div></div>")
+    if summary.score_percentiles:
+        p = summary.score_percentiles
+        chips.append(f"<div style='{chip_style}'><div style='{label_style}'>Score P25 · Median · P75</div><div style='{value_style}'>{format_score(p[25])} · {format_score(p[50])} · {format_score(p[75])}</div></div>")
+    for col_name, avg in summary.kpi_weighted.items():
+        share = summary.kpi_share_at_goal.get(col_name)
+        color = "#10B981" if avg >= percent_threshold_for_column(col_name) else "#EF4444"
+        safe_col_name = str(col_name).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        share_text = f" <span style='font-size: 11px; color: #6B7280;'>{share * 100:.0f}% at goal</span>" if share is not None else ""
+        chips.append(f"<div style='{chip_style}'><div style='{label_style}'>{safe_col_name}</div><div style='{value_style} color: {color};'>{format_percent(avg)}{share_text}</div></div>")
+    
+    return f"<div style='display: grid; grid-template-columns: repeat(auto-fill, minmax(150px, 1fr)); gap: 6px; margin: 8px 0 4px 0;'>{''.join(chips)}</div>"
+
+
+def alerts_strip_html(alerts):
+    """Red strip listing KPI alerts (from `dashboard.alerts`), one line per alert"""
+    if not alerts:
+        return ""
+    lines = []
+    for alert in alerts:
+        name = html.escape(str(alert.get('employee', '')))
+        kpi = html.escape(str(alert.get('kpi', '')))
+        fmt = format_score if alert.get('scale') == 'score' else format_percent
+        shown = fmt(alert.get('value'))
+        if alert.get('kind') == 'below_target':
+            detail = f"{kpi} {shown} <span style='color: #6B7280;'>below {format_score(alert.get('threshold'))}</span>"
+        else:
+            average = fmt(alert.get('mean'))
+            detail = f"{kpi} {shown} <span style='color: #6B7280;'>▼ from avg {average}</span>"
+        lines.append(f"<div style='font-size: 12px; padding: 2px 0;'><strong>{name}</strong> · {detail}</div>")
+    return f"""<div style='border: 1px solid #FCA5A5; border-left: 4px solid #EF4444; border-radius: 8px; padding: 6px 12px; background: #FEF2F2; margin: 8px 0 4px 0;'><div style='font-size: 12px; font-weight: 800; color: #B91C1C; margin-bottom: 2px;'>⚠ {len(alerts)} alert{'s' if len(alerts) != 1 else ''} in this export</div>{''.join(lines)}</div>"""
+
+
+def period_label(doc):
+    """The reporting period named in a document ("MTD", "1M (December)"), or "" when it names none"""
+    period = doc.get('period') or {}
+    meta = doc.get('meta', {})
+    kind = str(period.get('type') or meta.get('Period Type') or '').strip()
+    date = str(period.get('date') or meta.get('Period Date') or '').strip()
+    if not kind:
+        return ""
+    return f"{kind} ({date})" if date else kind
+
+
+def header_info(doc):
+    """(title, subtitle HTML, last update) for the top of an advisors document's dashboard"""
+    meta = doc.get('meta', {})
+    dataset = doc.get('dataset', {})
+    title = dataset.get('title', 'Service Employee Rank')
+    columns = dataset.get('columns', [])
+    rows = dataset.get('rows', [])
+    
+    # Find key columns for header info
+    key_dealer = guess_key(columns, ["Dealer"])
+    key_area = guess_key(columns, ["Area"])
+    key_region = guess_key(columns, ["Region"])
+    
+    # Header info
+    level = meta.get('Level', '')
+    dealer_number = ""
+    dealer_name = ""
+    if ' - ' in level:
+        parts = level.split(' - ', 1)
+        dealer_number = parts[0].strip()
+        dealer_name = parts[1].strip()
+    else:
+        dealer_name = level.strip()
+    
+    first_row = rows[0] if rows else {}
+    area = str(first_row.get(key_area, '')).strip() if key_area else ""
+    region = str(first_row.get(key_region, '')).strip() if key_region else ""
+    if not dealer_number and key_dealer:
+        dealer_number = str(first_row.get(key_dealer, '')).strip()
+    
+    subtitle_parts = []
+    if dealer_number:
+        subtitle_parts.append(f"Dealer: {dealer_number}")
+    if dealer_name:
+        subtitle_parts.append(dealer_name)
+    if area:
+        subtitle_parts.append(f"Area: {area}")
+    if region:
+        subtitle_parts.append(f"Region: {region}")
+    period = period_label(doc)
+    if period:
+        subtitle_parts.append(f"Period: {html.escape(period)}")
+    
+    subtitle = " <span class='dot'>•</span> ".join(subtitle_parts)
+    exported_display = meta.get('Exported Raw') or meta.get('Exported') or '—'
+    return title, subtitle, exported_display
@@ -0,0 +1,88 @@
+"""
+Leaderboard ordering by any numeric metric, and paging through long rosters.
+
+Rows held as `CompactRows` carry per-column sorted indexes built at ingest, so
+ordering is a lookup. Plain row lists (e.g. documents that were never compacted)
+fall back to a sort, or to a bounded heap when only the top N are shown.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+RankedRow = Tuple[int, Any]
+
+# Cards rendered per leaderboard page; regional exports run to hundreds of advisors
+DEFAULT_PAGE_SIZE = 25
+
+
+def sortable_metrics(columns: List[str], field_types: Dict[str, str]) -> List[str]:
+    """Columns a leaderboard can be ordered by, in sheet order."""
+    return [c for c in columns if field_types.get(c) in ("number", "percent")]
+
+
+def is_descending(metric: Optional[str], key_rank: Optional[str]) -> bool:
+    """Rank reads best-first ascending; every other metric is better when higher."""
+    return metric != key_rank
+
+
+def _value(row: Any, metric: str, to_number: Callable[[Any], Optional[float]]) -> Optional[float]:
+    return to_number(row.get(metric))
+
+
+def ranked_rows(
+    rows: Sequence,
+    metric: Optional[str],
+    key_rank: Optional[str],
+    to_number: Callable[[Any], Optional[float]],
+    limit: Optional[int] = None,
+) -> List[RankedRow]:
+    """Return (row position, row) pairs ordered by `metric`, best first.
+
+    Rows without a Rank are dropped, as the dashboard always has; rows without a value
+    for `metric` go last. `limit` keeps only the first N.
+    """
+    if not metric or not key_rank:
+        return []
+    descending = is_descending(metric, key_rank)
+
+    order = getattr(rows, "order", None)
+    index = order(metric, descending) if order is not None else None
+    rank_values = rows.numeric_values(key_rank) if index is not None else None
+    if index is not None and rank_values is not None:
+        out: List[RankedRow] = []
+        for pos in index:
+            if math.isnan(rank_values[pos]):
+                continue
+            out.append((pos, rows[pos]))
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    candidates = [(pos, row) for pos, row in enumerate(rows) if _value(row, key_rank, to_number) is not None]
+    sign = -1 if descending else 1
+
+    def sort_key(item: RankedRow) -> Tuple[int, float, int]:
+        v = _value(item[1], metric, to_number)
+        return (1, 0.0, item[0]) if v is None else (0, sign * v, item[0])
+
+    if limit is not None and limit < len(candidates):
+        # Top-k without sorting everything: O(n log k)
+        return heapq.nsmallest(limit, candidates, key=sort_key)
+    return sorted(candidates, key=sort_key)
+
+
+def page_bounds(total: int, page: int, page_size: Optional[int]) -> Tuple[int, int, int, int]:
+    """Slice for one page of a ranked list: (start, stop, page, pages).
+
+    `page` is zero-based and clamped into range; `page_size` None or <= 0 means a
+    single page holding everything.
+    """
+    if not page_size or page_size <= 0 or total <= page_size:
+        return 0, total, 0, 1
+    pages = -(-total // page_size)
+    page = min(max(page, 0), pages - 1)
+    start = page * page_size
+    return start, min(start + page_size, total), page, pages
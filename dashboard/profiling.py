@@ -0,0 +1,171 @@
+"""
+Opt-in render profiling for the Streamlit dashboard (?profile=1 or DASHBOARD_PROFILE=1).
+
+The script run is cut into named sections with `RenderProfile.mark`: each mark closes
+the section before it, so the dashboard's top-to-bottom flow is profiled without
+re-indenting it. Per section the profile keeps wall time, the number of `st.markdown`
+and `st.columns` calls and the bytes of markdown/HTML sent.
+
+`instrument` wraps those two Streamlit functions once per process. The wrappers only
+count while a profile is active in the calling thread (each script run has its own),
+so sessions without profiling, and fragment reruns, pay one attribute lookup.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+log = logging.getLogger("dashboard.profile")
+
+_TRUE = ("1", "true", "yes", "on")
+
+_state = threading.local()
+
+
+def profiling_enabled(query_value: Any = None) -> bool:
+    """True when ?profile= or DASHBOARD_PROFILE asks for profiling."""
+    for raw in (query_value, os.environ.get("DASHBOARD_PROFILE")):
+        if str(raw or "").strip().lower() in _TRUE:
+            return True
+    return False
+
+
+@dataclass
+class SectionStats:
+    seconds: float = 0.0
+    markdown_calls: int = 0
+    columns_calls: int = 0
+    html_bytes: int = 0
+
+
+class RenderProfile:
+    """Time and Streamlit output of each section of one script run."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.sections: Dict[str, SectionStats] = {}
+        self._current: Optional[str] = None
+        self._since = 0.0
+        self._started = clock()
+        self.total_seconds = 0.0
+        self.mark("setup")
+
+    def mark(self, name: str) -> None:
+        """End the current section and start `name` (a section may be entered more than once)."""
+        now = self._clock()
+        self._close(now)
+        self._current = name
+        self._since = now
+        self.sections.setdefault(name, SectionStats())
+
+    def finish(self) -> None:
+        """Close the last section and stop counting in this thread."""
+        now = self._clock()
+        self._close(now)
+        self._current = None
+        self.total_seconds = now - self._started
+        if getattr(_state, "profile", None) is self:
+            _state.profile = None
+
+    def _close(self, now: float) -> None:
+        if self._current is not None:
+            self.sections[self._current].seconds += now - self._since
+
+    def _stats(self) -> SectionStats:
+        return self.sections[self._current or "setup"]
+
+    def record_markdown(self, body: Any) -> None:
+        stats = self._stats()
+        stats.markdown_calls += 1
+        stats.html_bytes += len(str(body).encode("utf-8"))
+
+    def record_columns(self) -> None:
+        self._stats().columns_calls += 1
+
+    def log_lines(self, **context: Any) -> List[str]:
+        """One JSON line per section plus a total, with `context` (dealer, page, ...) on each."""
+        lines = []
+        for name, stats in self.sections.items():
+            record = {"section": name, **context, **asdict(stats)}
+            record["seconds"] = round(stats.seconds, 6)
+            lines.append(json.dumps(record))
+        total = {
+            "section": "total",
+            **context,
+            "seconds": round(self.total_seconds, 6),
+            "markdown_calls": sum(s.markdown_calls for s in self.sections.values()),
+            "columns_calls": sum(s.columns_calls for s in self.sections.values()),
+            "html_bytes": sum(s.html_bytes for s in self.sections.values()),
+        }
+        lines.append(json.dumps(total))
+        return lines
+
+    def log(self, **context: Any) -> None:
+        for line in self.log_lines(**context):
+            log.info(line)
+
+    def overlay_html(self) -> str:
+        """A compact fixed-position table of the sections, slowest first."""
+        rows = "".join(
+            f"<tr><td>{html.escape(name)}</td><td>{stats.seconds * 1000:.1f}</td>"
+            f"<td>{stats.markdown_calls}</td><td>{stats.columns_calls}</td><td>{stats.html_bytes / 1024:.1f}</td></tr>"
+            for name, stats in sorted(self.sections.items(), key=lambda item: -item[1].seconds)
+        )
+        cell = "padding: 1px 6px; text-align: right;"
+        return f"""
+        <div style='position: fixed; right: 8px; bottom: 8px; z-index: 1000; background: rgba(17, 24, 39, 0.88);
+                    color: #F9FAFB; font: 11px/1.35 ui-monospace, monospace; border-radius: 6px; padding: 6px 8px;'>
+            <div style='font-weight: 700; margin-bottom: 2px;'>Render {self.total_seconds * 1000:.0f} ms</div>
+            <style>.render-profile td {{{cell}}} .render-profile td:first-child {{text-align: left;}}</style>
+            <table class='render-profile' style='border-collapse: collapse;'>
+                <tr><td>section</td><td>ms</td><td>md</td><td>cols</td><td>KB</td></tr>
+                {rows}
+            </table>
+        </div>
+        """
+
+
+def start_run(enabled: bool) -> RenderProfile:
+    """The profile of this script run; it only counts when `enabled`.
+
+    Also drops a profile left active by a run that ended early (`st.rerun`, an error).
+    """
+    profile = RenderProfile()
+    _state.profile = profile if enabled else None
+    return profile
+
+
+def instrument(st: Any) -> None:
+    """Count `st.markdown` and `st.columns` calls for the active profile (idempotent)."""
+    if getattr(st, "_render_profile_instrumented", False):
+        return
+    # Streamlit only configures its own loggers; the JSON lines go to stderr
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    markdown, columns = st.markdown, st.columns
+
+    def profiled_markdown(body: Any, *args: Any, **kwargs: Any) -> Any:
+        profile = getattr(_state, "profile", None)
+        if profile is not None:
+            profile.record_markdown(body)
+        return markdown(body, *args, **kwargs)
+
+    def profiled_columns(*args: Any, **kwargs: Any) -> Any:
+        profile = getattr(_state, "profile", None)
+        if profile is not None:
+            profile.record_columns()
+        return columns(*args, **kwargs)
+
+    st.markdown, st.columns = profiled_markdown, profiled_columns
+    st._render_profile_instrumented = True
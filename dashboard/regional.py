@@ -0,0 +1,215 @@
+"""
+Advisor leaderboard across every dealer in an Area or Region.
+
+Each dealer contributes one run: its advisors already ordered by Satisfaction Score,
+read from the `CompactRows` score index built at ingest (see `ranked_rows`). A
+regional ranking is a streaming k-way merge of those runs with `heapq.merge`, so the
+top N of k dealers costs O(N log k) and no row is ever re-sorted.
+
+Rankings that have been asked for are kept per scope. When a dealer republishes, only
+its run is rebuilt, and each kept ranking drops that dealer's old entries and merges
+in the new run in one linear pass instead of being recomputed from every dealer.
+Only scopes some dealer is in (those listed by `scopes()`) are kept, and only the
+`max_scopes` most recently asked for; a ranking left empty by an update is dropped.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dashboard.leaderboard import ranked_rows
+from dashboard.storage import Version, list_dealers, load_documents, storage_version
+
+# ("area" | "region", value), or None for every dealer
+Scope = Optional[Tuple[str, str]]
+
+SCOPE_LEVELS = ("area", "region")
+
+DEFAULT_KEPT_SCOPES = 16
+
+
+@dataclass(frozen=True)
+class RegionalEntry:
+    dealer: str
+    dealer_name: str
+    # Position of the row in the dealer's document, for a stable order among equal scores
+    position: int
+    employee: str
+    score: Optional[float]
+    completes: Optional[float]
+    dealer_rank: Optional[float]
+    area: str
+    region: str
+
+
+def _sort_key(entry: RegionalEntry) -> Tuple[int, float, str, int]:
+    # Best score first, blanks last; ties by dealer, then the dealer's own order
+    if entry.score is None:
+        return (1, 0.0, entry.dealer, entry.position)
+    return (0, -entry.score, entry.dealer, entry.position)
+
+
+def _scope_value(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _in_scope(entry: RegionalEntry, scope: Scope) -> bool:
+    if scope is None:
+        return True
+    level, value = scope
+    return _scope_value(entry.area if level == "area" else entry.region) == value
+
+
+def make_scope(level: str, value: Any) -> Scope:
+    """Normalize an ("area" | "region", value) pair; None when either part is missing."""
+    level = str(level or "").strip().lower()
+    if level not in SCOPE_LEVELS or not _scope_value(value):
+        return None
+    return (level, _scope_value(value))
+
+
+def _find_column(columns: Sequence[str], *candidates: str) -> Optional[str]:
+    lower = {c.lower(): c for c in columns}
+    return next((lower[c.lower()] for c in candidates if c.lower() in lower), None)
+
+
+def dealer_entries(
+    dealer: str, doc: Optional[Dict[str, Any]], to_number: Callable[[Any], Optional[float]]
+) -> List[RegionalEntry]:
+    """A dealer's advisors as regional entries, best Satisfaction Score first."""
+    dataset = (doc or {}).get("dataset") or {}
+    columns = dataset.get("columns") or []
+    rows = dataset.get("rows") or []
+    key_score = _find_column(columns, "Satisfaction Score", "Score")
+    key_rank = _find_column(columns, "Rank")
+    key_employee = _find_column(columns, "Employee", "Advisor", "Service Advisor", "Name")
+    key_completes = _find_column(columns, "Completes")
+    key_area = _find_column(columns, "Area")
+    key_region = _find_column(columns, "Region")
+    dealer_name = str(((doc or {}).get("dealer") or {}).get("name") or dealer)
+
+    # `ranked_rows` breaks ties by row position, which is already `_sort_key` order within a dealer
+    return [
+        RegionalEntry(
+            dealer=dealer,
+            dealer_name=dealer_name,
+            position=pos,
+            employee=str(row.get(key_employee) or "") if key_employee else "",
+            score=to_number(row.get(key_score)) if key_score else None,
+            completes=to_number(row.get(key_completes)) if key_completes else None,
+            dealer_rank=to_number(row.get(key_rank)),
+            area=str(row.get(key_area) or "") if key_area else "",
+            region=str(row.get(key_region) or "") if key_region else "",
+        )
+        for pos, row in ranked_rows(rows, key_score, key_rank, to_number)
+    ]
+
+
+def _merge(runs: Sequence[List[RegionalEntry]], scope: Scope) -> Iterator[RegionalEntry]:
+    if scope is None:
+        return heapq.merge(*runs, key=_sort_key)
+    return heapq.merge(*((e for e in run if _in_scope(e, scope)) for run in runs), key=_sort_key)
+
+
+class RegionalLeaderboard:
+    """Per-dealer runs and the merged rankings built from them; safe to share between sessions."""
+
+    def __init__(self, to_number: Callable[[Any], Optional[float]], max_scopes: int = DEFAULT_KEPT_SCOPES):
+        self._to_number = to_number
+        self.max_scopes = max(1, max_scopes)
+        self._runs: Dict[str, List[RegionalEntry]] = {}
+        self._versions: Dict[str, Version] = {}
+        self._merged: "OrderedDict[Scope, List[RegionalEntry]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _drop_empty(self) -> None:
+        # Scopes no dealer is in any more; the whole-network ranking stays even when empty
+        for scope in [s for s, merged in self._merged.items() if s is not None and not merged]:
+            del self._merged[scope]
+
+    def update(self, dealer: str, doc: Optional[Dict[str, Any]], version: Optional[Version] = None) -> None:
+        """Replace one dealer's run and fold it into every kept ranking."""
+        run = dealer_entries(dealer, doc, self._to_number)
+        with self._lock:
+            self._runs[dealer] = run
+            if version is not None:
+                self._versions[dealer] = version
+            for scope, merged in self._merged.items():
+                others = (e for e in merged if e.dealer != dealer)
+                self._merged[scope] = list(heapq.merge(others, (e for e in run if _in_scope(e, scope)), key=_sort_key))
+            self._drop_empty()
+
+    def remove(self, dealer: str) -> None:
+        with self._lock:
+            if self._runs.pop(dealer, None) is None:
+                return
+            self._versions.pop(dealer, None)
+            for scope, merged in self._merged.items():
+                self._merged[scope] = [e for e in merged if e.dealer != dealer]
+            self._drop_empty()
+
+    def sync(self, storage_dir: Optional[Path] = None) -> List[str]:
+        """Bring the runs in line with `storage/dealers/`; returns the dealers that changed.
+
+        Each dealer costs a `stat` per file; only republished dealers are read, and
+        their documents are dropped again once their entries are built.
+        """
+        dealers = list_dealers(storage_dir)
+        changed = []
+        for dealer in dealers:
+            version = storage_version(storage_dir, dealer)
+            if self._versions.get(dealer) == version:
+                continue
+            self.update(dealer, load_documents(storage_dir, dealer=dealer).get("advisors"), version)
+            changed.append(dealer)
+        for dealer in set(self._runs) - set(dealers):
+            self.remove(dealer)
+            changed.append(dealer)
+        return changed
+
+    def iter_ranked(self, scope: Scope = None) -> Iterator[RegionalEntry]:
+        """Stream the ranking for a scope; taking the first N reads only about N entries."""
+        with self._lock:
+            runs = list(self._runs.values())
+        return _merge(runs, scope)
+
+    def ranked(self, scope: Scope = None, limit: Optional[int] = None) -> List[RegionalEntry]:
+        """The ranking for a scope, kept and updated incrementally from then on.
+
+        A scope no dealer is in is merged on every call (to an empty list) and never kept.
+        """
+        with self._lock:
+            merged = self._merged.get(scope)
+            if merged is not None:
+                self._merged.move_to_end(scope)
+            elif limit is None:
+                merged = list(_merge(list(self._runs.values()), scope))
+                if merged or scope is None:
+                    self._merged[scope] = merged
+                    while len(self._merged) > self.max_scopes:
+                        self._merged.popitem(last=False)
+        if merged is None:
+            return list(itertools.islice(self.iter_ranked(scope), limit))
+        return merged[:limit] if limit is not None else merged
+
+    def scopes(self) -> Dict[str, List[str]]:
+        """Area and Region values present across the dealers, for pickers."""
+        with self._lock:
+            runs = list(self._runs.values())
+        found: Dict[str, set] = {level: set() for level in SCOPE_LEVELS}
+        for run in runs:
+            for e in run:
+                if e.area:
+                    found["area"].add(e.area)
+                if e.region:
+                    found["region"].add(e.region)
+        return {level: sorted(values) for level, values in found.items()}
+
+    def dealers(self) -> List[str]:
+        return sorted(self._runs)
@@ -0,0 +1,197 @@
+"""
+Static HTML snapshots of a dealer's TV dashboard, rendered once per published document set.
+
+Every TV showing a dealer shows the same thing until the next ingest, so the page is
+built here once, from the same HTML fragments as the Streamlit dashboard
+(`dashboard.components`), and written next to the dealer's documents as
+`snapshot.html`. The Node server serves it at `/tv/<dealer>`; a TV then costs one
+static file fetch per refresh (a 304 when nothing changed) instead of a script run.
+
+The page reloads itself every `refresh_seconds` and shows the first `limit`
+advisors and technicians by Rank. The team summary strip needs NumPy and is left
+out where it isn't installed (e.g. the Python used only for parsing).
+"""
+
+from __future__ import annotations
+
+import html
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dashboard.alerts import export_key, recent_alerts
+from dashboard.components import (
+    advisor_chip_value_html,
+    alerts_strip_html,
+    guess_key,
+    header_info,
+    normalize_display_name,
+    render_score_progress,
+    safe_number,
+    satisfaction_score_bar_html,
+    team_summary_strip_html,
+    technician_card_html,
+    technician_value_html,
+)
+from dashboard.leaderboard import DEFAULT_PAGE_SIZE, ranked_rows
+from dashboard.storage import DocumentSet, dealer_dir, load_documents
+from dashboard.theme import CUSTOM_CSS
+
+try:
+    from dashboard.analytics import SCORE_TARGET, document_team_summary
+except ImportError:  # NumPy missing: snapshots are rendered without the team summary strip
+    document_team_summary = None
+
+SNAPSHOT_FILE = "snapshot.html"
+DEFAULT_REFRESH_SECONDS = 30
+
+# Advisor card chips after the score: (label, column candidates)
+_ADVISOR_CHIPS = (
+    ("Fixed right first time", ["Fixed right first time"]),
+    ("Spoke to advisor immediately", ["Spoke to advisor immediately"]),
+    ("Kept informed", ["Kept informed"]),
+)
+
+_PAGE_CSS = """
+<style>
+body { margin: 0; padding: 12px 18px; background: #FFFFFF; color: #111827;
+       font-family: system-ui, -apple-system, "Segoe UI", Roboto, sans-serif; }
+.snapshot-columns { display: grid; grid-template-columns: 68fr 30fr; gap: 2%; align-items: start; }
+.snapshot-columns > div { min-width: 0; }
+.snapshot-footer { text-align: center; font-size: 12px; margin-top: 24px; }
+</style>
+"""
+
+
+def _advisor_cards(doc: Dict[str, Any], limit: Optional[int]) -> str:
+    dataset = doc.get("dataset", {})
+    columns = dataset.get("columns", [])
+    field_types = doc.get("fieldTypes", {})
+    key_employee = guess_key(columns, ["Employee", "Advisor", "Service Advisor", "Name"])
+    key_rank = guess_key(columns, ["Rank"])
+    key_score = guess_key(columns, ["Satisfaction Score", "Score"])
+    chip_keys = [(label, guess_key(columns, candidates)) for label, candidates in _ADVISOR_CHIPS]
+
+    cards = []
+    for _idx, row in ranked_rows(dataset.get("rows", []), key_rank, key_rank, safe_number, limit=limit):
+        rank = safe_number(row.get(key_rank) if key_rank else None)
+        name = html.escape(str(normalize_display_name(row.get(key_employee)) if key_employee else "—"))
+        chips = [("Satisfaction Score", render_score_progress(row.get(key_score) if key_score else None))]
+        for label, key in chip_keys:
+            value = row.get(key) if key else None
+            chips.append((label, advisor_chip_value_html(value, field_types.get(key, "string") if key else "string", key)))
+        chip_html = "".join(
+            f"<div class='metric-chip'><div class='chip-label'>{label}</div><div>{rendered}</div></div>" for label, rendered in chips
+        )
+        cards.append(
+            "<div class='advisor-card' style='border: 2px solid #E5E7EB; background: linear-gradient(180deg, #FFFFFF, #F9FAFB);'>"
+            "<div class='advisor-collapsed'>"
+            f"<div class='advisor-rank'>#{int(rank) if rank else '—'}</div>"
+            f"<div class='advisor-name'>{name}</div>{chip_html}<div></div>"
+            "</div></div>"
+        )
+    return "".join(cards) or "<p class='muted'>No advisor data available</p>"
+
+
+def _technician_cards(doc: Optional[Dict[str, Any]], limit: Optional[int]) -> str:
+    if doc is None:
+        return "<p class='muted'>No technician data available</p>"
+    dataset = doc.get("dataset", {})
+    columns = dataset.get("columns", [])
+    key_employee = guess_key(columns, ["Employee", "Technician", "Service Technician", "Name"])
+    key_rank = guess_key(columns, ["Rank"])
+    key_fixed_first = guess_key(columns, ["Fixed right first time"])
+    cards = []
+    for _idx, row in ranked_rows(dataset.get("rows", []), key_rank, key_rank, safe_number, limit=limit):
+        rank = safe_number(row.get(key_rank) if key_rank else None)
+        name = html.escape(str(normalize_display_name(row.get(key_employee)) if key_employee else "—"))
+        cards.append(technician_card_html(rank, name, technician_value_html(row, key_fixed_first, doc.get("fieldTypes", {}))))
+    return "".join(cards) or "<p class='muted'>No technician data found</p>"
+
+
+def render_snapshot(
+    docs: DocumentSet,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+    refresh_seconds: int = DEFAULT_REFRESH_SECONDS,
+    alerts: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """The TV dashboard for one document set as a complete HTML page, with `alerts` under the header."""
+    advisors = docs.get("advisors")
+    satisfaction = docs.get("satisfaction_score")
+
+    if advisors is not None:
+        title, subtitle, exported = header_info(advisors)
+        header = (
+            f"<h1 class='dashboard-title'>{html.escape(str(title))}</h1>"
+            f"<p class='muted dashboard-subtitle'>{subtitle}</p>"
+            f"<p class='muted dashboard-subtitle'>Last update: <strong>{html.escape(str(exported))}</strong></p>"
+        )
+    else:
+        title = "Service Employee Rank"
+        header = f"<h1 class='dashboard-title'>{title}</h1>"
+    header += alerts_strip_html(alerts)
+
+    left = []
+    if satisfaction is not None:
+        left.append(satisfaction_score_bar_html(satisfaction))
+    if advisors is not None and document_team_summary is not None:
+        summary = document_team_summary(advisors)
+        if summary is not None:
+            left.append(team_summary_strip_html(summary, SCORE_TARGET))
+    left.append("<h2 style='font-size: clamp(18px, 2vw, 24px); font-weight: 800; margin: 8px 0 4px;'>Advisors</h2>")
+    left.append(_advisor_cards(advisors, limit) if advisors is not None else "<p class='muted'>No advisor data available</p>")
+
+    generated = datetime.now(timezone.utc).astimezone().strftime("%b %d %Y %I:%M %p")
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta http-equiv="refresh" content="{int(refresh_seconds)}">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(str(title))}</title>
+{CUSTOM_CSS}
+{_PAGE_CSS}
+</head>
+<body>
+{header}
+<div class="snapshot-columns">
+<div>{''.join(left)}</div>
+<div>
+<h2 style='font-size: clamp(14px, 1.6vw, 20px); font-weight: 800; margin-bottom: 6px;'>Technicians</h2>
+{_technician_cards(docs.get("technicians"), limit)}
+</div>
+</div>
+<p class="muted snapshot-footer">Service Employee Dashboard • Snapshot of {generated}</p>
+</body>
+</html>
+"""
+
+
+def snapshot_path(storage_dir: Optional[Path] = None, dealer: Optional[str] = None) -> Path:
+    return dealer_dir(dealer, storage_dir) / SNAPSHOT_FILE
+
+
+def publish_snapshot(
+    storage_dir: Optional[Path] = None,
+    dealer: Optional[str] = None,
+    docs: Optional[DocumentSet] = None,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+    refresh_seconds: int = DEFAULT_REFRESH_SECONDS,
+) -> Path:
+    """Render a dealer's snapshot (from `docs`, or the stored documents) and swap it into place."""
+    if docs is None:
+        docs = load_documents(storage_dir, dealer=dealer)
+    advisors = docs.get("advisors")
+    alerts = recent_alerts(storage_dir, dealer, export=export_key(advisors)) if advisors is not None else []
+    page = render_snapshot(docs, limit=limit, refresh_seconds=refresh_seconds, alerts=alerts)
+    target = snapshot_path(storage_dir, dealer)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(page, encoding="utf-8")
+        os.replace(tmp, target)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return target
@@ -0,0 +1,370 @@
+"""
+Parsed documents under `storage/`, published and loaded as one consistent set.
+
+Each dealer's documents live in `storage/dealers/<dealer id>/`; the id is the one the
+parser stamps on rank documents (`doc["dealer"]["id"]`). Files directly in `storage/`
+are the single-dealer layout from before dealers were partitioned (dealer `None`).
+
+Every set that carries a reporting period (`doc["period"]["id"]`: 1D, MTD, QTD, ...)
+is kept in `periods/<period id>/` under the dealer's directory, so each period stays on
+hand after another period is published. The dealer's directory itself holds the whole
+set of the period published most recently. A Satisfaction Score names no period and
+is kept with every period.
+
+Used by the Streamlit upload page and by the watch-folder daemon (`watch_ingest.py`).
+Documents are (de)serialized with `compact_rows`, so `server/scripts` must be on
+`sys.path` before this module is imported.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from compact_rows import compact_document, json_default
+
+# Document kind -> file under storage/
+STORAGE_FILES = {
+    "advisors": "latest.json",
+    "technicians": "technicians.json",
+    "satisfaction_score": "satisfaction_score.json",
+}
+
+# Per-dealer directories under storage/
+DEALERS_DIR = "dealers"
+
+# Per-period directories under a dealer's directory
+PERIODS_DIR = "periods"
+
+# Periods in the order the dashboard offers them; others follow alphabetically
+PERIOD_ORDER = ("1d", "wtd", "mtd", "1m", "qtd", "3m", "ytd", "1y")
+
+# Ids as `parse_xlsx.dealer_id` produces them; anything else never names a directory
+_DEALER_ID_RE = re.compile(r"^[a-z0-9_-]+$")
+
+# Document kind -> document (None when not published), and the version it was loaded at
+DocumentSet = Dict[str, Optional[Dict[str, Any]]]
+Version = Tuple[int, ...]
+
+# Dealers whose documents stay loaded in a `DocumentCache` (DASHBOARD_DEALER_CACHE)
+DEFAULT_CACHED_DEALERS = 8
+
+
+def default_storage_dir() -> Path:
+    """`storage/` at the project root, or DASHBOARD_STORAGE_DIR (read on every call)."""
+    return Path(os.environ.get("DASHBOARD_STORAGE_DIR") or Path(__file__).resolve().parent.parent / "storage")
+
+
+def valid_dealer(dealer: Any) -> Optional[str]:
+    """`dealer` lower-cased if it is a well-formed dealer id, else None."""
+    ident = str(dealer or "").strip().lower()
+    return ident if _DEALER_ID_RE.match(ident) else None
+
+
+def valid_period(period: Any) -> Optional[str]:
+    """`period` lower-cased if it is a well-formed period id, else None."""
+    ident = str(period or "").strip().lower()
+    return ident if _DEALER_ID_RE.match(ident) else None
+
+
+def dealer_dir(dealer: Optional[str], storage_dir: Optional[Path] = None) -> Path:
+    """Where a dealer's documents live; `None` is the single-dealer layout in `storage/` itself."""
+    storage_dir = storage_dir or default_storage_dir()
+    if dealer is None:
+        return storage_dir
+    ident = valid_dealer(dealer)
+    if ident is None:
+        raise ValueError(f"Not a dealer id: {dealer!r}")
+    return storage_dir / DEALERS_DIR / ident
+
+
+def documents_dir(dealer: Optional[str], storage_dir: Optional[Path] = None, period: Optional[str] = None) -> Path:
+    """Where a dealer's set for `period` lives; `None` is the set published most recently."""
+    directory = dealer_dir(dealer, storage_dir)
+    if period is None:
+        return directory
+    ident = valid_period(period)
+    if ident is None:
+        raise ValueError(f"Not a period id: {period!r}")
+    return directory / PERIODS_DIR / ident
+
+
+def _period_sort_key(period: str) -> Tuple[int, str]:
+    return (PERIOD_ORDER.index(period) if period in PERIOD_ORDER else len(PERIOD_ORDER), period)
+
+
+def list_periods(storage_dir: Optional[Path] = None, dealer: Optional[str] = None) -> List[str]:
+    """Ids of the periods a dealer has published, 1D first."""
+    root = dealer_dir(dealer, storage_dir) / PERIODS_DIR
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return []
+    return sorted(
+        (
+            e.name
+            for e in entries
+            if e.is_dir() and valid_period(e.name) == e.name and any((root / e.name / f).exists() for f in STORAGE_FILES.values())
+        ),
+        key=_period_sort_key,
+    )
+
+
+def list_dealers(storage_dir: Optional[Path] = None) -> List[str]:
+    """Ids of the dealers that have at least one published document."""
+    root = (storage_dir or default_storage_dir()) / DEALERS_DIR
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return []
+    return sorted(
+        e.name
+        for e in entries
+        if e.is_dir() and valid_dealer(e.name) == e.name and any((root / e.name / f).exists() for f in STORAGE_FILES.values())
+    )
+
+
+def resolve_dealer(requested: Any = None, storage_dir: Optional[Path] = None) -> Tuple[Optional[str], List[str]]:
+    """The dealer a dashboard shows, and every dealer there is.
+
+    The requested id wins, then DASHBOARD_DEALER, then the only dealer. With several
+    dealers and none chosen the dealer is None; with no dealers at all, None means
+    the single-dealer layout.
+    """
+    dealers = list_dealers(storage_dir)
+    for candidate in (requested, os.environ.get("DASHBOARD_DEALER")):
+        ident = valid_dealer(candidate)
+        if ident is not None:
+            return ident, dealers
+    return (dealers[0] if len(dealers) == 1 else None), dealers
+
+
+def document_dealer(doc: Optional[Dict[str, Any]]) -> Optional[str]:
+    return valid_dealer(((doc or {}).get("dealer") or {}).get("id"))
+
+
+def document_period(doc: Optional[Dict[str, Any]]) -> Optional[str]:
+    return valid_period(((doc or {}).get("period") or {}).get("id"))
+
+
+def partition_by_period(
+    docs: Dict[str, Dict[str, Any]], known_periods: Iterable[str] = ()
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Split one dealer's set by reporting period.
+
+    Documents that name no period (the Satisfaction Score) join every period in the
+    set; published on their own, they join every period in `known_periods`.
+    """
+    groups: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    loose: Dict[str, Dict[str, Any]] = {}
+    for kind, doc in docs.items():
+        period = document_period(doc)
+        if period is None:
+            loose[kind] = doc
+        else:
+            groups.setdefault(period, {})[kind] = doc
+    if loose:
+        for period in list(groups) or known_periods:
+            groups.setdefault(period, {}).update(loose)
+    return groups
+
+
+def partition_by_dealer(
+    docs: Iterable[Tuple[str, Dict[str, Any]]], fallback: Optional[str] = None
+) -> Dict[Optional[str], Dict[str, Dict[str, Any]]]:
+    """Split (kind, document) pairs ingested together into one set per dealer.
+
+    Rank documents carry their dealer; a later document of the same kind and dealer
+    replaces an earlier one. Documents that name no dealer (the Satisfaction Score)
+    join the set's dealer when there is exactly one, else `fallback`.
+    """
+    groups: Dict[Optional[str], Dict[str, Dict[str, Any]]] = {}
+    loose: Dict[str, Dict[str, Any]] = {}
+    for kind, doc in docs:
+        dealer = document_dealer(doc)
+        if dealer is None:
+            loose[kind] = doc
+        else:
+            groups.setdefault(dealer, {})[kind] = doc
+    if loose:
+        target = next(iter(groups)) if len(groups) == 1 else fallback
+        groups.setdefault(target, {}).update(loose)
+    return groups
+
+
+def publish_documents(
+    docs: Dict[str, Dict[str, Any]], storage_dir: Optional[Path] = None, dealer: Optional[str] = None
+) -> int:
+    """Atomically publish documents that were ingested together.
+
+    Every document is stamped with the ingest id and the kinds in its set, written to a
+    temp file and fsynced; only then are they renamed into place. Readers use the stamps
+    to detect (and wait out) the short window in which only part of a set is renamed.
+
+    The set of each period in it is published to that period's directory first. The
+    dealer's latest set then becomes the whole set of the period just published (the
+    kinds not in this ingest are carried over from that period's directory, the kinds
+    it lacks are removed), so the latest view never mixes periods.
+    """
+    ingest_id = time.time_ns()
+    by_period = partition_by_period(docs, list_periods(storage_dir, dealer))
+    for period, group in by_period.items():
+        _publish_set(documents_dir(dealer, storage_dir, period), group, ingest_id)
+
+    latest_period = document_period(docs.get("advisors")) or next(
+        (p for p in map(document_period, docs.values()) if p is not None), None
+    )
+    if latest_period is None:
+        _publish_set(dealer_dir(dealer, storage_dir), docs, ingest_id)
+        return ingest_id
+    period_dir = documents_dir(dealer, storage_dir, latest_period)
+    latest = dict(by_period[latest_period])
+    for kind, name in STORAGE_FILES.items():
+        if kind not in latest:
+            stored = _read_raw(period_dir / name)
+            if stored is not None:
+                latest[kind] = stored
+    _publish_set(dealer_dir(dealer, storage_dir), latest, ingest_id, prune=True)
+    return ingest_id
+
+
+def _read_raw(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return doc if isinstance(doc, dict) else None
+
+
+def _publish_set(directory: Path, docs: Dict[str, Dict[str, Any]], ingest_id: int, prune: bool = False) -> None:
+    """Write `docs` into `directory` as one set; with `prune`, remove the kinds not in it."""
+    kinds = sorted(docs)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    staged: List[Tuple[Path, Path]] = []
+    try:
+        for kind in kinds:
+            doc = docs[kind]
+            doc["ingest"] = {"id": ingest_id, "set": kinds}
+            target = directory / STORAGE_FILES[kind]
+            tmp = directory / f".{target.name}.{ingest_id}.tmp"
+            staged.append((tmp, target))
+            with open(tmp, "w") as f:
+                json.dump(doc, f, indent=2, default=json_default)
+                f.flush()
+                os.fsync(f.fileno())
+        for tmp, target in staged:
+            os.replace(tmp, target)
+        if prune:
+            for kind, name in STORAGE_FILES.items():
+                if kind not in docs:
+                    (directory / name).unlink(missing_ok=True)
+    finally:
+        for tmp, _target in staged:
+            if tmp.exists():
+                tmp.unlink()
+
+
+def set_is_consistent(docs: DocumentSet) -> bool:
+    for doc in docs.values():
+        ingest = (doc or {}).get("ingest") or {}
+        for kind in ingest.get("set", []):
+            other = docs.get(kind)
+            if other is None:
+                return False
+            # Documents written outside this scheme (e.g. by the Node server) carry no stamp
+            other_id = (other.get("ingest") or {}).get("id")
+            if other_id is not None and other_id < ingest["id"]:
+                return False
+    return True
+
+
+def load_documents(
+    storage_dir: Optional[Path] = None, attempts: int = 5, dealer: Optional[str] = None, period: Optional[str] = None
+) -> DocumentSet:
+    """Load every stored document, retrying briefly if a publish is mid-flight."""
+    storage_dir = documents_dir(dealer, storage_dir, period)
+    docs: DocumentSet = {}
+    for attempt in range(attempts):
+        docs = {}
+        for kind, name in STORAGE_FILES.items():
+            path = storage_dir / name
+            try:
+                with open(path, "r") as f:
+                    docs[kind] = compact_document(json.load(f))
+            except (OSError, ValueError):
+                docs[kind] = None
+        if set_is_consistent(docs):
+            break
+        time.sleep(0.05 * (attempt + 1))
+    return docs
+
+
+def storage_version(
+    storage_dir: Optional[Path] = None, dealer: Optional[str] = None, period: Optional[str] = None
+) -> Version:
+    """Modification times of the stored documents; changes whenever any is republished.
+
+    A `stat` per file, so it is cheap enough to poll every few seconds.
+    """
+    storage_dir = documents_dir(dealer, storage_dir, period)
+    version = []
+    for name in STORAGE_FILES.values():
+        try:
+            version.append((storage_dir / name).stat().st_mtime_ns)
+        except OSError:
+            version.append(0)
+    return tuple(version)
+
+
+class DocumentCache:
+    """Loaded document sets of the most recently viewed dealers, shared by every session.
+
+    A set is reloaded when its `storage_version` changes. Only `max_dealers` dealers are
+    held; the least recently used one is dropped, with all its periods, when another is
+    loaded, so a process serving many dealer TVs keeps just the dealers on screen in
+    memory. Each period of a dealer is a set of its own, kept under that dealer, so
+    switching between periods on screen never reloads and never evicts another dealer.
+    """
+
+    def __init__(self, max_dealers: Optional[int] = None):
+        if max_dealers is None:
+            try:
+                max_dealers = int(os.environ.get("DASHBOARD_DEALER_CACHE", DEFAULT_CACHED_DEALERS))
+            except ValueError:
+                max_dealers = DEFAULT_CACHED_DEALERS
+        self.max_dealers = max(1, max_dealers)
+        # (storage dir, dealer) -> period -> (version, documents)
+        self._sets: "OrderedDict[Tuple[Path, Optional[str]], Dict[Optional[str], Tuple[Version, DocumentSet]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self, dealer: Optional[str], storage_dir: Optional[Path] = None, period: Optional[str] = None
+    ) -> Tuple[Version, DocumentSet]:
+        """(version, documents) of a dealer and period, loading them only if they changed on disk."""
+        key = (storage_dir or default_storage_dir(), dealer)
+        version = storage_version(key[0], dealer, period)
+        with self._lock:
+            cached = self._sets.get(key, {}).get(period)
+            if cached is not None and cached[0] == version:
+                self._sets.move_to_end(key)
+                return cached
+        docs = load_documents(key[0], dealer=dealer, period=period)
+        with self._lock:
+            self._sets.setdefault(key, {})[period] = (version, docs)
+            self._sets.move_to_end(key)
+            while len(self._sets) > self.max_dealers:
+                self._sets.popitem(last=False)
+        return version, docs
+
+    def __len__(self) -> int:
+        return len(self._sets)
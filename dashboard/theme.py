@@ -0,0 +1,353 @@
+"""
+Stylesheet for the Streamlit dashboard, recreating the original React design.
+
+Kept in a module so the string is built once per process rather than on every
+script rerun.
+"""
+
+CUSTOM_CSS = """
+<style>
+:root {
+  --bg0: #FFFFFF;
+  --bg1: #F9FAFB;
+  --card: #F3F4F6;
+  --line: #E5E7EB;
+  --text: #111827;
+  --muted: #6B7280;
+  --gold: #F59E0B;
+  --silver: #9CA3AF;
+  --bronze: #D97706;
+  --good: #10B981;
+  --bad: #EF4444;
+  
+  /* Responsive font sizes - scale with viewport */
+  --font-base: clamp(14px, 1.1vw, 18px);
+  --font-title: clamp(22px, 2.8vw, 36px);
+  --font-subtitle: clamp(12px, 1vw, 16px);
+  --font-rank: clamp(18px, 1.6vw, 26px);
+  --font-name: clamp(18px, 1.6vw, 24px);
+  --font-chip-label: clamp(12px, 1vw, 15px);
+  --font-chip-value: clamp(14px, 1.2vw, 20px);
+  --font-kpi-label: clamp(12px, 1vw, 15px);
+  --font-kpi-value: clamp(15px, 1.3vw, 20px);
+  
+  /* Responsive spacing */
+  --spacing-xs: clamp(4px, 0.4vw, 8px);
+  --spacing-sm: clamp(6px, 0.6vw, 10px);
+  --spacing-md: clamp(8px, 0.8vw, 12px);
+  --spacing-lg: clamp(10px, 1vw, 16px);
+  --spacing-xl: clamp(12px, 1.2vw, 20px);
+  
+  /* Card spacing */
+  --card-padding: clamp(8px, 1vw, 14px);
+  --card-gap: clamp(6px, 0.8vw, 12px);
+}
+
+/* Hide Streamlit branding and padding */
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+header {visibility: hidden;}
+
+/* Full screen light background */
+.stApp {
+    background: linear-gradient(160deg, #FFFFFF, #F9FAFB);
+    color: #111827;
+}
+
+/* Remove default Streamlit padding */
+.block-container {
+    padding-top: 0.3rem !important;
+    padding-bottom: 0.3rem !important;
+    padding-left: clamp(0.5rem, 1vw, 1.5rem) !important;
+    padding-right: clamp(0.5rem, 1vw, 1.5rem) !important;
+    max-width: 100% !important;
+}
+
+/* Custom styling for elements */
+.stButton button {
+    background: rgba(255, 255, 255, 0.7);
+    backdrop-filter: blur(10px);
+    color: #111827;
+    font-weight: 800;
+    border: 1px solid rgba(0, 0, 0, 0.1);
+    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05);
+    padding: var(--spacing-md) var(--spacing-lg);
+    border-radius: clamp(8px, 0.8vw, 12px);
+    cursor: pointer;
+    font-size: var(--font-base);
+    transition: all 0.2s ease;
+}
+
+.stButton button:hover {
+    background: rgba(255, 255, 255, 0.9);
+    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
+    transform: translateY(-1px);
+}
+
+/* File uploader styling */
+.uploadedFile {
+    border: 1px solid #E5E7EB;
+    border-radius: 12px;
+    padding: var(--spacing-md);
+    background: #F9FAFB;
+}
+
+/* Expander styling */
+.streamlit-expanderHeader {
+    background: transparent !important;
+    border: none !important;
+    color: #111827 !important;
+    font-weight: 800 !important;
+}
+
+/* Mono font for numbers */
+.mono {
+    font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
+}
+
+/* Muted text */
+.muted {
+    color: #A7B3DA;
+    opacity: 0.95;
+}
+
+/* Dot separator */
+.dot {
+    opacity: 0.7;
+    margin: 0 0.5rem;
+}
+
+/* Responsive title and headers */
+.dashboard-title {
+    font-size: var(--font-title);
+    font-weight: 800;
+    margin-bottom: clamp(2px, 0.3vw, 4px);
+    line-height: 1.1;
+}
+
+.dashboard-subtitle {
+    font-size: var(--font-subtitle);
+    margin-bottom: clamp(4px, 0.5vw, 6px);
+    line-height: 1.3;
+}
+
+/* Responsive advisor card */
+.advisor-card {
+    border-radius: clamp(8px, 1vw, 12px);
+    margin-bottom: clamp(4px, 0.5vw, 6px);
+    overflow: hidden;
+    box-shadow: 0 clamp(2px, 0.3vw, 4px) clamp(6px, 0.8vw, 10px) rgba(0, 0, 0, 0.08);
+}
+
+/* Collapsed view - responsive layout */
+.advisor-collapsed {
+    padding: var(--card-padding);
+    display: grid;
+    grid-template-columns: 
+        minmax(50px, 0.4fr) 
+        minmax(150px, 2fr) 
+        repeat(4, minmax(120px, 1fr)) 
+        minmax(40px, 0.3fr);
+    gap: clamp(4px, 0.5vw, 8px);
+    align-items: center;
+}
+
+.advisor-rank {
+    font-weight: 950;
+    font-size: var(--font-rank);
+    opacity: 0.95;
+}
+
+.advisor-name {
+    font-weight: 950;
+    font-size: var(--font-name);
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
+}
+
+/* Metric chips - responsive */
+.metric-chip {
+    border: 1px solid #E5E7EB;
+    border-radius: 999px;
+    padding: clamp(6px, 0.6vw, 8px) clamp(8px, 0.8vw, 10px);
+    background: #F9FAFB;
+    display: flex;
+    flex-direction: column;
+    gap: clamp(3px, 0.4vw, 5px);
+    min-width: 0;
+}
+
+.chip-label {
+    font-size: var(--font-chip-label);
+    font-weight: 700;
+    color: var(--muted);
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
+}
+
+.chip-value {
+    font-size: var(--font-chip-value);
+    font-weight: 800;
+}
+
+/* Expanded view - responsive grid - HORIZONTAL OPTIMIZED */
+.kpi-grid-container {
+    border-top: 1px solid #E5E7EB;
+    padding: var(--spacing-md) var(--spacing-lg);
+    background: #F9FAFB;
+}
+
+.kpi-grid {
+    display: grid;
+    /* Optimize for horizontal layout - more columns, fewer rows */
+    grid-template-columns: repeat(auto-fit, minmax(clamp(160px, 15vw, 220px), 1fr));
+    gap: var(--spacing-sm) var(--spacing-md);
+    grid-auto-flow: row;
+    align-items: stretch;
+}
+
+.kpi-card {
+    border: 1px solid #E5E7EB;
+    border-radius: clamp(10px, 1vw, 14px);
+    padding: var(--spacing-md) var(--spacing-lg);
+    background: #FFFFFF;
+    min-width: 0;
+    display: flex;
+    flex-direction: column;
+    justify-content: space-between;
+    min-height: clamp(75px, 8vw, 95px);
+}
+
+.kpi-label {
+    font-size: var(--font-kpi-label);
+    font-weight: 700;
+    color: var(--muted);
+    margin-bottom: var(--spacing-xs);
+    line-height: 1.25;
+    word-wrap: break-word;
+    overflow: hidden;
+    text-overflow: ellipsis;
+    display: -webkit-box;
+    -webkit-line-clamp: 2;
+    -webkit-box-orient: vertical;
+}
+
+.kpi-value {
+    font-size: var(--font-kpi-value);
+    font-weight: 800;
+    min-width: 0;
+    word-wrap: break-word;
+    line-height: 1.2;
+}
+
+/* Circular progress - responsive sizing */
+.progress-container {
+    display: flex;
+    align-items: center;
+    gap: var(--spacing-sm);
+}
+
+.progress-svg {
+    width: clamp(36px, 3vw, 48px);
+    height: clamp(36px, 3vw, 48px);
+    transform: rotate(-90deg);
+    filter: drop-shadow(0 2px 4px rgba(0, 0, 0, 0.1));
+    flex-shrink: 0;
+}
+
+.progress-text {
+    font-size: var(--font-chip-value);
+    font-weight: 800;
+    min-width: clamp(55px, 5.5vw, 80px);
+}
+
+/* Media queries for specific breakpoints - HORIZONTAL OPTIMIZED */
+@media (max-width: 1400px) {
+    .advisor-collapsed {
+        grid-template-columns: 
+            minmax(50px, 0.4fr) 
+            minmax(120px, 1.5fr) 
+            repeat(4, minmax(100px, 1fr)) 
+            minmax(35px, 0.2fr);
+    }
+    
+    .kpi-grid {
+        /* Keep 5-6 columns even on medium screens */
+        grid-template-columns: repeat(auto-fit, minmax(clamp(150px, 14vw, 200px), 1fr));
+    }
+}
+
+@media (max-width: 1100px) {
+    .advisor-collapsed {
+        grid-template-columns: 
+            minmax(45px, 0.3fr) 
+            minmax(100px, 1.2fr) 
+            repeat(2, minmax(90px, 1fr)) 
+            minmax(30px, 0.2fr);
+        grid-template-rows: auto auto;
+    }
+    
+    .advisor-collapsed > :nth-child(n+5):nth-child(-n+6) {
+        grid-column: 3 / 5;
+    }
+    
+    .kpi-grid {
+        /* Keep 4-5 columns on tablets - prioritize horizontal */
+        grid-template-columns: repeat(auto-fit, minmax(clamp(140px, 18vw, 180px), 1fr));
+    }
+}
+
+@media (max-width: 900px) {
+    .kpi-grid {
+        /* 3-4 columns on smaller tablets */
+        grid-template-columns: repeat(auto-fit, minmax(clamp(130px, 22vw, 170px), 1fr));
+    }
+}
+
+@media (max-width: 768px) {
+    .advisor-collapsed {
+        display: flex;
+        flex-direction: column;
+        align-items: stretch;
+        gap: var(--spacing-sm);
+    }
+    
+    .metric-chip {
+        width: 100%;
+    }
+    
+    .kpi-grid {
+        /* Still maintain 2-3 columns on mobile landscape */
+        grid-template-columns: repeat(auto-fit, minmax(clamp(120px, 30vw, 160px), 1fr));
+    }
+    
+    .block-container {
+        padding-left: 0.5rem !important;
+        padding-right: 0.5rem !important;
+    }
+}
+
+@media (max-width: 600px) {
+    .kpi-grid {
+        /* Only go to 2 columns on very small screens */
+        grid-template-columns: repeat(auto-fit, minmax(clamp(140px, 45vw, 200px), 1fr));
+    }
+}
+
+@media (min-width: 1800px) {
+    :root {
+        --font-base: 16px;
+        --font-title: 34px;
+        --font-rank: 24px;
+        --font-name: 22px;
+    }
+    
+    .kpi-grid {
+        /* Maximum columns on large screens */
+        grid-template-columns: repeat(auto-fit, minmax(clamp(160px, 12vw, 220px), 1fr));
+    }
+}
+</style>
+"""
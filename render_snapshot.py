@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Render a dealer's static TV snapshot from its published documents.
+
+Usage:
+  python3 render_snapshot.py [--storage DIR] [--dealer ID] [--limit N] [--refresh SECONDS]
+
+Writes `snapshot.html` into the dealer's storage directory (see `dashboard.snapshot`).
+The Streamlit upload page and the watch-folder daemon do this after every publish;
+the Node server runs this script after an upload.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+_SCRIPTS_DIR = str(Path(__file__).resolve().parent / "server" / "scripts")
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+from dashboard.leaderboard import DEFAULT_PAGE_SIZE  # noqa: E402
+from dashboard.snapshot import DEFAULT_REFRESH_SECONDS, publish_snapshot  # noqa: E402
+from dashboard.storage import valid_dealer  # noqa: E402
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--storage", default=None, help="storage directory (default: DASHBOARD_STORAGE_DIR or ./storage)")
+    p.add_argument("--dealer", default=None, help="dealer id (default: the single-dealer layout)")
+    p.add_argument("--limit", type=int, default=DEFAULT_PAGE_SIZE, help="advisors and technicians shown (default: %(default)s)")
+    p.add_argument("--refresh", type=int, default=DEFAULT_REFRESH_SECONDS, help="seconds between TV reloads (default: %(default)s)")
+    args = p.parse_args(argv[1:])
+
+    dealer = valid_dealer(args.dealer) if args.dealer else None
+    if args.dealer and dealer is None:
+        print(f"Not a dealer id: {args.dealer}", file=sys.stderr)
+        return 2
+    storage_dir = Path(args.storage).expanduser().resolve() if args.storage else None
+    target = publish_snapshot(storage_dir, dealer, limit=args.limit or None, refresh_seconds=args.refresh)
+    print(target)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
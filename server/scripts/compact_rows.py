@@ -0,0 +1,243 @@
+"""
+Column-oriented, compact storage for parsed employee rows (Python stdlib only).
+
+A parsed export used to be held as one dict per employee keyed by column name, so
+memory grew with rows x columns of dict slots and boxed values. `CompactRows` keeps
+one store per column instead:
+
+- number / percent columns: an `array('d')` of values plus a one-byte kind per cell,
+  so ints, floats and blanks round-trip exactly (rare non-numeric cells go in a
+  sparse side table);
+- string columns: a tuple of interned strings, so repeated values such as Dealer,
+  Area and Region share one object.
+
+It still behaves like the old `rows` list: `rows[i]` is a read-only mapping with
+`.get()`, rows can be sorted and iterated, and `json_default` serializes it.
+
+Every numeric column also gets a sorted index (`array('I')` of row positions) when
+the rows are built, so ordering the leaderboard by any metric is a lookup.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+# Per-cell kinds of a numeric column
+_EMPTY = 0
+_INT = 1
+_FLOAT = 2
+_OTHER = 3
+
+_NAN = float("nan")
+# Ints beyond this lose precision as doubles and go in the side table instead
+_MAX_EXACT_INT = 2**53
+
+
+class NumericColumn:
+    __slots__ = ("values", "kinds", "other")
+
+    def __init__(self, raw: Iterable[Any] = ()):
+        self.values = array("d")
+        self.kinds = bytearray()
+        self.other: Dict[int, Any] = {}
+        for v in raw:
+            self.append(v)
+
+    def append(self, v: Any) -> None:
+        if isinstance(v, int) and not isinstance(v, bool) and -_MAX_EXACT_INT <= v <= _MAX_EXACT_INT:
+            self.values.append(float(v))
+            self.kinds.append(_INT)
+        elif isinstance(v, float):
+            self.values.append(v)
+            self.kinds.append(_FLOAT)
+        elif v == "" or v is None:
+            self.values.append(_NAN)
+            self.kinds.append(_EMPTY)
+        else:
+            self.other[len(self.kinds)] = sys.intern(v) if isinstance(v, str) else v
+            self.values.append(_NAN)
+            self.kinds.append(_OTHER)
+
+    def get(self, i: int) -> Any:
+        k = self.kinds[i]
+        if k == _INT:
+            return int(self.values[i])
+        if k == _FLOAT:
+            return self.values[i]
+        if k == _EMPTY:
+            return ""
+        return self.other[i]
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+
+class StringColumn:
+    __slots__ = ("values",)
+
+    def __init__(self, raw: Iterable[Any] = ()):
+        self.values = tuple(sys.intern(v) if isinstance(v, str) else v for v in raw)
+
+    def get(self, i: int) -> Any:
+        return self.values[i]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+Column = Union[NumericColumn, StringColumn]
+
+
+class RowView(Mapping):
+    """Read-only dict-like view of one row."""
+
+    __slots__ = ("_rows", "_i")
+
+    def __init__(self, rows: "CompactRows", i: int):
+        self._rows = rows
+        self._i = i
+
+    def __getitem__(self, key: str) -> Any:
+        col = self._rows._stores.get(key)
+        if col is None:
+            raise KeyError(key)
+        return col.get(self._i)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows.columns)
+
+    def __len__(self) -> int:
+        return len(self._rows.columns)
+
+    def __repr__(self) -> str:
+        return f"RowView({dict(self)!r})"
+
+
+class CompactRows(Sequence):
+    """Sequence of row mappings backed by per-column stores."""
+
+    __slots__ = ("columns", "_stores", "_len", "_asc", "_desc", "_valid")
+
+    def __init__(self, columns: List[str], stores: Dict[str, Column], length: int):
+        self.columns = list(columns)
+        self._stores = stores
+        self._len = length
+        # Per numeric column: positions sorted ascending / descending with blanks last,
+        # and how many leading positions hold a number.
+        self._asc: Dict[str, array] = {}
+        self._desc: Dict[str, array] = {}
+        self._valid: Dict[str, int] = {}
+        for name, col in stores.items():
+            if isinstance(col, NumericColumn):
+                self._build_order(name, col)
+
+    def _build_order(self, name: str, col: NumericColumn) -> None:
+        values = col.values
+        present = [i for i in range(len(values)) if not math.isnan(values[i])]
+        missing = array("I", (i for i in range(len(values)) if math.isnan(values[i])))
+        # Equal values keep row order in both directions
+        present.sort(key=values.__getitem__)
+        self._asc[name] = array("I", present) + missing
+        present.sort(key=lambda i: (-values[i], i))
+        self._desc[name] = array("I", present) + missing
+        self._valid[name] = len(present)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Mapping],
+        columns: List[str],
+        field_types: Dict[str, str],
+    ) -> "CompactRows":
+        """Build from row mappings.
+
+        `field_types` is read only after `rows` is exhausted, so it may be promoted
+        while a generator is being consumed (as `_iter_dataset_rows` does).
+        """
+        raw: Dict[str, List[Any]] = {c: [] for c in columns}
+        n = 0
+        for row in rows:
+            for c in columns:
+                v = row.get(c, "")
+                # Interned as they come in, so repeated strings (Dealer, Area, ...) are held once
+                raw[c].append(sys.intern(v) if type(v) is str else v)
+            n += 1
+
+        stores: Dict[str, Column] = {}
+        for c in columns:
+            if field_types.get(c) in ("number", "percent"):
+                stores[c] = NumericColumn(raw[c])
+            else:
+                stores[c] = StringColumn(raw[c])
+            raw[c] = []
+        return cls(columns, stores, n)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            return [RowView(self, j) for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("row index out of range")
+        return RowView(self, i)
+
+    def column(self, name: str) -> Optional[Column]:
+        return self._stores.get(name)
+
+    def numeric_values(self, name: str) -> Optional[array]:
+        """The `array('d')` behind a number/percent column (NaN where blank or non-numeric)."""
+        col = self._stores.get(name)
+        return col.values if isinstance(col, NumericColumn) else None
+
+    def order(self, name: str, descending: bool = False) -> Optional[array]:
+        """Row positions sorted by a numeric column, blanks last; ties keep row order.
+
+        Returns None for columns without an index (string columns, unknown names).
+        """
+        return (self._desc if descending else self._asc).get(name)
+
+    def valid_count(self, name: str) -> int:
+        """How many rows have a number in an indexed column."""
+        return self._valid.get(name, 0)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [dict(r) for r in self]
+
+
+def _drain(rows: List[Any]) -> Iterator[Any]:
+    """Yield `rows` in order, emptying the list as it goes so each row can be freed once read."""
+    rows.reverse()
+    while rows:
+        yield rows.pop()
+
+
+def compact_document(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Swap a rank document's row dicts for `CompactRows` in place (no-op for other docs).
+
+    The row dicts are released one by one as their values are copied out, so loading a
+    document never holds both representations in full.
+    """
+    if not doc:
+        return doc
+    dataset = doc.get("dataset")
+    if not isinstance(dataset, dict) or not isinstance(dataset.get("rows"), list):
+        return doc
+    columns = dataset.get("columns") or []
+    dataset["rows"] = CompactRows.from_rows(_drain(dataset["rows"]), columns, doc.get("fieldTypes") or {})
+    return doc
+
+
+def json_default(o: Any) -> Any:
+    """`default=` hook for json.dump/json.dumps."""
+    if isinstance(o, CompactRows):
+        return o.to_dicts()
+    if isinstance(o, RowView):
+        return dict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
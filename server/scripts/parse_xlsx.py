@@ -3,51 +3,71 @@
 Parse Tekion-exported XLSX (Office Open XML) using Python stdlib only.
 
 Usage:
-  python3 parse_xlsx.py /path/to/input.xlsx /path/to/output.json
+  python3 parse_xlsx.py /path/to/input.xlsx /path/to/output.json [--format json|ndjson]
+                       [--backend expat|etree] [--columns "Employee,Rank,..."] [--no-mmap]
+                       [--max-memory-mb N] [--expect advisor_rank,technician_rank]
+                       [--max-member-mb N] [--max-rows N] [--max-cells-per-row N]
+                       [--max-shared-strings N] [--timings]
+  python3 parse_xlsx.py /path/to/input.xlsx /path/to/sniff.json --sniff
+
+Output is written row by row with compact separators. NDJSON output starts with a
+header record ({"type": "header", meta, title, columns, fieldTypes, source,
+generatedAt}) followed by one row object per line.
+
+The Streamlit app imports this module for uploads: `parse_xlsx_bytes` returns the same
+document with `CompactRows` rows, and `parse_satisfaction_score_xlsx` reads the
+Service Satisfaction Score summary export.
+
+`--sniff` / `sniff_xlsx_bytes` classify a workbook as advisor rank, technician rank,
+satisfaction score or unknown from the first rows of each sheet, so a file dropped in
+the wrong slot is caught before the full decode; `--expect` does that check inline.
+
+Every read is bounded by `ParseLimits` (inflated part size, rows, cells per row, shared
+strings; see `xlsx_backends.py`), set by the `--max-*` flags or XLSX_MAX_* variables.
+A workbook over a limit exits with status 4 and a one-line reason on stderr.
+
+`--timings` prints one JSON line on stdout when the parse succeeds,
+{"timings": {"sniff", "decode", "write", "total"}} in seconds, which the server
+records in its parse-duration metrics.
 """
 
 from __future__ import annotations
 
+import argparse
+import io
+import itertools
 import json
+import mmap
 import re
 import sys
+import time
 import zipfile
 import xml.etree.ElementTree as ET
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
-
-NS = {
-    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
-    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
-}
-
-
-def _col_to_index(col: str) -> int:
-    idx = 0
-    for ch in col:
-        if "A" <= ch <= "Z":
-            idx = idx * 26 + (ord(ch) - 64)
-    return idx
-
-
-def _parse_shared_strings(z: zipfile.ZipFile) -> List[str]:
-    p = "xl/sharedStrings.xml"
-    if p not in z.namelist():
-        return []
-    root = ET.fromstring(z.read(p))
-    out: List[str] = []
-    for si in root.findall("main:si", NS):
-        ts = [t.text or "" for t in si.findall(".//main:t", NS)]
-        out.append("".join(ts))
-    return out
-
-
-def _parse_workbook_sheets(z: zipfile.ZipFile) -> List[Tuple[str, str]]:
-    wb_root = ET.fromstring(z.read("xl/workbook.xml"))
-    rel_root = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from compact_rows import CompactRows
+from xlsx_backends import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    NS,
+    ParseLimits,
+    WorkbookLimitError,
+    XlsxBackend,
+    col_to_index,
+    get_backend,
+    index_to_col,
+    open_member,
+    read_member,
+)
+
+
+def _parse_workbook_sheets(z: zipfile.ZipFile, limits: ParseLimits) -> List[Tuple[str, str]]:
+    wb_root = ET.fromstring(read_member(z, "xl/workbook.xml", limits))
+    rel_root = ET.fromstring(read_member(z, "xl/_rels/workbook.xml.rels", limits))
     rid_to_target = {
         rel.get("Id"): rel.get("Target") for rel in rel_root.findall("rel:Relationship", NS)
     }
@@ -65,40 +85,6 @@ def _parse_workbook_sheets(z: zipfile.ZipFile) -> List[Tuple[str, str]]:
     return sheets
 
 
-def _parse_sheet_rows(z: zipfile.ZipFile, sheet_path: str, shared: List[str]) -> List[List[str]]:
-    root = ET.fromstring(z.read(sheet_path))
-    rows: List[List[str]] = []
-    for row in root.findall(".//main:sheetData/main:row", NS):
-        cells: Dict[str, str] = {}
-        for c in row.findall("main:c", NS):
-            r = c.get("r")
-            if not r:
-                continue
-            col = "".join([ch for ch in r if ch.isalpha()])
-            v = c.find("main:v", NS)
-            if v is None:
-                continue
-            val = v.text or ""
-            t = c.get("t")
-            if t == "s":
-                try:
-                    val = shared[int(val)]
-                except Exception:
-                    pass
-            cells[col] = val
-
-        if not cells:
-            rows.append([])
-            continue
-
-        max_col = max(_col_to_index(k) for k in cells)
-        arr = [""] * max_col
-        for k, v in cells.items():
-            arr[_col_to_index(k) - 1] = v
-        rows.append(arr)
-    return rows
-
-
 def _normalize_row(row: List[str]) -> List[str]:
     # Trim trailing empty cells
     r = list(row)
@@ -107,13 +93,17 @@ def _normalize_row(row: List[str]) -> List[str]:
     return [("" if v is None else str(v).strip()) for v in r]
 
 
+def _is_header_row(r: List[str]) -> bool:
+    lower = [c.lower() for c in r if c]
+    return "employee" in lower and "rank" in lower
+
+
 def _find_header_row(rows: List[List[str]]) -> Optional[int]:
     for i, row in enumerate(rows):
         r = _normalize_row(row)
         if not r:
             continue
-        lower = [c.lower() for c in r if c]
-        if "employee" in lower and "rank" in lower:
+        if _is_header_row(r):
             return i
     return None
 
@@ -186,11 +176,12 @@ def _parse_filters(filters_rows: List[List[str]]) -> Dict[str, Any]:
 class Dataset:
     title: str
     columns: List[str]
-    rows: List[Dict[str, Any]]
+    rows: CompactRows
     field_types: Dict[str, str]
 
 
-def _build_dataset(data_rows: List[List[str]]) -> Dataset:
+def _dataset_header(data_rows: List[List[str]]) -> Tuple[int, str, List[str]]:
+    """Locate the header row and return (header index, title, column names)."""
     header_idx = _find_header_row(data_rows)
     if header_idx is None:
         raise RuntimeError("Could not find header row (expected 'Employee' and 'Rank').")
@@ -208,21 +199,68 @@ def _build_dataset(data_rows: List[List[str]]) -> Dataset:
     columns = _normalize_row(data_rows[header_idx])
     # remove empty column names
     columns = [c for c in columns if c]
+    return header_idx, title, columns
+
+
+# Always kept by a projection: rows are only emitted for named employees, and the
+# header row is recognised by these two
+_REQUIRED_COLUMNS = ("employee", "rank")
 
-    rows_out: List[Dict[str, Any]] = []
-    field_types: Dict[str, str] = {c: "string" for c in columns}
 
+def _column_key(name: str) -> str:
+    return re.sub(r"\s+", " ", str(name).strip()).lower()
+
+
+def _project_columns(columns: List[str], wanted: Optional[Collection[str]]) -> Tuple[List[str], List[int]]:
+    """Names and header positions of the wanted columns, in sheet order (all when `wanted` is None)."""
+    if wanted is None:
+        return list(columns), list(range(len(columns)))
+    keys = {_column_key(w) for w in wanted} | set(_REQUIRED_COLUMNS)
+    positions = [i for i, c in enumerate(columns) if _column_key(c) in keys]
+    return [columns[i] for i in positions], positions
+
+
+class _HeaderProjection:
+    """`RowProjection` for one sheet: once the header row is decoded, keep only wanted columns."""
+
+    def __init__(self, wanted: Collection[str]):
+        self._wanted = wanted
+
+    def __call__(self, row: List[str]) -> Optional[Set[str]]:
+        r = _normalize_row(row)
+        if not r or not _is_header_row(r):
+            return None
+        # Data cells are read by their position among the named header cells
+        _names, positions = _project_columns([c for c in r if c], self._wanted)
+        return {index_to_col(i + 1) for i in positions}
+
+
+def _iter_dataset_rows(
+    data_rows: List[List[str]],
+    header_idx: int,
+    columns: List[str],
+    field_types: Dict[str, str],
+    positions: Optional[List[int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one coerced row dict per employee, promoting `field_types` in place.
+
+    `positions[i]` is where `columns[i]` sits in the header (default: i), so a projected
+    subset of columns reads the same cells as a full parse.
+    """
+    if positions is None:
+        positions = list(range(len(columns)))
+    width = positions[-1] + 1 if positions else 0
     for raw_row in data_rows[header_idx + 1 :]:
         r = _normalize_row(raw_row)
         if not r or not any(c for c in r):
             continue
         # pad to columns length
-        if len(r) < len(columns):
-            r = r + [""] * (len(columns) - len(r))
+        if len(r) < width:
+            r = r + [""] * (width - len(r))
 
         obj: Dict[str, Any] = {}
         has_employee = False
-        for i, col in enumerate(columns):
+        for i, col in zip(positions, columns):
             val, t = _coerce_value(r[i] if i < len(r) else "")
             obj[col] = val
             # promote type if more specific
@@ -231,28 +269,67 @@ def _build_dataset(data_rows: List[List[str]]) -> Dataset:
             if col.lower() == "employee" and isinstance(val, str) and val.strip():
                 has_employee = True
         if has_employee:
-            rows_out.append(obj)
+            yield obj
 
-    return Dataset(title=title, columns=columns, rows=rows_out, field_types=field_types)
 
+def _build_dataset(data_rows: List[List[str]], wanted: Optional[Collection[str]] = None) -> Dataset:
+    header_idx, title, all_columns = _dataset_header(data_rows)
+    columns, positions = _project_columns(all_columns, wanted)
+    field_types: Dict[str, str] = {c: "string" for c in columns}
+    rows_out = CompactRows.from_rows(
+        _iter_dataset_rows(data_rows, header_idx, columns, field_types, positions), columns, field_types
+    )
+    return Dataset(title=title, columns=columns, rows=rows_out, field_types=field_types)
 
-def main(argv: List[str]) -> int:
-    if len(argv) != 3:
-        print("Usage: parse_xlsx.py input.xlsx output.json", file=sys.stderr)
-        return 2
 
-    in_path = Path(argv[1]).expanduser().resolve()
-    out_path = Path(argv[2]).expanduser().resolve()
-    if not in_path.exists():
-        raise FileNotFoundError(str(in_path))
+def _read_sheet_map(
+    z: zipfile.ZipFile,
+    backend: XlsxBackend,
+    wanted: Optional[Collection[str]] = None,
+    limits: Optional[ParseLimits] = None,
+) -> Dict[str, List[List[str]]]:
+    """Decode every sheet; with `wanted`, cells outside those columns are skipped below a header row."""
+    limits = limits or ParseLimits.from_env()
+    shared = backend.shared_strings(z, limits)
+    sheet_map: Dict[str, List[List[str]]] = {}
+    for name, sheet_path in _parse_workbook_sheets(z, limits):
+        project = _HeaderProjection(wanted) if wanted is not None else None
+        sheet_map[name] = backend.sheet_rows(z, sheet_path, shared, project, limits)
+    return sheet_map
+
+
+class _MappedFile(mmap.mmap):
+    """A read-only mapping usable as a zip file object (mmap gains `seekable()` in 3.13)."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+@contextmanager
+def _open_workbook(path: Path, use_mmap: bool = True) -> Iterator[zipfile.ZipFile]:
+    """Open an on-disk workbook with zip members read straight from a read-only mapping.
+
+    The central directory and deflated streams then come from the page cache without
+    going through a buffered reader. Falls back to ordinary reads where the file can't
+    be mapped (empty files, some network shares, an exhausted address-space cap).
+    """
+    with open(path, "rb") as f:
+        mapped = None
+        if use_mmap:
+            try:
+                mapped = _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                mapped = None
+        try:
+            with zipfile.ZipFile(mapped if mapped is not None else f, "r") as z:
+                yield z
+        finally:
+            if mapped is not None:
+                mapped.close()
 
-    with zipfile.ZipFile(in_path, "r") as z:
-        shared = _parse_shared_strings(z)
-        sheets = _parse_workbook_sheets(z)
-        sheet_map: Dict[str, List[List[str]]] = {}
-        for name, sheet_path in sheets:
-            sheet_map[name] = _parse_sheet_rows(z, sheet_path, shared)
 
+def _pick_sheets(sheet_map: Dict[str, List[List[str]]]) -> Tuple[str, Optional[str]]:
+    """Return (data sheet, filters sheet or None)."""
     data_sheet = None
     filters_sheet = None
     # Prefer expected names, else fallback
@@ -271,14 +348,76 @@ def main(argv: List[str]) -> int:
     if not data_sheet:
         # last resort: first sheet
         data_sheet = list(sheet_map.keys())[0]
+    return data_sheet, filters_sheet
+
+
+# Dealer id used when an export names no dealer at all
+DEFAULT_DEALER = "default"
+
+
+def dealer_id(raw: Any) -> str:
+    """A dealer code or name made safe for paths and URLs ("" when nothing usable is left)."""
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", str(raw or "").strip()).strip("-").lower()
+
+
+def dealer_of(meta: Dict[str, Any], first_row: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+    """The dealer an export belongs to, as {id, name}.
 
-    dataset = _build_dataset(sheet_map[data_sheet])
+    Taken from the Level filter ("426085 - Stevens Creek Volkswagen"), else from the
+    Dealer column of the first employee row, the same fallback the dashboard header uses.
+    """
+    level = str(meta.get("Level") or "").strip()
+    number, _sep, name = level.partition(" - ")
+    if not _sep:
+        number, name = "", level
+    if not number and first_row:
+        number = str(next((v for k, v in first_row.items() if str(k).strip().lower() == "dealer"), "") or "")
+    ident = dealer_id(number) or dealer_id(name) or DEFAULT_DEALER
+    return {"id": ident, "name": name.strip() or number.strip()}
+
+
+def period_of(meta: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """The reporting period of an export, as {id, type, date}; None when the Filters sheet names none.
+
+    `type` is the Period Type filter as shown ("1D", "MTD", "QTD", ...) and `date` the
+    Period Date filter ("December"), when there is one.
+    """
+    kind = str(meta.get("Period Type") or "").strip()
+    ident = dealer_id(kind)
+    if not ident:
+        return None
+    return {"id": ident, "type": kind, "date": str(meta.get("Period Date") or "").strip()}
+
+
+def _generated_at() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def parse_xlsx_bytes(
+    xlsx_bytes: bytes,
+    backend: str = DEFAULT_BACKEND,
+    columns: Optional[Collection[str]] = None,
+    limits: Optional[ParseLimits] = None,
+) -> Dict[str, Any]:
+    """Parse an Employee Rank export held in memory into a document (rows as `CompactRows`).
+
+    `columns` limits the dataset to those column names (matched case-insensitively;
+    Employee and Rank are always kept). Other cells are never decoded. `limits`
+    defaults to `ParseLimits.from_env()`; exceeding one raises `WorkbookLimitError`.
+    """
+    with zipfile.ZipFile(io.BytesIO(xlsx_bytes), "r") as z:
+        sheet_map = _read_sheet_map(z, get_backend(backend), columns, limits)
+    data_sheet, filters_sheet = _pick_sheets(sheet_map)
+
+    dataset = _build_dataset(sheet_map[data_sheet], columns)
     meta = {}
     if filters_sheet and filters_sheet in sheet_map:
         meta = _parse_filters(sheet_map[filters_sheet])
 
-    doc = {
+    return {
         "meta": meta,
+        "dealer": dealer_of(meta, dataset.rows[0] if len(dataset.rows) else None),
+        "period": period_of(meta),
         "dataset": {
             "title": dataset.title,
             "columns": dataset.columns,
@@ -288,13 +427,511 @@ def main(argv: List[str]) -> int:
         "source": {
             "dataSheet": data_sheet,
             "filtersSheet": filters_sheet or "",
-            "filename": in_path.name,
         },
-        "generatedAt": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        "generatedAt": _generated_at(),
     }
 
+
+_MAIN_TAG = "{%s}" % NS["main"]
+
+
+class _LazySharedStrings:
+    """Shared-strings table that is decoded only as far as the highest index requested."""
+
+    def __init__(self, z: zipfile.ZipFile, limits: ParseLimits):
+        self._strings: List[str] = []
+        self._events = None
+        self._limits = limits
+        p = "xl/sharedStrings.xml"
+        if p in z.namelist():
+            self._events = ET.iterparse(open_member(z, p, limits), events=("end",))
+
+    def get(self, idx: int) -> str:
+        while idx >= len(self._strings) and self._events is not None:
+            for _event, elem in self._events:
+                if elem.tag == _MAIN_TAG + "si":
+                    self._strings.append("".join(t.text or "" for t in elem.iter(_MAIN_TAG + "t")))
+                    elem.clear()
+                    self._limits.check_shared_strings(len(self._strings))
+                    break
+            else:
+                self._events = None
+        return self._strings[idx] if idx < len(self._strings) else str(idx)
+
+
+def _cell_text(c: ET.Element, shared: _LazySharedStrings) -> str:
+    t = c.get("t")
+    if t == "inlineStr":
+        return "".join(x.text or "" for x in c.iter(_MAIN_TAG + "t"))
+    v = c.find(_MAIN_TAG + "v")
+    if v is None:
+        return ""
+    val = v.text or ""
+    if t == "s":
+        try:
+            return shared.get(int(val))
+        except ValueError:
+            pass
+    return val
+
+
+def _scan_for_row(
+    z: zipfile.ZipFile, sheet_path: str, first_cell_contains: str, limits: ParseLimits
+) -> Optional[List[str]]:
+    """Stream a sheet and return the first row whose column-A text contains the needle.
+
+    Only column-A shared strings are resolved until the row is found; parsing stops there.
+    """
+    shared = _LazySharedStrings(z, limits)
+    needle = first_cell_contains.lower()
+    seen = 0
+    for _event, row in ET.iterparse(open_member(z, sheet_path, limits), events=("end",)):
+        if row.tag != _MAIN_TAG + "row":
+            continue
+        seen += 1
+        limits.check_rows(seen, sheet_path)
+        cells = row.findall(_MAIN_TAG + "c")
+        limits.check_cells(len(cells), sheet_path)
+        first = None
+        for c in cells:
+            col = "".join(ch for ch in (c.get("r") or "") if ch.isalpha())
+            if col == "A":
+                first = c
+                break
+        if first is None or needle not in _cell_text(first, shared).lower():
+            row.clear()
+            continue
+
+        return _row_values(cells, shared)
+    return None
+
+
+def _row_values(cells: List[ET.Element], shared: _LazySharedStrings) -> List[str]:
+    """Text of a row's `<c>` elements laid out from column A."""
+    values: Dict[str, str] = {}
+    for c in cells:
+        col = "".join(ch for ch in (c.get("r") or "") if ch.isalpha())
+        if col:
+            values[col] = _cell_text(c, shared)
+    if not values:
+        return []
+    arr = [""] * max(col_to_index(k) for k in values)
+    for k, v in values.items():
+        arr[col_to_index(k) - 1] = v
+    return arr
+
+
+def _head_rows(
+    z: zipfile.ZipFile, sheet_path: str, shared: _LazySharedStrings, limit: int, limits: ParseLimits
+) -> List[List[str]]:
+    """The first `limit` rows of a sheet; the rest of the sheet is never read."""
+    rows: List[List[str]] = []
+    for _event, row in ET.iterparse(open_member(z, sheet_path, limits), events=("end",)):
+        if row.tag != _MAIN_TAG + "row":
+            continue
+        cells = row.findall(_MAIN_TAG + "c")
+        limits.check_cells(len(cells), sheet_path)
+        rows.append(_normalize_row(_row_values(cells, shared)))
+        row.clear()
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+def parse_satisfaction_score_xlsx(xlsx_bytes: bytes, limits: Optional[ParseLimits] = None) -> Dict[str, Any]:
+    """Parse a Satisfaction Score export held in memory into {score, national, region, area}."""
+    limits = limits or ParseLimits.from_env()
+    # Expected format on the Data sheet:
+    # Row 0: Header with timestamp
+    # Row 1: Column names (empty, "Score", "National", "Region", "Area")
+    # Row 2: "Overall Performance" followed by the four scores
+    with zipfile.ZipFile(io.BytesIO(xlsx_bytes), "r") as z:
+        sheets = _parse_workbook_sheets(z, limits)
+        if not sheets:
+            raise RuntimeError("Satisfaction Score file has no sheets")
+        sheet_path = next((path for name, path in sheets if name.lower() == "data"), sheets[0][1])
+        data_row = _scan_for_row(z, sheet_path, "overall performance", limits)
+
+    if not data_row or len(data_row) < 5:
+        raise RuntimeError("Could not find Overall Performance data row")
+
+    try:
+        score = float(data_row[1]) if data_row[1] else 0
+        national = float(data_row[2]) if data_row[2] else 0
+        region = float(data_row[3]) if data_row[3] else 0
+        area = float(data_row[4]) if data_row[4] else 0
+    except (ValueError, IndexError) as e:
+        raise RuntimeError(f"Could not parse satisfaction scores: {e}")
+
+    return {
+        "score": score,
+        "national": national,
+        "region": region,
+        "area": area,
+        "generatedAt": _generated_at(),
+    }
+
+
+# Export kinds told apart by `sniff_workbook`
+ADVISOR_RANK = "advisor_rank"
+TECHNICIAN_RANK = "technician_rank"
+SATISFACTION_SCORE = "satisfaction_score"
+UNKNOWN = "unknown"
+KINDS = (ADVISOR_RANK, TECHNICIAN_RANK, SATISFACTION_SCORE, UNKNOWN)
+RANK_KINDS = (ADVISOR_RANK, TECHNICIAN_RANK)
+
+# Exit status of the CLI when `--expect` rejects the workbook
+EXIT_WRONG_KIND = 3
+# ... and when the workbook exceeds one of its `ParseLimits`
+EXIT_LIMIT = 4
+
+# Rows read from the top of each sheet; every export has its header well within this
+SNIFF_ROWS = 12
+
+
+@dataclass
+class Sniff:
+    kind: str
+    sheet: str = ""
+    reason: str = ""
+    # False when a rank export names no role anywhere; `kind` is then the advisor default
+    role_known: bool = False
+
+    def matches(self, kinds: Collection[str]) -> bool:
+        """Whether this workbook may go where `kinds` are expected (a role-less rank export fits either rank kind)."""
+        if self.kind in kinds:
+            return True
+        return self.kind in RANK_KINDS and not self.role_known and any(k in RANK_KINDS for k in kinds)
+
+    @property
+    def label(self) -> str:
+        if self.kind in RANK_KINDS and not self.role_known:
+            return "Employee Rank"
+        return _KIND_LABELS[self.kind]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "sheet": self.sheet, "reason": self.reason, "roleKnown": self.role_known}
+
+
+_KIND_LABELS = {
+    ADVISOR_RANK: "Service Advisors rank",
+    TECHNICIAN_RANK: "Service Technicians rank",
+    SATISFACTION_SCORE: "Service Satisfaction Score",
+    UNKNOWN: "unrecognized",
+}
+
+
+def _role_in(texts: Iterable[str]) -> Optional[str]:
+    for text in texts:
+        lower = text.lower()
+        if "technician" in lower:
+            return TECHNICIAN_RANK
+        if "advisor" in lower:
+            return ADVISOR_RANK
+    return None
+
+
+def _is_satisfaction_row(r: List[str]) -> bool:
+    if r and "overall performance" in r[0].lower():
+        return True
+    lower = {c.lower() for c in r if c}
+    return {"score", "national", "region"} <= lower
+
+
+def sniff_workbook(z: zipfile.ZipFile, limits: Optional[ParseLimits] = None) -> Sniff:
+    """Classify an export from its sheet list and the first rows of each sheet.
+
+    Only `SNIFF_ROWS` rows per sheet and the shared strings they use are decoded, so
+    this takes milliseconds regardless of the roster size.
+    """
+    limits = limits or ParseLimits.from_env()
+    sheets = _parse_workbook_sheets(z, limits)
+    if not sheets:
+        return Sniff(UNKNOWN, reason="workbook has no sheets")
+    # The Data sheet first, then the rest in workbook order
+    sheets.sort(key=lambda s: s[0].lower() != "data")
+    shared = _LazySharedStrings(z, limits)
+    heads = {name: _head_rows(z, path, shared, SNIFF_ROWS, limits) for name, path in sheets}
+
+    for name, rows in heads.items():
+        header_idx = _find_header_row(rows)
+        if header_idx is None:
+            continue
+        # Role words can only come from the title rows, role-named columns, filter values or sheet names
+        role_columns = [c for c in rows[header_idx] if c.lower() in ("advisor", "service advisor", "technician", "service technician")]
+        above = [c for r in rows[:header_idx] for c in r if c]
+        filters = [c for other, r in heads.items() if other != name for row in r for c in row[1:] if c]
+        role = _role_in(role_columns + above + filters + [s for s, _p in sheets])
+        if role is None:
+            return Sniff(ADVISOR_RANK, name, "Employee/Rank header, no role named", role_known=False)
+        return Sniff(role, name, f"Employee/Rank header, role {role.split('_')[0]}", role_known=True)
+
+    for name, rows in heads.items():
+        if any(_is_satisfaction_row(r) for r in rows):
+            return Sniff(SATISFACTION_SCORE, name, "Overall Performance / Score-National-Region summary")
+
+    return Sniff(UNKNOWN, sheets[0][0], f"no Employee/Rank header or score summary in the first {SNIFF_ROWS} rows")
+
+
+def sniff_xlsx_bytes(xlsx_bytes: bytes, limits: Optional[ParseLimits] = None) -> Sniff:
+    """`sniff_workbook` for an upload held in memory; files that aren't workbooks are `unknown`."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(xlsx_bytes), "r") as z:
+            return sniff_workbook(z, limits)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        return Sniff(UNKNOWN, reason=f"not a readable XLSX workbook ({e})")
+    except WorkbookLimitError as e:
+        return Sniff(UNKNOWN, reason=str(e).rstrip("."))
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _write_json_stream(
+    out: TextIO,
+    meta: Dict[str, Any],
+    dealer: Dict[str, str],
+    period: Optional[Dict[str, str]],
+    title: str,
+    columns: List[str],
+    rows: Iterable[Dict[str, Any]],
+    field_types: Dict[str, str],
+    source: Dict[str, Any],
+    generated_at: str,
+) -> None:
+    """Write the document row by row; `field_types` is read only after the rows are drained."""
+    out.write(
+        '{"meta":%s,"dealer":%s,"period":%s,"dataset":{"title":%s,"columns":%s,"rows":['
+        % (_dumps(meta), _dumps(dealer), _dumps(period), _dumps(title), _dumps(columns))
+    )
+    for i, row in enumerate(rows):
+        if i:
+            out.write(",")
+        out.write(_dumps(row))
+    out.write(
+        ']},"fieldTypes":%s,"source":%s,"generatedAt":%s}'
+        % (_dumps(field_types), _dumps(source), _dumps(generated_at))
+    )
+
+
+def _write_ndjson_stream(
+    out: TextIO,
+    meta: Dict[str, Any],
+    dealer: Dict[str, str],
+    period: Optional[Dict[str, str]],
+    title: str,
+    columns: List[str],
+    rows: Iterable[Dict[str, Any]],
+    field_types: Dict[str, str],
+    source: Dict[str, Any],
+    generated_at: str,
+) -> None:
+    """Write a header record, then one row object per line."""
+    header = {
+        "type": "header",
+        "meta": meta,
+        "dealer": dealer,
+        "period": period,
+        "title": title,
+        "columns": columns,
+        "fieldTypes": field_types,
+        "source": source,
+        "generatedAt": generated_at,
+    }
+    out.write(_dumps(header) + "\n")
+    for row in rows:
+        out.write(_dumps(row) + "\n")
+
+
+def _limit_memory(max_memory_mb: int) -> None:
+    """Cap this process's address space so a pathological workbook fails fast."""
+    if max_memory_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows; the server-side timeout still applies.
+        return
+    limit = max_memory_mb * 1024 * 1024
+    try:
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _split_columns(raw: Optional[str]) -> Optional[List[str]]:
+    if raw is None or not raw.strip():
+        return None
+    return [c.strip() for c in raw.split(",") if c.strip()]
+
+
+def _arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="parse_xlsx.py", description="Parse a Tekion XLSX export into JSON.")
+    p.add_argument("input", help="input .xlsx path")
+    p.add_argument("output", help="output .json / .ndjson path")
+    p.add_argument(
+        "--format",
+        choices=("json", "ndjson"),
+        default=None,
+        help="output format (default: ndjson for .ndjson/.jsonl outputs, else json)",
+    )
+    p.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f"XLSX reader (default: {DEFAULT_BACKEND}; etree is the reference implementation)",
+    )
+    p.add_argument(
+        "--columns",
+        default=None,
+        help="comma-separated column names to keep (Employee and Rank are always kept; default: all)",
+    )
+    p.add_argument(
+        "--sniff",
+        action="store_true",
+        help="only classify the workbook and write {kind, sheet, reason, roleKnown} to the output",
+    )
+    p.add_argument(
+        "--expect",
+        default=None,
+        metavar="KINDS",
+        help=f"comma-separated kinds to accept ({', '.join(KINDS[:-1])}); "
+        f"anything else exits with status {EXIT_WRONG_KIND} before the full parse",
+    )
+    p.add_argument(
+        "--no-mmap",
+        action="store_true",
+        help="read the input through a buffered file instead of a memory mapping",
+    )
+    env_limits = ParseLimits.from_env()
+    p.add_argument(
+        "--max-member-mb",
+        type=float,
+        default=env_limits.max_member_mb,
+        help="largest inflated size of any XML part (default: %(default)s; 0 = unlimited; env XLSX_MAX_MEMBER_MB)",
+    )
+    p.add_argument(
+        "--max-rows",
+        type=int,
+        default=env_limits.max_rows,
+        help="most rows in any sheet (default: %(default)s; 0 = unlimited; env XLSX_MAX_ROWS)",
+    )
+    p.add_argument(
+        "--max-cells-per-row",
+        type=int,
+        default=env_limits.max_cells_per_row,
+        help="most cells in any row (default: %(default)s; 0 = unlimited; env XLSX_MAX_CELLS_PER_ROW)",
+    )
+    p.add_argument(
+        "--max-shared-strings",
+        type=int,
+        default=env_limits.max_shared_strings,
+        help="most entries in the shared-strings table (default: %(default)s; 0 = unlimited; env XLSX_MAX_SHARED_STRINGS)",
+    )
+    p.add_argument(
+        "--max-memory-mb",
+        type=int,
+        default=0,
+        help="cap the parser's address space (0 = unlimited; ignored where unsupported)",
+    )
+    p.add_argument(
+        "--timings",
+        action="store_true",
+        help='print {"timings": {phase: seconds}} as one JSON line on stdout when done',
+    )
+    return p
+
+
+def main(argv: List[str]) -> int:
+    args = _arg_parser().parse_args(argv[1:])
+    _limit_memory(args.max_memory_mb)
+    limits = ParseLimits(
+        max_member_mb=args.max_member_mb,
+        max_rows=args.max_rows,
+        max_cells_per_row=args.max_cells_per_row,
+        max_shared_strings=args.max_shared_strings,
+    )
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        status = _run(args, limits, timings)
+    except WorkbookLimitError as e:
+        print(f"Workbook too large: {e}", file=sys.stderr)
+        return EXIT_LIMIT
+    if status == 0 and args.timings:
+        timings["total"] = time.perf_counter() - started
+        print(_dumps({"timings": {phase: round(seconds, 6) for phase, seconds in timings.items()}}))
+    return status
+
+
+def _run(args: argparse.Namespace, limits: ParseLimits, timings: Dict[str, float]) -> int:
+
+    in_path = Path(args.input).expanduser().resolve()
+    out_path = Path(args.output).expanduser().resolve()
+    if not in_path.exists():
+        raise FileNotFoundError(str(in_path))
+
+    wanted = _split_columns(args.columns)
+    expected = _split_columns(args.expect)
+    with _open_workbook(in_path, use_mmap=not args.no_mmap) as z:
+        if args.sniff or expected:
+            mark = time.perf_counter()
+            sniff = sniff_workbook(z, limits)
+            timings["sniff"] = time.perf_counter() - mark
+            if args.sniff:
+                out_path.parent.mkdir(parents=True, exist_ok=True)
+                out_path.write_text(_dumps(sniff.to_dict()), encoding="utf-8")
+                return 0
+            if not sniff.matches(expected):
+                print(
+                    f"Wrong file: {sniff.label} export ({sniff.reason}); "
+                    f"expected {' or '.join(_KIND_LABELS.get(k, k) for k in expected)}.",
+                    file=sys.stderr,
+                )
+                return EXIT_WRONG_KIND
+        mark = time.perf_counter()
+        sheet_map = _read_sheet_map(z, get_backend(args.backend), wanted, limits)
+        timings["decode"] = time.perf_counter() - mark
+    mark = time.perf_counter()
+    data_sheet, filters_sheet = _pick_sheets(sheet_map)
+
+    data_rows = sheet_map[data_sheet]
+    header_idx, title, all_columns = _dataset_header(data_rows)
+    columns, positions = _project_columns(all_columns, wanted)
+    meta = {}
+    if filters_sheet and filters_sheet in sheet_map:
+        meta = _parse_filters(sheet_map[filters_sheet])
+    source = {
+        "dataSheet": data_sheet,
+        "filtersSheet": filters_sheet or "",
+        "filename": in_path.name,
+    }
+    generated_at = _generated_at()
+
+    fmt = args.format or ("ndjson" if out_path.suffix.lower() in (".ndjson", ".jsonl") else "json")
+    field_types: Dict[str, str] = {c: "string" for c in columns}
+    if fmt == "ndjson":
+        # The header record carries fieldTypes, so settle them with a dry pass first.
+        for _row in _iter_dataset_rows(data_rows, header_idx, columns, field_types, positions):
+            pass
+        writer = _write_ndjson_stream
+    else:
+        writer = _write_json_stream
+    rows = _iter_dataset_rows(data_rows, header_idx, columns, field_types, positions)
+    # The dealer may come from the first row, which is read ahead and put back
+    first_row = next(rows, None)
+    if first_row is not None:
+        rows = itertools.chain((first_row,), rows)
+    dealer = dealer_of(meta, first_row)
+
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    with open(out_path, "w", encoding="utf-8", newline="\n") as out:
+        writer(out, meta, dealer, period_of(meta), title, columns, rows, field_types, source, generated_at)
+    timings["write"] = time.perf_counter() - mark
     return 0
 
 
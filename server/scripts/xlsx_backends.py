@@ -0,0 +1,477 @@
+"""
+Readers for the shared-strings table and worksheet cells of an XLSX (stdlib only).
+
+Two interchangeable backends produce identical output:
+
+- `etree`: ElementTree `iterparse` + `findall` on one row at a time, the reference
+  implementation;
+- `expat`: `pyexpat` callbacks that decode cells straight into row buffers without
+  building an element tree. Faster and lighter on memory; the default.
+
+A backend only reads cell text. Header detection, type coercion and the document
+shape stay in `parse_xlsx.py`. For column projection a backend accepts a `project`
+callback: it sees each decoded row until it returns a set of column letters, and from
+then on cells in any other column are skipped without being decoded.
+
+Every read is bounded by `ParseLimits`: a part's inflated size, rows per sheet, cells
+per row and shared strings are counted as the XML streams in, and the first one over
+its limit raises `WorkbookLimitError`. A zip bomb or a hostile sheet fails within
+a bounded amount of memory rather than filling it.
+"""
+
+from __future__ import annotations
+
+import abc
+import os
+import xml.etree.ElementTree as ET
+import zipfile
+from dataclasses import dataclass, fields
+from pyexpat import ParserCreate
+from typing import IO, Callable, Dict, List, Mapping, Optional, Set
+
+NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+SHARED_STRINGS_PATH = "xl/sharedStrings.xml"
+
+
+class WorkbookLimitError(RuntimeError):
+    """A workbook exceeded one of its `ParseLimits`."""
+
+
+@dataclass(frozen=True)
+class ParseLimits:
+    """Ceilings enforced while a workbook is read (0 disables one).
+
+    The defaults leave room for a regional roster several times larger than any
+    real export while staying well below what the kiosk box can hold.
+    """
+
+    max_member_mb: float = 128
+    max_rows: int = 250_000
+    max_cells_per_row: int = 1_000
+    max_shared_strings: int = 1_000_000
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "ParseLimits":
+        """Defaults overridden by XLSX_MAX_MEMBER_MB, XLSX_MAX_ROWS, XLSX_MAX_CELLS_PER_ROW, XLSX_MAX_SHARED_STRINGS."""
+        environ = os.environ if environ is None else environ
+        values = {}
+        for f in fields(cls):
+            raw = str(environ.get(_LIMIT_ENV[f.name], "")).strip()
+            if not raw:
+                continue
+            try:
+                n = float(raw) if f.type == "float" else int(raw)
+            except ValueError:
+                continue
+            if n >= 0:
+                values[f.name] = n
+        return cls(**values)
+
+    @property
+    def member_bytes(self) -> int:
+        return int(self.max_member_mb * 1024 * 1024)
+
+    def check_rows(self, count: int, where: str) -> None:
+        if self.max_rows and count > self.max_rows:
+            raise WorkbookLimitError(f"{where} has more than {self.max_rows} rows ({_LIMIT_ENV['max_rows']}).")
+
+    def check_cells(self, count: int, where: str) -> None:
+        if self.max_cells_per_row and count > self.max_cells_per_row:
+            raise WorkbookLimitError(
+                f"{where} has a row with more than {self.max_cells_per_row} cells ({_LIMIT_ENV['max_cells_per_row']})."
+            )
+
+    def check_shared_strings(self, count: int) -> None:
+        if self.max_shared_strings and count > self.max_shared_strings:
+            raise WorkbookLimitError(
+                f"{SHARED_STRINGS_PATH} has more than {self.max_shared_strings} strings "
+                f"({_LIMIT_ENV['max_shared_strings']})."
+            )
+
+
+_LIMIT_ENV = {
+    "max_member_mb": "XLSX_MAX_MEMBER_MB",
+    "max_rows": "XLSX_MAX_ROWS",
+    "max_cells_per_row": "XLSX_MAX_CELLS_PER_ROW",
+    "max_shared_strings": "XLSX_MAX_SHARED_STRINGS",
+}
+
+
+class _BoundedReader:
+    """A zip member stream that raises once more than `cap` inflated bytes have been read."""
+
+    def __init__(self, f: IO[bytes], name: str, limits: ParseLimits):
+        self._f = f
+        self._name = name
+        self._limits = limits
+        self._left = limits.member_bytes
+
+    def read(self, n: int = -1) -> bytes:
+        # Never pull more than one byte past the cap, even for read()
+        data = self._f.read(self._left + 1 if n is None or n < 0 or n > self._left + 1 else n)
+        self._left -= len(data)
+        if self._left < 0:
+            raise _member_too_large(self._name, self._limits)
+        return data
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "_BoundedReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _member_too_large(name: str, limits: ParseLimits) -> WorkbookLimitError:
+    return WorkbookLimitError(
+        f"{name} inflates to more than {limits.max_member_mb:g} MB ({_LIMIT_ENV['max_member_mb']})."
+    )
+
+
+def open_member(z: zipfile.ZipFile, name: str, limits: ParseLimits) -> IO[bytes]:
+    """Open a zip member for streaming, refusing it up front if its declared size is over the limit."""
+    info = z.getinfo(name)
+    if not limits.max_member_mb:
+        return z.open(info)
+    if info.file_size > limits.member_bytes:
+        raise _member_too_large(name, limits)
+    return _BoundedReader(z.open(info), name, limits)
+
+
+def read_member(z: zipfile.ZipFile, name: str, limits: ParseLimits) -> bytes:
+    with open_member(z, name, limits) as f:
+        return f.read()
+
+
+def col_to_index(col: str) -> int:
+    idx = 0
+    for ch in col:
+        if "A" <= ch <= "Z":
+            idx = idx * 26 + (ord(ch) - 64)
+    return idx
+
+
+def index_to_col(idx: int) -> str:
+    """1-based column index -> letters (inverse of `col_to_index`)."""
+    out = ""
+    while idx > 0:
+        idx, r = divmod(idx - 1, 26)
+        out = chr(65 + r) + out
+    return out
+
+
+# Returns the column letters to keep from the next row on, or None to keep decoding everything
+RowProjection = Callable[[List[str]], Optional[Set[str]]]
+
+# Column letters -> 1-based index; a workbook only ever uses a few dozen columns
+_COLUMN_INDEX: Dict[str, int] = {}
+
+
+def _column_index(col: str) -> int:
+    idx = _COLUMN_INDEX.get(col)
+    if idx is None:
+        idx = _COLUMN_INDEX[col] = col_to_index(col)
+    return idx
+
+
+def _column_letters(ref: str) -> str:
+    """"AB12" -> "AB" (every alphabetic character of a cell reference)."""
+    col = ref.rstrip("0123456789")
+    return col if col.isalpha() else "".join([ch for ch in ref if ch.isalpha()])
+
+
+def _row_array(cells: Dict[str, str]) -> List[str]:
+    """Lay out {column letters: text} as a list indexed from column A."""
+    if not cells:
+        return []
+    placed = [(_column_index(k), v) for k, v in cells.items()]
+    arr = [""] * max(i for i, _v in placed)
+    for i, v in placed:
+        arr[i - 1] = v
+    return arr
+
+
+def _resolve(val: str, cell_type: str, shared: List[str]) -> str:
+    if cell_type == "s":
+        try:
+            return shared[int(val)]
+        except Exception:
+            pass
+    return val
+
+
+DEFAULT_LIMITS = ParseLimits()
+
+
+class XlsxBackend(abc.ABC):
+    """Interface: read the shared-strings table and the rows of one worksheet."""
+
+    name = ""
+
+    @abc.abstractmethod
+    def shared_strings(self, z: zipfile.ZipFile, limits: ParseLimits = DEFAULT_LIMITS) -> List[str]:
+        """The shared-strings table, one string per `<si>` (`[]` when the workbook has none)."""
+
+    @abc.abstractmethod
+    def sheet_rows(
+        self,
+        z: zipfile.ZipFile,
+        sheet_path: str,
+        shared: List[str],
+        project: Optional[RowProjection] = None,
+        limits: ParseLimits = DEFAULT_LIMITS,
+    ) -> List[List[str]]:
+        """Rows of `sheetData`, each a list of cell text from column A (`[]` for empty rows)."""
+
+
+class EtreeBackend(XlsxBackend):
+    """`ET.iterparse` over the streamed member; keeps only the open `<si>` or `<row>` in memory."""
+
+    name = "etree"
+
+    def shared_strings(self, z: zipfile.ZipFile, limits: ParseLimits = DEFAULT_LIMITS) -> List[str]:
+        if SHARED_STRINGS_PATH not in z.namelist():
+            return []
+        out: List[str] = []
+        root = None
+        depth = 0
+        with open_member(z, SHARED_STRINGS_PATH, limits) as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if root is None:
+                        root = elem
+                    continue
+                if depth == 2 and elem.tag == _SI_TAG:
+                    ts = [t.text or "" for t in elem.findall(".//main:t", NS)]
+                    out.append("".join(ts))
+                    limits.check_shared_strings(len(out))
+                    root.clear()
+                depth -= 1
+        return out
+
+    def sheet_rows(
+        self,
+        z: zipfile.ZipFile,
+        sheet_path: str,
+        shared: List[str],
+        project: Optional[RowProjection] = None,
+        limits: ParseLimits = DEFAULT_LIMITS,
+    ) -> List[List[str]]:
+        rows: List[List[str]] = []
+        keep: Optional[Set[str]] = None
+        sheet_data = None
+        depth = data_depth = row_depth = 0  # depth of each open element, 0 when closed
+        row_cells = 0
+        with open_member(z, sheet_path, limits) as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if row_depth:
+                        if elem.tag == _C_TAG and depth == row_depth + 1:
+                            row_cells += 1
+                            limits.check_cells(row_cells, sheet_path)
+                    elif data_depth:
+                        if elem.tag == _ROW_TAG and depth == data_depth + 1:
+                            row_depth = depth
+                            row_cells = 0
+                    elif elem.tag == _SHEET_DATA_TAG:
+                        data_depth = depth
+                        sheet_data = elem
+                    continue
+                if depth == row_depth:
+                    arr = _row_array(self._row_cells(elem, keep, shared))
+                    rows.append(arr)
+                    limits.check_rows(len(rows), sheet_path)
+                    if project is not None and keep is None:
+                        keep = project(arr)
+                    sheet_data.clear()
+                    row_depth = 0
+                elif depth == data_depth:
+                    data_depth = 0
+                depth -= 1
+        return rows
+
+    @staticmethod
+    def _row_cells(row: ET.Element, keep: Optional[Set[str]], shared: List[str]) -> Dict[str, str]:
+        cells: Dict[str, str] = {}
+        for c in row.findall("main:c", NS):
+            r = c.get("r")
+            if not r:
+                continue
+            col = _column_letters(r)
+            if keep is not None and col not in keep:
+                continue
+            v = c.find("main:v", NS)
+            if v is None:
+                continue
+            cells[col] = _resolve(v.text or "", c.get("t"), shared)
+        return cells
+
+
+# Element tags as reported by ElementTree
+_SI_TAG = "{%s}si" % NS["main"]
+_SHEET_DATA_TAG = "{%s}sheetData" % NS["main"]
+_ROW_TAG = "{%s}row" % NS["main"]
+_C_TAG = "{%s}c" % NS["main"]
+
+
+# Expanded element names as reported by expat with namespace_separator=" "
+_MAIN = NS["main"] + " "
+_SI = _MAIN + "si"
+_T = _MAIN + "t"
+_SHEET_DATA = _MAIN + "sheetData"
+_ROW = _MAIN + "row"
+_C = _MAIN + "c"
+_V = _MAIN + "v"
+
+
+def _expat_parser():
+    parser = ParserCreate(namespace_separator=" ")
+    # Deliver each text node in one CharacterData call
+    parser.buffer_text = True
+    return parser
+
+
+class ExpatBackend(XlsxBackend):
+    """Mirrors `EtreeBackend` element for element, tracking nesting by depth."""
+
+    name = "expat"
+
+    def shared_strings(self, z: zipfile.ZipFile, limits: ParseLimits = DEFAULT_LIMITS) -> List[str]:
+        if SHARED_STRINGS_PATH not in z.namelist():
+            return []
+        max_strings = limits.max_shared_strings
+        out: List[str] = []
+        parts: List[str] = []
+        depth = 0
+        si_open = False
+        t_depth = 0  # depth of the open <t>, 0 when none
+
+        def start(name, _attrs):
+            nonlocal depth, si_open, t_depth
+            depth += 1
+            if depth == 2 and name == _SI:
+                si_open = True
+                parts.clear()
+            elif si_open and name == _T and not t_depth:
+                t_depth = depth
+
+        def end(name):
+            nonlocal depth, si_open, t_depth
+            if depth == t_depth:
+                t_depth = 0
+            elif depth == 2 and si_open:
+                out.append("".join(parts))
+                si_open = False
+                if max_strings and len(out) > max_strings:
+                    limits.check_shared_strings(len(out))
+            depth -= 1
+
+        def text(data):
+            if t_depth and depth == t_depth:
+                parts.append(data)
+
+        parser = _expat_parser()
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = text
+        with open_member(z, SHARED_STRINGS_PATH, limits) as f:
+            parser.ParseFile(f)
+        return out
+
+    def sheet_rows(
+        self,
+        z: zipfile.ZipFile,
+        sheet_path: str,
+        shared: List[str],
+        project: Optional[RowProjection] = None,
+        limits: ParseLimits = DEFAULT_LIMITS,
+    ) -> List[List[str]]:
+        rows: List[List[str]] = []
+        keep: Optional[Set[str]] = None
+        cells: Dict[str, str] = {}
+        col = ""
+        cell_type = None
+        value = None  # text parts of the cell's first <v>, None until one is seen
+        depth = 0
+        data_depth = row_depth = c_depth = v_depth = 0  # depth of each open element, 0 when closed
+        row_cells = 0  # <c> elements seen in the open row, projected away or not
+        max_rows = limits.max_rows
+        max_cells = limits.max_cells_per_row
+
+        def start(name, attrs):
+            nonlocal depth, data_depth, row_depth, c_depth, v_depth, col, cell_type, value, row_cells
+            depth += 1
+            if c_depth:
+                if name == _V and depth == c_depth + 1 and value is None:
+                    v_depth = depth
+                    value = []
+            elif row_depth:
+                if name == _C and depth == row_depth + 1:
+                    row_cells += 1
+                    if max_cells and row_cells > max_cells:
+                        limits.check_cells(row_cells, sheet_path)
+                    r = attrs.get("r")
+                    if r:
+                        col = _column_letters(r)
+                        if keep is None or col in keep:
+                            c_depth = depth
+                            cell_type = attrs.get("t")
+                            value = None
+            elif data_depth:
+                if name == _ROW and depth == data_depth + 1:
+                    row_depth = depth
+                    row_cells = 0
+                    cells.clear()
+            elif name == _SHEET_DATA:
+                data_depth = depth
+
+        def end(_name):
+            nonlocal depth, data_depth, row_depth, c_depth, v_depth, keep
+            if depth == v_depth:
+                v_depth = 0
+            elif depth == c_depth:
+                if value is not None:
+                    cells[col] = _resolve("".join(value), cell_type, shared)
+                c_depth = 0
+            elif depth == row_depth:
+                arr = _row_array(cells)
+                rows.append(arr)
+                if max_rows and len(rows) > max_rows:
+                    limits.check_rows(len(rows), sheet_path)
+                if project is not None and keep is None:
+                    keep = project(arr)
+                row_depth = 0
+            elif depth == data_depth:
+                data_depth = 0
+            depth -= 1
+
+        def text(data):
+            if v_depth and depth == v_depth:
+                value.append(data)
+
+        parser = _expat_parser()
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = text
+        with open_member(z, sheet_path, limits) as f:
+            parser.ParseFile(f)
+        return rows
+
+
+BACKENDS: Dict[str, XlsxBackend] = {b.name: b for b in (ExpatBackend(), EtreeBackend())}
+DEFAULT_BACKEND = "expat"
+
+
+def get_backend(name: str = DEFAULT_BACKEND) -> XlsxBackend:
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown XLSX backend {name!r} (choose from {', '.join(sorted(BACKENDS))})") from None
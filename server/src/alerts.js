@@ -0,0 +1,63 @@
+import fs from "node:fs/promises";
+import { spawn } from "node:child_process";
+import { pickPythonCommand } from "./parserPool.js";
+
+// Keep only the tail of checker output, as for the parser.
+const MAX_OUTPUT_CHARS = 8 * 1024;
+
+// Runs every published advisors document through the dealer's KPI alert state (check_alerts.py).
+//
+// Unlike snapshot renders, checks are never coalesced: each publish is checked once,
+// in publish order per dealer, against a copy of the document it published (`docPath`,
+// deleted afterwards), so every export counts in the rolling averages. Failures are
+// logged and counted; the chain carries on with the next publish.
+export function createAlertChecker(scriptPath, storageDir) {
+  const chains = new Map(); // dealer -> promise of the last queued check
+  const counters = { checked: 0, failed: 0, alerts: 0 };
+
+  function checkOnce(dealer, docPath) {
+    return new Promise((resolve) => {
+      const args = [scriptPath, docPath, "--storage", storageDir, "--dealer", dealer];
+      const child = spawn(pickPythonCommand(), args, { stdio: ["ignore", "pipe", "pipe"], env: process.env });
+      let stdout = "";
+      let stderr = "";
+      child.stdout.on("data", (d) => (stdout = (stdout + d.toString()).slice(-MAX_OUTPUT_CHARS)));
+      child.stderr.on("data", (d) => (stderr = (stderr + d.toString()).slice(-MAX_OUTPUT_CHARS)));
+      child.on("error", (err) => {
+        counters.failed += 1;
+        console.error(`Alert check for ${dealer} failed: ${err.message}`);
+        resolve(false);
+      });
+      child.on("close", (code) => {
+        if (code === 0) {
+          counters.checked += 1;
+          counters.alerts += Number(stdout.trim()) || 0;
+          resolve(true);
+          return;
+        }
+        counters.failed += 1;
+        console.error(`Alert check for ${dealer} failed (exit ${code}): ${stderr.trim()}`);
+        resolve(false);
+      });
+    });
+  }
+
+  // Resolves once this document (and every one queued before it for the dealer) is checked.
+  function check(dealer, docPath) {
+    const previous = chains.get(dealer) ?? Promise.resolve();
+    const next = previous
+      .then(() => checkOnce(dealer, docPath))
+      .finally(() => fs.rm(docPath, { force: true }).catch(() => {}));
+    chains.set(dealer, next);
+    next.finally(() => {
+      if (chains.get(dealer) === next) chains.delete(dealer);
+    });
+    return next;
+  }
+
+  function stats() {
+    return { ...counters, pending: chains.size };
+  }
+
+  return { check, stats };
+}
@@ -0,0 +1,84 @@
+import fs from "node:fs/promises";
+
+function envNumber(name, fallback) {
+  const raw = process.env[name];
+  if (raw === undefined || String(raw).trim() === "") return fallback;
+  const n = Number(raw);
+  return Number.isFinite(n) && n >= 0 ? n : fallback;
+}
+
+export function dealerCacheOptionsFromEnv() {
+  return {
+    maxDealers: Math.max(1, envNumber("DEALER_CACHE_SIZE", 8)),
+    maxBytes: envNumber("DEALER_CACHE_MB", 256) * 1024 * 1024,
+  };
+}
+
+// Parsed documents of the most recently requested dealers, keyed by dealer id.
+//
+// `get` stats the dealer's JSON and only reads it again when the mtime changed, so a
+// document republished on disk (by the watch daemon or Streamlit) is picked up. At
+// most `maxDealers` documents and about `maxBytes` of JSON (0 = no byte limit) are
+// held; the least recently used dealer is evicted first, but the dealer just loaded
+// always stays. Dealers nobody is looking at cost nothing.
+export function createDealerCache(options = {}) {
+  const { maxDealers, maxBytes } = { ...dealerCacheOptionsFromEnv(), ...options };
+
+  // Map iteration order is insertion order: the first entry is the least recently used.
+  const entries = new Map();
+  let bytes = 0;
+  const counters = { hits: 0, loads: 0, evictions: 0 };
+
+  function evict(keep) {
+    for (const [dealer, entry] of entries) {
+      if (entries.size <= maxDealers && (maxBytes <= 0 || bytes <= maxBytes)) break;
+      if (dealer === keep) continue;
+      entries.delete(dealer);
+      bytes -= entry.bytes;
+      counters.evictions += 1;
+    }
+  }
+
+  function set(dealer, doc, { mtimeMs, size }) {
+    const previous = entries.get(dealer);
+    if (previous) {
+      entries.delete(dealer);
+      bytes -= previous.bytes;
+    }
+    entries.set(dealer, { doc, mtimeMs, bytes: size });
+    bytes += size;
+    evict(dealer);
+    return doc;
+  }
+
+  async function get(dealer, jsonPath) {
+    let stat;
+    try {
+      stat = await fs.stat(jsonPath);
+    } catch (err) {
+      if (err?.code === "ENOENT") return null;
+      throw err;
+    }
+    const entry = entries.get(dealer);
+    if (entry && entry.mtimeMs === stat.mtimeMs) {
+      entries.delete(dealer);
+      entries.set(dealer, entry);
+      counters.hits += 1;
+      return entry.doc;
+    }
+    const doc = JSON.parse(await fs.readFile(jsonPath, "utf-8"));
+    counters.loads += 1;
+    return set(dealer, doc, stat);
+  }
+
+  function stats() {
+    return { dealers: entries.size, bytes, maxDealers, maxBytes, ...counters };
+  }
+
+  // The cached documents, least recently used first: { dealer, mtimeMs, bytes }.
+  function describe() {
+    return [...entries].map(([dealer, entry]) => ({ dealer, mtimeMs: entry.mtimeMs, bytes: entry.bytes }));
+  }
+
+  return { get, set, stats, describe };
+}
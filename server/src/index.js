@@ -1,35 +1,49 @@
 import path from "node:path";
+import crypto from "node:crypto";
 import fs from "node:fs/promises";
-import { existsSync } from "node:fs";
-import { spawn } from "node:child_process";
+import { createReadStream, existsSync } from "node:fs";
 import { fileURLToPath } from "node:url";
 import express from "express";
 import cors from "cors";
 import multer from "multer";
+import { createAlertChecker } from "./alerts.js";
+import { createDealerCache } from "./dealerCache.js";
+import { CONTENT_TYPE, SIZE_BUCKETS, createMetrics } from "./metrics.js";
+import { createParserPool } from "./parserPool.js";
+import { createSnapshotRenderer } from "./snapshots.js";
 
 const __dirname = path.dirname(fileURLToPath(import.meta.url));
 const projectRoot = path.resolve(__dirname, "..", "..");
 
-const STORAGE_DIR = path.resolve(projectRoot, "storage");
-const LATEST_XLSX_PATH = path.resolve(STORAGE_DIR, "latest.xlsx");
-const LATEST_JSON_PATH = path.resolve(STORAGE_DIR, "latest.json");
+// DASHBOARD_STORAGE_DIR is shared with the Streamlit app (and lets load tests use a scratch directory).
+const STORAGE_DIR = path.resolve(process.env.DASHBOARD_STORAGE_DIR || path.resolve(projectRoot, "storage"));
+// Each dealer's workbook and document live in storage/dealers/<dealer id>/.
+const DEALERS_DIR = path.resolve(STORAGE_DIR, "dealers");
+// Single-dealer installs kept their workbook here; it is only read to seed the first dealer.
+const LEGACY_XLSX_PATH = path.resolve(STORAGE_DIR, "latest.xlsx");
+// Uploads and parser output land here under unique names, then get renamed into place.
+const INCOMING_DIR = path.resolve(STORAGE_DIR, "incoming");
 
 const PORT = process.env.PORT ? Number(process.env.PORT) : 5179;
 const CLIENT_DIST = path.resolve(projectRoot, "client", "dist");
+const PARSER_SCRIPT = path.resolve(projectRoot, "server", "scripts", "parse_xlsx.py");
+const SNAPSHOT_SCRIPT = path.resolve(projectRoot, "render_snapshot.py");
+const ALERTS_SCRIPT = path.resolve(projectRoot, "check_alerts.py");
 
-await fs.mkdir(STORAGE_DIR, { recursive: true });
+await fs.mkdir(INCOMING_DIR, { recursive: true });
 
 const app = express();
 app.use(cors());
 app.use(express.json({ limit: "2mb" }));
+app.use(recordRequest);
 
 const upload = multer({
   storage: multer.diskStorage({
     destination: async (_req, _file, cb) => {
-      cb(null, STORAGE_DIR);
+      cb(null, INCOMING_DIR);
     },
     filename: async (_req, _file, cb) => {
-      cb(null, "latest.xlsx");
+      cb(null, uniqueName(".xlsx"));
     },
   }),
   limits: {
@@ -37,116 +51,374 @@ const upload = multer({
   },
 });
 
-let cached = null;
-let cachedMtimeMs = 0;
+// Concurrency, queue depth, timeout and memory cap come from PARSER_* env vars.
+const parserPool = createParserPool(PARSER_SCRIPT);
 
-function pickPythonCommand() {
-  if (process.env.PYTHON && String(process.env.PYTHON).trim()) return String(process.env.PYTHON).trim();
-  // Windows usually provides `python` (or `py`). macOS/Linux typically have `python3`.
-  return process.platform === "win32" ? "python" : "python3";
+// Documents of recently requested dealers; size comes from DEALER_CACHE_* env vars.
+const dealerDocs = createDealerCache();
+
+// Static TV pages (storage/dealers/<id>/snapshot.html), re-rendered after each publish.
+const snapshots = createSnapshotRenderer(SNAPSHOT_SCRIPT, STORAGE_DIR);
+
+// KPI alert state, updated once per published document (before its snapshot renders).
+const alertChecker = createAlertChecker(ALERTS_SCRIPT, STORAGE_DIR);
+
+// Served at GET /api/metrics in the Prometheus text format.
+const metrics = createMetrics();
+const parseDuration = metrics.histogram(
+  "dashboard_parse_duration_seconds",
+  "Parser phase durations as reported by parse_xlsx.py (sniff, decode, write, total).",
+  { labelNames: ["phase"] }
+);
+const requestDuration = metrics.histogram("dashboard_http_request_duration_seconds", "HTTP request latency.", {
+  labelNames: ["method", "route", "status"],
+});
+const responseSize = metrics.histogram("dashboard_http_response_size_bytes", "HTTP response body size.", {
+  labelNames: ["route"],
+  buckets: SIZE_BUCKETS,
+});
+const uploadSize = metrics.histogram("dashboard_upload_size_bytes", "Size of uploaded workbooks.", {
+  buckets: SIZE_BUCKETS,
+});
+const uploads = metrics.counter(
+  "dashboard_uploads_total",
+  "Uploads by result: published, missing_file, or the error that refused them.",
+  ["result"]
+);
+const parserJobs = metrics.counter("dashboard_parser_jobs_total", "Parser pool jobs by outcome.", ["outcome"]);
+const parserActive = metrics.gauge("dashboard_parser_active", "Parser processes running.");
+const parserQueued = metrics.gauge("dashboard_parser_queue_depth", "Parse jobs waiting for a free parser.");
+const parserQueueLimit = metrics.gauge("dashboard_parser_queue_limit", "Most parse jobs allowed to wait (PARSER_MAX_QUEUE).");
+const cacheRequests = metrics.counter(
+  "dashboard_document_cache_requests_total",
+  "Dealer document lookups: hit (served from memory) or miss (read from disk).",
+  ["result"]
+);
+const cacheEvictions = metrics.counter("dashboard_document_cache_evictions_total", "Dealer documents evicted from memory.");
+const cacheDealers = metrics.gauge("dashboard_document_cache_dealers", "Dealer documents held in memory.");
+const cacheBytes = metrics.gauge("dashboard_document_cache_bytes", "JSON bytes of the dealer documents held in memory.");
+const documentVersion = metrics.gauge(
+  "dashboard_document_version_seconds",
+  "Publish time (mtime) of each dealer's document; changes on every publish.",
+  ["dealer"]
+);
+const documentSize = metrics.gauge("dashboard_document_size_bytes", "Size of each dealer's published document.", ["dealer"]);
+const openConnections = metrics.gauge("dashboard_http_connections_active", "Open client connections.");
+
+// Per dealer: content hash of the published workbook and the upload sequence it came from.
+const published = new Map();
+let uploadSeq = 0;
+
+// Ids as parse_xlsx.py stamps them on `doc.dealer.id`; anything else never names a directory.
+const DEALER_ID_RE = /^[a-z0-9_-]+$/;
+// Dealer of an export that names none.
+const FALLBACK_DEALER = "default";
+
+// The reporting period parse_xlsx.py stamps on `doc.period.id` (1d, mtd, qtd, ...).
+function parsePeriod(raw) {
+  const id = String(raw ?? "").trim().toLowerCase();
+  return DEALER_ID_RE.test(id) ? id : null;
 }
 
-function spawnParser(pythonCmd, scriptPath, xlsxPath, outJsonPath) {
-  return spawn(pythonCmd, [scriptPath, xlsxPath, outJsonPath], {
-    stdio: ["ignore", "pipe", "pipe"],
-    env: process.env,
-  });
+// Each period's latest document is also kept in storage/dealers/<id>/periods/<period>/,
+// where the Streamlit dashboard offers it in its period switcher.
+function periodJsonPath(dealer, period) {
+  return path.resolve(DEALERS_DIR, dealer, "periods", period, "latest.json");
 }
 
-function runParser(xlsxPath, outJsonPath) {
-  const scriptPath = path.resolve(projectRoot, "server", "scripts", "parse_xlsx.py");
+function dealerPaths(dealer) {
+  const dir = path.resolve(DEALERS_DIR, dealer);
+  return {
+    dir,
+    json: path.resolve(dir, "latest.json"),
+    xlsx: path.resolve(dir, "latest.xlsx"),
+    snapshot: path.resolve(dir, "snapshot.html"),
+  };
+}
 
-  return new Promise((resolve, reject) => {
-    const primaryCmd = pickPythonCommand();
-    let attemptedFallback = false;
-
-    function attach(child) {
-      let stdout = "";
-      let stderr = "";
-      child.stdout.on("data", (d) => (stdout += d.toString()));
-      child.stderr.on("data", (d) => (stderr += d.toString()));
-
-      child.on("error", (err) => {
-        // If the command isn't found, try a reasonable fallback once.
-        if (!attemptedFallback && err && err.code === "ENOENT" && primaryCmd !== "python") {
-          attemptedFallback = true;
-          const fallback = "python";
-          attach(spawnParser(fallback, scriptPath, xlsxPath, outJsonPath));
-          return;
-        }
-        reject(err);
-      });
-
-      child.on("close", (code) => {
-        if (code === 0) return resolve({ stdout });
-        reject(new Error(`parse_xlsx.py failed (code ${code}). ${stderr || stdout}`));
-      });
-    }
+function parseDealer(raw) {
+  const id = String(raw ?? "").trim().toLowerCase();
+  return DEALER_ID_RE.test(id) ? id : null;
+}
+
+async function listDealers() {
+  const entries = await fs.readdir(DEALERS_DIR, { withFileTypes: true }).catch(() => []);
+  const dealers = [];
+  for (const e of entries) {
+    if (!e.isDirectory() || parseDealer(e.name) !== e.name) continue;
+    const stat = await fs.stat(dealerPaths(e.name).json).catch(() => null);
+    if (stat) dealers.push({ id: e.name, updatedAt: stat.mtime.toISOString(), mtimeMs: stat.mtimeMs, bytes: stat.size });
+  }
+  return dealers;
+}
+
+// The dealer served by the un-prefixed routes: DEFAULT_DEALER, else the most recently published one.
+async function defaultDealer() {
+  const configured = parseDealer(process.env.DEFAULT_DEALER);
+  if (configured) return configured;
+  const dealers = await listDealers();
+  dealers.sort((a, b) => b.mtimeMs - a.mtimeMs);
+  return dealers[0]?.id ?? null;
+}
 
-    attach(spawnParser(primaryCmd, scriptPath, xlsxPath, outJsonPath));
+function loadDealerDoc(dealer) {
+  return dealerDocs.get(dealer, dealerPaths(dealer).json);
+}
+
+// Parse jobs keyed by content hash; concurrent callers for the same bytes share one promise.
+const inflightParses = new Map();
+let publishChain = Promise.resolve();
+
+function uniqueName(ext) {
+  return `${Date.now()}-${process.pid}-${crypto.randomBytes(6).toString("hex")}${ext}`;
+}
+
+function hashFile(filePath) {
+  return new Promise((resolve, reject) => {
+    const h = crypto.createHash("sha256");
+    createReadStream(filePath)
+      .on("error", reject)
+      .on("data", (d) => h.update(d))
+      .on("end", () => resolve(h.digest("hex")));
   });
 }
 
-async function loadLatestJsonIfFresh() {
-  if (!existsSync(LATEST_JSON_PATH)) return null;
-  const stat = await fs.stat(LATEST_JSON_PATH);
-  if (stat.mtimeMs <= cachedMtimeMs && cached) return cached;
-  const raw = await fs.readFile(LATEST_JSON_PATH, "utf-8");
-  cached = JSON.parse(raw);
-  cachedMtimeMs = stat.mtimeMs;
-  return cached;
+// The dashboard shows an Employee Rank export; anything else is refused after a quick
+// sniff of the first rows, before the parser decodes the whole workbook.
+const EXPECTED_KINDS = "advisor_rank,technician_rank";
+
+async function runParser(xlsxPath, outJsonPath) {
+  const result = await parserPool.run(xlsxPath, outJsonPath, ["--expect", EXPECTED_KINDS]);
+  for (const [phase, seconds] of Object.entries(result.timings ?? {})) parseDuration.observe({ phase }, seconds);
+  return result;
+}
+
+function serializePublish(fn) {
+  const next = publishChain.then(fn, fn);
+  publishChain = next.catch(() => {});
+  return next;
+}
+
+// Parse `xlsxPath` into a private temp file, then rename workbook + JSON into the
+// directory of the dealer the export names. A job only publishes if no newer upload
+// for that dealer has published first; `job.seq` is bumped when a later upload of the
+// same bytes coalesces onto it. Resolves to { dealer, doc }.
+async function parseAndPublish(xlsxPath, hash, job, { keepSource = false } = {}) {
+  for (const [dealer, state] of published) {
+    if (state.hash === hash) return { dealer, doc: await loadDealerDoc(dealer) };
+  }
+
+  const tmpJsonPath = path.resolve(INCOMING_DIR, uniqueName(".json"));
+  try {
+    await runParser(xlsxPath, tmpJsonPath);
+    const doc = JSON.parse(await fs.readFile(tmpJsonPath, "utf-8"));
+    const dealer = parseDealer(doc?.dealer?.id) ?? FALLBACK_DEALER;
+    const target = dealerPaths(dealer);
+    await serializePublish(async () => {
+      if (job.seq < (published.get(dealer)?.seq ?? -1)) return;
+      await fs.mkdir(target.dir, { recursive: true });
+      if (keepSource) {
+        const tmpXlsxPath = path.resolve(INCOMING_DIR, uniqueName(".xlsx"));
+        await fs.copyFile(xlsxPath, tmpXlsxPath);
+        await fs.rename(tmpXlsxPath, target.xlsx);
+      } else if (xlsxPath !== target.xlsx) {
+        await fs.rename(xlsxPath, target.xlsx);
+      }
+      const period = parsePeriod(doc?.period?.id);
+      if (period) {
+        const periodJson = periodJsonPath(dealer, period);
+        const tmpPeriodJson = path.resolve(INCOMING_DIR, uniqueName(".json"));
+        await fs.mkdir(path.dirname(periodJson), { recursive: true });
+        await fs.copyFile(tmpJsonPath, tmpPeriodJson);
+        await fs.rename(tmpPeriodJson, periodJson);
+      }
+      // The alert check reads its own copy: target.json may be replaced before it runs
+      const alertDocPath = path.resolve(INCOMING_DIR, uniqueName(".json"));
+      await fs.copyFile(tmpJsonPath, alertDocPath);
+      await fs.rename(tmpJsonPath, target.json);
+      published.set(dealer, { hash, seq: job.seq });
+      dealerDocs.set(dealer, doc, await fs.stat(target.json));
+      alertChecker.check(dealer, alertDocPath).then(() => snapshots.render(dealer));
+    });
+    return { dealer, doc: await loadDealerDoc(dealer) };
+  } finally {
+    await fs.rm(tmpJsonPath, { force: true });
+  }
+}
+
+function parseOnce(xlsxPath, seq, options) {
+  return hashFile(xlsxPath).then((hash) => {
+    const existing = inflightParses.get(hash);
+    if (existing) {
+      existing.seq = Math.max(existing.seq, seq);
+      return existing.promise;
+    }
+    const job = { seq, promise: null };
+    job.promise = parseAndPublish(xlsxPath, hash, job, options).finally(() => inflightParses.delete(hash));
+    inflightParses.set(hash, job);
+    return job.promise;
+  });
 }
 
-async function ensureLatestXlsx() {
-  if (existsSync(LATEST_XLSX_PATH)) return true;
+async function findBootXlsx() {
+  if (existsSync(LEGACY_XLSX_PATH)) return { xlsxPath: LEGACY_XLSX_PATH, keepSource: true };
   const entries = await fs.readdir(projectRoot);
   const candidate = entries.find((f) => f.toLowerCase().endsWith(".xlsx"));
-  if (!candidate) return false;
-  await fs.copyFile(path.resolve(projectRoot, candidate), LATEST_XLSX_PATH);
-  return true;
+  if (!candidate) return null;
+  return { xlsxPath: path.resolve(projectRoot, candidate), keepSource: true };
 }
 
-async function ensureLatestJson() {
-  if (existsSync(LATEST_JSON_PATH)) return loadLatestJsonIfFresh();
-  if (!existsSync(LATEST_XLSX_PATH)) {
-    const ok = await ensureLatestXlsx();
-    if (!ok) return null;
-  }
+// Until some dealer has a document, the first request parses the legacy or bundled workbook.
+let bootParse = null;
+async function ensureDealerDoc(dealer) {
+  if (dealer) return loadDealerDoc(dealer);
+  const fallback = await defaultDealer();
+  if (fallback) return loadDealerDoc(fallback);
+  const boot = await findBootXlsx();
+  if (!boot) return null;
+  // Sequence 0 so that any upload arriving meanwhile wins over the boot parse.
+  bootParse ??= parseOnce(boot.xlsxPath, 0, { keepSource: boot.keepSource }).finally(() => (bootParse = null));
+  return (await bootParse).doc;
+}
+
+// Route pattern for request metrics; one of a multi-path route is picked by whether it took a parameter.
+function routeLabel(req) {
+  const pattern = req.route?.path;
+  if (pattern === undefined) return req.path.startsWith("/api/") ? "unmatched" : "static";
+  if (!Array.isArray(pattern)) return String(pattern);
+  const hasParams = Object.keys(req.params ?? {}).length > 0;
+  return pattern.find((p) => p.includes(":") === hasParams) ?? pattern[0];
+}
+
+function recordRequest(req, res, next) {
+  const started = process.hrtime.bigint();
+  res.on("finish", () => {
+    const route = routeLabel(req);
+    requestDuration.observe(
+      { method: req.method, route, status: res.statusCode },
+      Number(process.hrtime.bigint() - started) / 1e9
+    );
+    const size = Number(res.getHeader("content-length"));
+    if (Number.isFinite(size)) responseSize.observe({ route }, size);
+  });
+  next();
+}
+
+function sendError(res, e) {
+  res.status(e?.status ?? 500).json({ error: e?.message ?? "Unknown error" });
+}
 
-  await runParser(LATEST_XLSX_PATH, LATEST_JSON_PATH);
-  return loadLatestJsonIfFresh();
+// Dealer named in the route, or the default dealer for the un-prefixed routes.
+function routeDealer(req, res) {
+  if (req.params.dealer === undefined) return undefined;
+  const dealer = parseDealer(req.params.dealer);
+  if (!dealer) res.status(400).json({ error: `Not a dealer id: ${req.params.dealer}` });
+  return dealer;
 }
 
-app.get("/api/health", (_req, res) => res.json({ ok: true }));
+app.get("/api/health", (_req, res) =>
+  res.json({
+    ok: true,
+    parser: parserPool.stats(),
+    dealerCache: dealerDocs.stats(),
+    snapshots: snapshots.stats(),
+    alerts: alertChecker.stats(),
+  })
+);
 
-app.get("/api/meta", async (_req, res) => {
+app.get("/api/metrics", async (_req, res) => {
   try {
-    const doc = await ensureLatestJson();
+    res.type(CONTENT_TYPE).send(await metrics.render());
+  } catch (e) {
+    sendError(res, e);
+  }
+});
+
+app.get("/api/dealers", async (_req, res) => {
+  try {
+    const dealers = await listDealers();
+    res.json({ default: await defaultDealer(), dealers: dealers.map(({ id, updatedAt }) => ({ id, updatedAt })) });
+  } catch (e) {
+    sendError(res, e);
+  }
+});
+
+app.get(["/api/meta", "/api/dealers/:dealer/meta"], async (req, res) => {
+  try {
+    const dealer = routeDealer(req, res);
+    if (dealer === null) return;
+    const doc = await ensureDealerDoc(dealer);
     if (!doc) return res.status(404).json({ error: "No data yet. Upload an .xlsx first." });
     res.json(doc.meta ?? {});
   } catch (e) {
-    res.status(500).json({ error: e?.message ?? "Unknown error" });
+    sendError(res, e);
   }
 });
 
-app.get("/api/data", async (_req, res) => {
+// Always kept by `?columns=`, as by the parser's --columns: rows are keyed by employee and ordered by rank.
+const REQUIRED_COLUMNS = ["employee", "rank"];
+
+function columnKey(name) {
+  return String(name).trim().replace(/\s+/g, " ").toLowerCase();
+}
+
+// A copy of `doc` with only the named columns (comma-separated, matched case-insensitively).
+// The stored document and the dealer cache are left whole.
+function projectDocument(doc, columns) {
+  const keys = new Set([...String(columns).split(",").map(columnKey).filter(Boolean), ...REQUIRED_COLUMNS]);
+  const dataset = doc.dataset ?? {};
+  const kept = (dataset.columns ?? []).filter((c) => keys.has(columnKey(c)));
+  const fieldTypes = Object.fromEntries(kept.map((c) => [c, doc.fieldTypes?.[c] ?? "string"]));
+  const rows = (dataset.rows ?? []).map((row) => Object.fromEntries(kept.map((c) => [c, row[c]])));
+  return { ...doc, dataset: { ...dataset, columns: kept, rows }, fieldTypes };
+}
+
+// `?columns=Employee,Rank,...` (TV mode) trims the response to those columns.
+app.get(["/api/data", "/api/dealers/:dealer/data"], async (req, res) => {
   try {
-    const doc = await ensureLatestJson();
+    const dealer = routeDealer(req, res);
+    if (dealer === null) return;
+    const doc = await ensureDealerDoc(dealer);
     if (!doc) return res.status(404).json({ error: "No data yet. Upload an .xlsx first." });
-    res.json(doc);
+    const columns = typeof req.query.columns === "string" ? req.query.columns.trim() : "";
+    res.json(columns ? projectDocument(doc, columns) : doc);
   } catch (e) {
-    res.status(500).json({ error: e?.message ?? "Unknown error" });
+    sendError(res, e);
   }
 });
 
 app.post("/api/upload", upload.single("file"), async (req, res) => {
   try {
-    if (!req.file) return res.status(400).json({ error: "Missing file field 'file'." });
-    await runParser(LATEST_XLSX_PATH, LATEST_JSON_PATH);
-    const doc = await loadLatestJsonIfFresh();
-    res.json({ ok: true, meta: doc?.meta ?? {} });
+    if (!req.file) {
+      uploads.inc({ result: "missing_file" });
+      return res.status(400).json({ error: "Missing file field 'file'." });
+    }
+    uploadSize.observe({}, req.file.size);
+    const { dealer, doc } = await parseOnce(req.file.path, ++uploadSeq);
+    uploads.inc({ result: "published" });
+    res.json({ ok: true, dealer, meta: doc?.meta ?? {} });
+  } catch (e) {
+    uploads.inc({ result: e?.name ?? "Error" });
+    sendError(res, e);
+  } finally {
+    // Coalesced or superseded uploads never get renamed into place; drop their temp file.
+    if (req.file) await fs.rm(req.file.path, { force: true }).catch(() => {});
+  }
+});
+
+// Kiosk TVs: the pre-rendered dashboard page, a static file per dealer. A dealer
+// published before snapshots existed gets one rendered on the first request.
+app.get(["/tv", "/tv/:dealer"], async (req, res) => {
+  try {
+    const dealer = req.params.dealer === undefined ? await defaultDealer() : parseDealer(req.params.dealer);
+    if (!dealer) return res.status(404).type("text").send("No dashboard for this dealer.");
+    const { json, snapshot } = dealerPaths(dealer);
+    if (!existsSync(snapshot) && existsSync(json)) await snapshots.render(dealer);
+    if (!existsSync(snapshot)) return res.status(404).type("text").send("No dashboard for this dealer yet.");
+    res.set("Cache-Control", "no-cache");
+    res.sendFile(snapshot);
   } catch (e) {
-    res.status(500).json({ error: e?.message ?? "Unknown error" });
+    sendError(res, e);
   }
 });
 
@@ -159,10 +431,39 @@ if (existsSync(CLIENT_DIST)) {
 }
 
 // Try to parse any existing XLSX on boot (non-fatal)
-ensureLatestJson().catch(() => {});
+ensureDealerDoc().catch(() => {});
 
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
   console.log(`Server listening on http://localhost:${PORT}`);
 });
 
+// Values owned by the parser pool, the dealer cache and the HTTP server, read on each scrape.
+metrics.onCollect(async () => {
+  const pool = parserPool.stats();
+  parserActive.set({}, pool.active);
+  parserQueued.set({}, pool.queued);
+  parserQueueLimit.set({}, pool.maxQueue);
+  parserJobs.set({ outcome: "completed" }, pool.completed);
+  parserJobs.set({ outcome: "failed" }, pool.failed);
+  parserJobs.set({ outcome: "timed_out" }, pool.timedOut);
+  parserJobs.set({ outcome: "queue_full" }, pool.rejected);
+
+  const cache = dealerDocs.stats();
+  cacheRequests.set({ result: "hit" }, cache.hits);
+  cacheRequests.set({ result: "miss" }, cache.loads);
+  cacheEvictions.set({}, cache.evictions);
+  cacheDealers.set({}, cache.dealers);
+  cacheBytes.set({}, cache.bytes);
+
+  // Dealers removed from disk drop out of the scrape
+  documentVersion.reset();
+  documentSize.reset();
+  for (const { id, mtimeMs, bytes } of await listDealers()) {
+    documentVersion.set({ dealer: id }, mtimeMs / 1000);
+    documentSize.set({ dealer: id }, bytes);
+  }
+
+  openConnections.set({}, await new Promise((resolve) => server.getConnections((err, n) => resolve(err ? 0 : n))));
+});
+
 
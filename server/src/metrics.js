@@ -0,0 +1,117 @@
+// A small in-process metrics registry rendered in the Prometheus text exposition format
+// (version 0.0.4), so a local collector can scrape GET /api/metrics without extra packages.
+//
+// Counters and histograms are updated as things happen. Values owned by another module
+// (parser pool, dealer cache, open connections) are read on each scrape by the
+// callbacks passed to `onCollect`, which set gauges or mirror totals into counters.
+
+export const CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8";
+
+// Seconds; parses of a real export take tens of milliseconds, pathological ones up to the timeout.
+export const DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60];
+// Bytes; a dealer's document is tens of KB, an upload at most the 25 MB multer limit.
+export const SIZE_BUCKETS = [1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864];
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, "\\\\").replace(/\n/g, "\\n").replace(/"/g, '\\"');
+}
+
+function formatValue(n) {
+  if (n === Infinity) return "+Inf";
+  if (n === -Infinity) return "-Inf";
+  return Number.isNaN(n) ? "NaN" : String(n);
+}
+
+function labelKey(labelNames, labels = {}) {
+  return JSON.stringify(labelNames.map((name) => String(labels[name] ?? "")));
+}
+
+function formatLabels(labelNames, values, extra = "") {
+  const parts = labelNames.map((name, i) => `${name}="${escapeLabel(values[i])}"`);
+  if (extra) parts.push(extra);
+  return parts.length ? `{${parts.join(",")}}` : "";
+}
+
+function scalarMetric(type, name, help, labelNames) {
+  const series = new Map();
+  return {
+    name,
+    inc(labels, by = 1) {
+      const key = labelKey(labelNames, labels);
+      series.set(key, (series.get(key) ?? 0) + by);
+    },
+    set(labels, value) {
+      series.set(labelKey(labelNames, labels), value);
+    },
+    reset() {
+      series.clear();
+    },
+    render() {
+      const lines = [`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`];
+      for (const [key, value] of series) {
+        lines.push(`${name}${formatLabels(labelNames, JSON.parse(key))} ${formatValue(value)}`);
+      }
+      return lines;
+    },
+  };
+}
+
+function histogramMetric(name, help, labelNames, buckets) {
+  const bounds = [...buckets].sort((a, b) => a - b);
+  const series = new Map();
+  return {
+    name,
+    observe(labels, value) {
+      const key = labelKey(labelNames, labels);
+      let s = series.get(key);
+      if (!s) {
+        s = { counts: new Array(bounds.length).fill(0), sum: 0, count: 0 };
+        series.set(key, s);
+      }
+      const i = bounds.findIndex((b) => value <= b);
+      if (i >= 0) s.counts[i] += 1;
+      s.sum += value;
+      s.count += 1;
+    },
+    render() {
+      const lines = [`# HELP ${name} ${help}`, `# TYPE ${name} histogram`];
+      for (const [key, s] of series) {
+        const values = JSON.parse(key);
+        let cumulative = 0;
+        bounds.forEach((b, i) => {
+          cumulative += s.counts[i];
+          lines.push(`${name}_bucket${formatLabels(labelNames, values, `le="${formatValue(b)}"`)} ${cumulative}`);
+        });
+        lines.push(`${name}_bucket${formatLabels(labelNames, values, 'le="+Inf"')} ${s.count}`);
+        lines.push(`${name}_sum${formatLabels(labelNames, values)} ${formatValue(s.sum)}`);
+        lines.push(`${name}_count${formatLabels(labelNames, values)} ${s.count}`);
+      }
+      return lines;
+    },
+  };
+}
+
+export function createMetrics() {
+  const metrics = [];
+  const collectors = [];
+
+  function register(metric) {
+    if (metrics.some((m) => m.name === metric.name)) throw new Error(`Metric ${metric.name} is already registered.`);
+    metrics.push(metric);
+    return metric;
+  }
+
+  return {
+    counter: (name, help, labelNames = []) => register(scalarMetric("counter", name, help, labelNames)),
+    gauge: (name, help, labelNames = []) => register(scalarMetric("gauge", name, help, labelNames)),
+    histogram: (name, help, { labelNames = [], buckets = DURATION_BUCKETS } = {}) =>
+      register(histogramMetric(name, help, labelNames, buckets)),
+    onCollect(fn) {
+      collectors.push(fn);
+    },
+    async render() {
+      for (const fn of collectors) await fn();
+      return metrics.flatMap((m) => m.render()).join("\n") + "\n";
+    },
+  };
+}
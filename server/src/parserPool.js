@@ -0,0 +1,199 @@
+import { spawn } from "node:child_process";
+
+// Keep only the tail of parser output; a chatty or broken parser must not grow the heap.
+const MAX_OUTPUT_CHARS = 64 * 1024;
+
+function envNumber(name, fallback) {
+  const raw = process.env[name];
+  if (raw === undefined || String(raw).trim() === "") return fallback;
+  const n = Number(raw);
+  return Number.isFinite(n) && n >= 0 ? n : fallback;
+}
+
+export function pickPythonCommand() {
+  if (process.env.PYTHON && String(process.env.PYTHON).trim()) return String(process.env.PYTHON).trim();
+  // Windows usually provides `python` (or `py`). macOS/Linux typically have `python3`.
+  return process.platform === "win32" ? "python" : "python3";
+}
+
+// With `--timings` the parser's last stdout line is {"timings": {phase: seconds}}.
+function parseTimings(stdout) {
+  const last = stdout.trim().split("\n").pop();
+  try {
+    return JSON.parse(last)?.timings ?? null;
+  } catch {
+    return null;
+  }
+}
+
+function appendTail(buf, chunk) {
+  const next = buf + chunk.toString();
+  return next.length > MAX_OUTPUT_CHARS ? next.slice(next.length - MAX_OUTPUT_CHARS) : next;
+}
+
+export class ParserQueueFullError extends Error {
+  constructor(message) {
+    super(message);
+    this.name = "ParserQueueFullError";
+    this.status = 503;
+  }
+}
+
+// parse_xlsx.py exits with these statuses when `--expect` rejects the workbook kind
+// and when the workbook exceeds one of its XLSX_MAX_* limits.
+const EXIT_WRONG_KIND = 3;
+const EXIT_LIMIT = 4;
+
+export class ParserRejectedError extends Error {
+  constructor(message) {
+    super(message);
+    this.name = "ParserRejectedError";
+    this.status = 422;
+  }
+}
+
+export class ParserLimitError extends Error {
+  constructor(message) {
+    super(message);
+    this.name = "ParserLimitError";
+    this.status = 413;
+  }
+}
+
+export function parserPoolOptionsFromEnv() {
+  return {
+    maxConcurrent: Math.max(1, envNumber("PARSER_MAX_CONCURRENT", 2)),
+    maxQueue: envNumber("PARSER_MAX_QUEUE", 8),
+    timeoutMs: envNumber("PARSER_TIMEOUT_MS", 60_000),
+    maxMemoryMb: envNumber("PARSER_MAX_MEMORY_MB", 1024),
+  };
+}
+
+// A bounded pool of `parse_xlsx.py` processes.
+//
+// At most `maxConcurrent` parsers run at once; up to `maxQueue` more jobs wait in FIFO
+// order and anything beyond that is rejected with a ParserQueueFullError (HTTP 503).
+// Each job is killed after `timeoutMs`, and `maxMemoryMb` is passed to the parser,
+// which caps its own address space. A job rejected by the parser's `--expect` sniff
+// fails with a ParserRejectedError (HTTP 422), and one that inflates past the parser's
+// XLSX_MAX_* limits (inherited through the environment) with a ParserLimitError
+// (HTTP 413). Jobs resolve to { stdout, timings }, where `timings` are the parser's
+// own phase durations in seconds.
+export function createParserPool(scriptPath, options = {}) {
+  const { maxConcurrent, maxQueue, timeoutMs, maxMemoryMb } = { ...parserPoolOptionsFromEnv(), ...options };
+
+  const waiting = [];
+  let active = 0;
+  const counters = { started: 0, completed: 0, failed: 0, timedOut: 0, rejected: 0 };
+
+  function spawnParser(pythonCmd, args) {
+    return spawn(pythonCmd, [scriptPath, ...args], {
+      stdio: ["ignore", "pipe", "pipe"],
+      env: process.env,
+    });
+  }
+
+  function execute(args) {
+    return new Promise((resolve, reject) => {
+      const primaryCmd = pickPythonCommand();
+      let attemptedFallback = false;
+      let settled = false;
+      let current = null;
+
+      const timer =
+        timeoutMs > 0
+          ? setTimeout(() => {
+              counters.timedOut += 1;
+              current?.kill("SIGKILL");
+              finish(new Error(`parse_xlsx.py timed out after ${timeoutMs} ms.`));
+            }, timeoutMs)
+          : null;
+
+      function finish(err, value) {
+        if (settled) return;
+        settled = true;
+        if (timer) clearTimeout(timer);
+        if (err) reject(err);
+        else resolve(value);
+      }
+
+      function attach(child) {
+        current = child;
+        let stdout = "";
+        let stderr = "";
+        child.stdout.on("data", (d) => (stdout = appendTail(stdout, d)));
+        child.stderr.on("data", (d) => (stderr = appendTail(stderr, d)));
+
+        child.on("error", (err) => {
+          // If the command isn't found, try a reasonable fallback once.
+          if (!attemptedFallback && err && err.code === "ENOENT" && primaryCmd !== "python") {
+            attemptedFallback = true;
+            attach(spawnParser("python", args));
+            return;
+          }
+          finish(err);
+        });
+
+        child.on("close", (code, signal) => {
+          if (code === 0) return finish(null, { stdout, timings: parseTimings(stdout) });
+          if (code === EXIT_WRONG_KIND) return finish(new ParserRejectedError(stderr.trim() || "Wrong kind of XLSX file."));
+          if (code === EXIT_LIMIT) return finish(new ParserLimitError(stderr.trim() || "Workbook too large."));
+          const how = signal ? `signal ${signal}` : `code ${code}`;
+          finish(new Error(`parse_xlsx.py failed (${how}). ${stderr || stdout}`));
+        });
+      }
+
+      attach(spawnParser(primaryCmd, args));
+    });
+  }
+
+  function pump() {
+    while (active < maxConcurrent && waiting.length) {
+      const job = waiting.shift();
+      active += 1;
+      counters.started += 1;
+      execute(job.args)
+        .then(
+          (value) => {
+            counters.completed += 1;
+            job.resolve(value);
+          },
+          (err) => {
+            counters.failed += 1;
+            job.reject(err);
+          }
+        )
+        .finally(() => {
+          active -= 1;
+          pump();
+        });
+    }
+  }
+
+  function run(xlsxPath, outJsonPath, extraArgs = []) {
+    if (active >= maxConcurrent && waiting.length >= maxQueue) {
+      counters.rejected += 1;
+      return Promise.reject(new ParserQueueFullError("Parser queue is full. Try again shortly."));
+    }
+    const args = [xlsxPath, outJsonPath, ...extraArgs, "--timings"];
+    if (maxMemoryMb > 0) args.push("--max-memory-mb", String(maxMemoryMb));
+    return new Promise((resolve, reject) => {
+      waiting.push({ args, resolve, reject });
+      pump();
+    });
+  }
+
+  function stats() {
+    return {
+      active,
+      queued: waiting.length,
+      maxConcurrent,
+      maxQueue,
+      timeoutMs,
+      maxMemoryMb,
+      ...counters,
+    };
+  }
+
+  return { run, stats };
+}
@@ -0,0 +1,68 @@
+import { spawn } from "node:child_process";
+import { pickPythonCommand } from "./parserPool.js";
+
+// Keep only the tail of renderer output, as for the parser.
+const MAX_OUTPUT_CHARS = 8 * 1024;
+
+// Re-renders a dealer's static TV snapshot (render_snapshot.py) after its document changes.
+//
+// At most one render per dealer runs at a time. A request that arrives during a
+// render schedules exactly one more once it ends, so a burst of uploads costs two
+// renders and the last one always sees the newest document. Failures are logged and
+// counted; the previous snapshot stays in place.
+export function createSnapshotRenderer(scriptPath, storageDir) {
+  const running = new Map(); // dealer -> { again: boolean, promise }
+  const counters = { rendered: 0, failed: 0 };
+
+  function renderOnce(dealer) {
+    return new Promise((resolve) => {
+      const args = [scriptPath, "--storage", storageDir, "--dealer", dealer];
+      const child = spawn(pickPythonCommand(), args, { stdio: ["ignore", "ignore", "pipe"], env: process.env });
+      let stderr = "";
+      child.stderr.on("data", (d) => {
+        stderr = (stderr + d.toString()).slice(-MAX_OUTPUT_CHARS);
+      });
+      child.on("error", (err) => {
+        counters.failed += 1;
+        console.error(`Snapshot for ${dealer} failed: ${err.message}`);
+        resolve(false);
+      });
+      child.on("close", (code) => {
+        if (code === 0) {
+          counters.rendered += 1;
+          resolve(true);
+          return;
+        }
+        counters.failed += 1;
+        console.error(`Snapshot for ${dealer} failed (exit ${code}): ${stderr.trim()}`);
+        resolve(false);
+      });
+    });
+  }
+
+  function render(dealer) {
+    const current = running.get(dealer);
+    if (current) {
+      current.again = true;
+      return current.promise;
+    }
+    const state = { again: false, promise: null };
+    state.promise = (async () => {
+      let ok;
+      do {
+        state.again = false;
+        ok = await renderOnce(dealer);
+      } while (state.again);
+      running.delete(dealer);
+      return ok;
+    })();
+    running.set(dealer, state);
+    return state.promise;
+  }
+
+  function stats() {
+    return { ...counters, running: running.size };
+  }
+
+  return { render, stats };
+}
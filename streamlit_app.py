@@ -6,16 +6,46 @@ A full-screen dashboard for daily Tekion Service Employee Rank Excel exports.
 """
 
 import streamlit as st
-import json
-import re
-import zipfile
-import xml.etree.ElementTree as ET
-import tempfile
 import os
+import sys
+import time
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+
+# Stdlib helpers shared with the Node server's parser live in server/scripts.
+# Streamlit reruns this file on every interaction, so only add the path once.
+_SCRIPTS_DIR = str(Path(__file__).parent / "server" / "scripts")
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+# Page- and panel-specific modules (alerts, analytics/NumPy, regional, snapshot) are
+# imported where they are used, so a rerun only pays for what it renders.
+from dashboard.components import (
+    alerts_strip_html,
+    advisor_chip_value_html,
+    guess_key,
+    header_info,
+    normalize_display_name,
+    rank_color,
+    render_cell,
+    render_score_progress,
+    safe_number,
+    satisfaction_score_bar_html,
+    team_summary_strip_html,
+    technician_card_html,
+    technician_value_html,
+)
+from dashboard.leaderboard import DEFAULT_PAGE_SIZE, page_bounds, ranked_rows, sortable_metrics
+from dashboard.profiling import instrument, profiling_enabled, start_run
+from dashboard.storage import (
+    DocumentCache,
+    document_period,
+    list_periods,
+    partition_by_dealer,
+    publish_documents,
+    resolve_dealer,
+    storage_version,
+    valid_period,
+)
+from dashboard.theme import CUSTOM_CSS
 
 # ============================================================================
 # PAGE CONFIG - Must be first Streamlit command
@@ -28,814 +58,25 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# ============================================================================
-# CUSTOM CSS - Recreating the original design
-# ============================================================================
-
-CUSTOM_CSS = """
-<style>
-:root {
-  --bg0: #FFFFFF;
-  --bg1: #F9FAFB;
-  --card: #F3F4F6;
-  --line: #E5E7EB;
-  --text: #111827;
-  --muted: #6B7280;
-  --gold: #F59E0B;
-  --silver: #9CA3AF;
-  --bronze: #D97706;
-  --good: #10B981;
-  --bad: #EF4444;
-  
-  /* Responsive font sizes - scale with viewport */
-  --font-base: clamp(14px, 1.1vw, 18px);
-  --font-title: clamp(22px, 2.8vw, 36px);
-  --font-subtitle: clamp(12px, 1vw, 16px);
-  --font-rank: clamp(18px, 1.6vw, 26px);
-  --font-name: clamp(18px, 1.6vw, 24px);
-  --font-chip-label: clamp(12px, 1vw, 15px);
-  --font-chip-value: clamp(14px, 1.2vw, 20px);
-  --font-kpi-label: clamp(12px, 1vw, 15px);
-  --font-kpi-value: clamp(15px, 1.3vw, 20px);
-  
-  /* Responsive spacing */
-  --spacing-xs: clamp(4px, 0.4vw, 8px);
-  --spacing-sm: clamp(6px, 0.6vw, 10px);
-  --spacing-md: clamp(8px, 0.8vw, 12px);
-  --spacing-lg: clamp(10px, 1vw, 16px);
-  --spacing-xl: clamp(12px, 1.2vw, 20px);
-  
-  /* Card spacing */
-  --card-padding: clamp(8px, 1vw, 14px);
-  --card-gap: clamp(6px, 0.8vw, 12px);
-}
-
-/* Hide Streamlit branding and padding */
-#MainMenu {visibility: hidden;}
-footer {visibility: hidden;}
-header {visibility: hidden;}
-
-/* Full screen light background */
-.stApp {
-    background: linear-gradient(160deg, #FFFFFF, #F9FAFB);
-    color: #111827;
-}
-
-/* Remove default Streamlit padding */
-.block-container {
-    padding-top: 0.3rem !important;
-    padding-bottom: 0.3rem !important;
-    padding-left: clamp(0.5rem, 1vw, 1.5rem) !important;
-    padding-right: clamp(0.5rem, 1vw, 1.5rem) !important;
-    max-width: 100% !important;
-}
-
-/* Custom styling for elements */
-.stButton button {
-    background: rgba(255, 255, 255, 0.7);
-    backdrop-filter: blur(10px);
-    color: #111827;
-    font-weight: 800;
-    border: 1px solid rgba(0, 0, 0, 0.1);
-    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05);
-    padding: var(--spacing-md) var(--spacing-lg);
-    border-radius: clamp(8px, 0.8vw, 12px);
-    cursor: pointer;
-    font-size: var(--font-base);
-    transition: all 0.2s ease;
-}
-
-.stButton button:hover {
-    background: rgba(255, 255, 255, 0.9);
-    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
-    transform: translateY(-1px);
-}
-
-/* File uploader styling */
-.uploadedFile {
-    border: 1px solid #E5E7EB;
-    border-radius: 12px;
-    padding: var(--spacing-md);
-    background: #F9FAFB;
-}
-
-/* Expander styling */
-.streamlit-expanderHeader {
-    background: transparent !important;
-    border: none !important;
-    color: #111827 !important;
-    font-weight: 800 !important;
-}
-
-/* Mono font for numbers */
-.mono {
-    font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-}
-
-/* Muted text */
-.muted {
-    color: #A7B3DA;
-    opacity: 0.95;
-}
-
-/* Dot separator */
-.dot {
-    opacity: 0.7;
-    margin: 0 0.5rem;
-}
-
-/* Responsive title and headers */
-.dashboard-title {
-    font-size: var(--font-title);
-    font-weight: 800;
-    margin-bottom: clamp(2px, 0.3vw, 4px);
-    line-height: 1.1;
-}
-
-.dashboard-subtitle {
-    font-size: var(--font-subtitle);
-    margin-bottom: clamp(4px, 0.5vw, 6px);
-    line-height: 1.3;
-}
-
-/* Responsive advisor card */
-.advisor-card {
-    border-radius: clamp(8px, 1vw, 12px);
-    margin-bottom: clamp(4px, 0.5vw, 6px);
-    overflow: hidden;
-    box-shadow: 0 clamp(2px, 0.3vw, 4px) clamp(6px, 0.8vw, 10px) rgba(0, 0, 0, 0.08);
-}
-
-/* Collapsed view - responsive layout */
-.advisor-collapsed {
-    padding: var(--card-padding);
-    display: grid;
-    grid-template-columns: 
-        minmax(50px, 0.4fr) 
-        minmax(150px, 2fr) 
-        repeat(4, minmax(120px, 1fr)) 
-        minmax(40px, 0.3fr);
-    gap: clamp(4px, 0.5vw, 8px);
-    align-items: center;
-}
-
-.advisor-rank {
-    font-weight: 950;
-    font-size: var(--font-rank);
-    opacity: 0.95;
-}
-
-.advisor-name {
-    font-weight: 950;
-    font-size: var(--font-name);
-    white-space: nowrap;
-    overflow: hidden;
-    text-overflow: ellipsis;
-}
-
-/* Metric chips - responsive */
-.metric-chip {
-    border: 1px solid #E5E7EB;
-    border-radius: 999px;
-    padding: clamp(6px, 0.6vw, 8px) clamp(8px, 0.8vw, 10px);
-    background: #F9FAFB;
-    display: flex;
-    flex-direction: column;
-    gap: clamp(3px, 0.4vw, 5px);
-    min-width: 0;
-}
-
-.chip-label {
-    font-size: var(--font-chip-label);
-    font-weight: 700;
-    color: var(--muted);
-    white-space: nowrap;
-    overflow: hidden;
-    text-overflow: ellipsis;
-}
-
-.chip-value {
-    font-size: var(--font-chip-value);
-    font-weight: 800;
-}
-
-/* Expanded view - responsive grid - HORIZONTAL OPTIMIZED */
-.kpi-grid-container {
-    border-top: 1px solid #E5E7EB;
-    padding: var(--spacing-md) var(--spacing-lg);
-    background: #F9FAFB;
-}
-
-.kpi-grid {
-    display: grid;
-    /* Optimize for horizontal layout - more columns, fewer rows */
-    grid-template-columns: repeat(auto-fit, minmax(clamp(160px, 15vw, 220px), 1fr));
-    gap: var(--spacing-sm) var(--spacing-md);
-    grid-auto-flow: row;
-    align-items: stretch;
-}
-
-.kpi-card {
-    border: 1px solid #E5E7EB;
-    border-radius: clamp(10px, 1vw, 14px);
-    padding: var(--spacing-md) var(--spacing-lg);
-    background: #FFFFFF;
-    min-width: 0;
-    display: flex;
-    flex-direction: column;
-    justify-content: space-between;
-    min-height: clamp(75px, 8vw, 95px);
-}
-
-.kpi-label {
-    font-size: var(--font-kpi-label);
-    font-weight: 700;
-    color: var(--muted);
-    margin-bottom: var(--spacing-xs);
-    line-height: 1.25;
-    word-wrap: break-word;
-    overflow: hidden;
-    text-overflow: ellipsis;
-    display: -webkit-box;
-    -webkit-line-clamp: 2;
-    -webkit-box-orient: vertical;
-}
-
-.kpi-value {
-    font-size: var(--font-kpi-value);
-    font-weight: 800;
-    min-width: 0;
-    word-wrap: break-word;
-    line-height: 1.2;
-}
-
-/* Circular progress - responsive sizing */
-.progress-container {
-    display: flex;
-    align-items: center;
-    gap: var(--spacing-sm);
-}
-
-.progress-svg {
-    width: clamp(36px, 3vw, 48px);
-    height: clamp(36px, 3vw, 48px);
-    transform: rotate(-90deg);
-    filter: drop-shadow(0 2px 4px rgba(0, 0, 0, 0.1));
-    flex-shrink: 0;
-}
-
-.progress-text {
-    font-size: var(--font-chip-value);
-    font-weight: 800;
-    min-width: clamp(55px, 5.5vw, 80px);
-}
-
-/* Media queries for specific breakpoints - HORIZONTAL OPTIMIZED */
-@media (max-width: 1400px) {
-    .advisor-collapsed {
-        grid-template-columns: 
-            minmax(50px, 0.4fr) 
-            minmax(120px, 1.5fr) 
-            repeat(4, minmax(100px, 1fr)) 
-            minmax(35px, 0.2fr);
-    }
-    
-    .kpi-grid {
-        /* Keep 5-6 columns even on medium screens */
-        grid-template-columns: repeat(auto-fit, minmax(clamp(150px, 14vw, 200px), 1fr));
-    }
-}
-
-@media (max-width: 1100px) {
-    .advisor-collapsed {
-        grid-template-columns: 
-            minmax(45px, 0.3fr) 
-            minmax(100px, 1.2fr) 
-            repeat(2, minmax(90px, 1fr)) 
-            minmax(30px, 0.2fr);
-        grid-template-rows: auto auto;
-    }
-    
-    .advisor-collapsed > :nth-child(n+5):nth-child(-n+6) {
-        grid-column: 3 / 5;
-    }
-    
-    .kpi-grid {
-        /* Keep 4-5 columns on tablets - prioritize horizontal */
-        grid-template-columns: repeat(auto-fit, minmax(clamp(140px, 18vw, 180px), 1fr));
-    }
-}
-
-@media (max-width: 900px) {
-    .kpi-grid {
-        /* 3-4 columns on smaller tablets */
-        grid-template-columns: repeat(auto-fit, minmax(clamp(130px, 22vw, 170px), 1fr));
-    }
-}
-
-@media (max-width: 768px) {
-    .advisor-collapsed {
-        display: flex;
-        flex-direction: column;
-        align-items: stretch;
-        gap: var(--spacing-sm);
-    }
-    
-    .metric-chip {
-        width: 100%;
-    }
-    
-    .kpi-grid {
-        /* Still maintain 2-3 columns on mobile landscape */
-        grid-template-columns: repeat(auto-fit, minmax(clamp(120px, 30vw, 160px), 1fr));
-    }
-    
-    .block-container {
-        padding-left: 0.5rem !important;
-        padding-right: 0.5rem !important;
-    }
-}
-
-@media (max-width: 600px) {
-    .kpi-grid {
-        /* Only go to 2 columns on very small screens */
-        grid-template-columns: repeat(auto-fit, minmax(clamp(140px, 45vw, 200px), 1fr));
-    }
-}
-
-@media (min-width: 1800px) {
-    :root {
-        --font-base: 16px;
-        --font-title: 34px;
-        --font-rank: 24px;
-        --font-name: 22px;
-    }
-    
-    .kpi-grid {
-        /* Maximum columns on large screens */
-        grid-template-columns: repeat(auto-fit, minmax(clamp(160px, 12vw, 220px), 1fr));
-    }
-}
-</style>
-"""
-
-# ============================================================================
-# XLSX PARSING (stdlib only - from parse_xlsx.py)
-# ============================================================================
-
-NS = {
-    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
-    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
-}
-
-def _col_to_index(col: str) -> int:
-    idx = 0
-    for ch in col:
-        if "A" <= ch <= "Z":
-            idx = idx * 26 + (ord(ch) - 64)
-    return idx
-
-def _parse_shared_strings(z: zipfile.ZipFile) -> List[str]:
-    p = "xl/sharedStrings.xml"
-    if p not in z.namelist():
-        return []
-    root = ET.fromstring(z.read(p))
-    out: List[str] = []
-    for si in root.findall("main:si", NS):
-        ts = [t.text or "" for t in si.findall(".//main:t", NS)]
-        out.append("".join(ts))
-    return out
-
-def _parse_workbook_sheets(z: zipfile.ZipFile) -> List[Tuple[str, str]]:
-    wb_root = ET.fromstring(z.read("xl/workbook.xml"))
-    rel_root = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
-    rid_to_target = {
-        rel.get("Id"): rel.get("Target") for rel in rel_root.findall("rel:Relationship", NS)
-    }
-
-    sheets: List[Tuple[str, str]] = []
-    for s in wb_root.findall("main:sheets/main:sheet", NS):
-        rid = s.get("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id")
-        name = s.get("name") or "Sheet"
-        target = rid_to_target.get(rid)
-        if not target:
-            continue
-        if not target.startswith("xl/"):
-            target = "xl/" + target
-        sheets.append((name, target))
-    return sheets
-
-def _parse_sheet_rows(z: zipfile.ZipFile, sheet_path: str, shared: List[str]) -> List[List[str]]:
-    root = ET.fromstring(z.read(sheet_path))
-    rows: List[List[str]] = []
-    for row in root.findall(".//main:sheetData/main:row", NS):
-        cells: Dict[str, str] = {}
-        for c in row.findall("main:c", NS):
-            r = c.get("r")
-            if not r:
-                continue
-            col = "".join([ch for ch in r if ch.isalpha()])
-            v = c.find("main:v", NS)
-            if v is None:
-                continue
-            val = v.text or ""
-            t = c.get("t")
-            if t == "s":
-                try:
-                    val = shared[int(val)]
-                except Exception:
-                    pass
-            cells[col] = val
-
-        if not cells:
-            rows.append([])
-            continue
-
-        max_col = max(_col_to_index(k) for k in cells)
-        arr = [""] * max_col
-        for k, v in cells.items():
-            arr[_col_to_index(k) - 1] = v
-        rows.append(arr)
-    return rows
-
-def _normalize_row(row: List[str]) -> List[str]:
-    r = list(row)
-    while r and (r[-1] is None or str(r[-1]).strip() == ""):
-        r.pop()
-    return [("" if v is None else str(v).strip()) for v in r]
-
-def _find_header_row(rows: List[List[str]]) -> Optional[int]:
-    for i, row in enumerate(rows):
-        r = _normalize_row(row)
-        if not r:
-            continue
-        lower = [c.lower() for c in r if c]
-        if "employee" in lower and "rank" in lower:
-            return i
-    return None
-
-PERCENT_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*%\s*$")
-NUMBER_RE = re.compile(r"^\s*-?\d+(?:\.\d+)?\s*$")
-
-def _coerce_value(v: str) -> Tuple[Any, str]:
-    if v is None:
-        return "", "string"
-    s = str(v).strip()
-    if s == "":
-        return "", "string"
-    m = PERCENT_RE.match(s)
-    if m:
-        return float(m.group(1)), "percent"
-    if NUMBER_RE.match(s):
-        if "." in s:
-            return float(s), "number"
-        try:
-            return int(s), "number"
-        except Exception:
-            return float(s), "number"
-    return s, "string"
-
-def _parse_filters(filters_rows: List[List[str]]) -> Dict[str, Any]:
-    meta: Dict[str, Any] = {}
-    for row in filters_rows:
-        r = _normalize_row(row)
-        if len(r) < 2:
-            continue
-        k, v = r[0], r[1]
-        if not k or k.lower() == "parameters":
-            continue
-        meta_key = re.sub(r"\s+", " ", k.strip())
-        meta[meta_key] = v
-
-    exported = meta.get("Exported")
-    if isinstance(exported, str) and exported.strip():
-        raw = exported.strip()
-        meta["Exported Raw"] = raw
-        m = re.match(
-            r"^(?P<mon>[A-Za-z]{3})\s+(?P<day>\d{1,2})\s+(?P<year>\d{4})\s+(?P<h>\d{1,2}):(?P<mi>\d{2}):(?P<s>\d{2}):(?P<ms>\d{3})(?P<ampm>AM|PM)$",
-            raw.replace(" ", ""),
-        )
-        if m:
-            try:
-                mon = m.group("mon")
-                day = int(m.group("day"))
-                year = int(m.group("year"))
-                h = int(m.group("h"))
-                mi = int(m.group("mi"))
-                sec = int(m.group("s"))
-                ms = int(m.group("ms"))
-                ampm = m.group("ampm")
-                dt = datetime.strptime(f"{mon} {day} {year} {h}:{mi}:{sec} {ampm}", "%b %d %Y %I:%M:%S %p")
-                dt = dt.replace(microsecond=ms * 1000)
-                meta["Exported ISO"] = dt.isoformat()
-            except Exception:
-                pass
-    return meta
-
-@dataclass
-class Dataset:
-    title: str
-    columns: List[str]
-    rows: List[Dict[str, Any]]
-    field_types: Dict[str, str]
-
-def _build_dataset(data_rows: List[List[str]]) -> Dataset:
-    header_idx = _find_header_row(data_rows)
-    if header_idx is None:
-        raise RuntimeError("Could not find header row (expected 'Employee' and 'Rank').")
-
-    title = ""
-    for j in range(header_idx - 1, -1, -1):
-        r = _normalize_row(data_rows[j])
-        if len(r) == 1 and r[0]:
-            title = r[0]
-            break
-    if not title:
-        title = "Service Employee Rank"
-
-    columns = _normalize_row(data_rows[header_idx])
-    columns = [c for c in columns if c]
-
-    rows_out: List[Dict[str, Any]] = []
-    field_types: Dict[str, str] = {c: "string" for c in columns}
-
-    for raw_row in data_rows[header_idx + 1 :]:
-        r = _normalize_row(raw_row)
-        if not r or not any(c for c in r):
-            continue
-        if len(r) < len(columns):
-            r = r + [""] * (len(columns) - len(r))
-
-        obj: Dict[str, Any] = {}
-        has_employee = False
-        for i, col in enumerate(columns):
-            val, t = _coerce_value(r[i] if i < len(r) else "")
-            obj[col] = val
-            if field_types.get(col) == "string" and t in ("number", "percent"):
-                field_types[col] = t
-            if col.lower() == "employee" and isinstance(val, str) and val.strip():
-                has_employee = True
-        if has_employee:
-            rows_out.append(obj)
-
-    return Dataset(title=title, columns=columns, rows=rows_out, field_types=field_types)
-
-def parse_xlsx_bytes(xlsx_bytes: bytes) -> Dict[str, Any]:
-    """Parse XLSX from bytes and return document dict"""
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-        tmp.write(xlsx_bytes)
-        tmp_path = tmp.name
-    
-    try:
-        with zipfile.ZipFile(tmp_path, "r") as z:
-            shared = _parse_shared_strings(z)
-            sheets = _parse_workbook_sheets(z)
-            sheet_map: Dict[str, List[List[str]]] = {}
-            for name, sheet_path in sheets:
-                sheet_map[name] = _parse_sheet_rows(z, sheet_path, shared)
-
-        data_sheet = None
-        filters_sheet = None
-        for k in sheet_map.keys():
-            if k.lower() == "data":
-                data_sheet = k
-            if k.lower() == "filters":
-                filters_sheet = k
-
-        if not data_sheet:
-            for k, rows in sheet_map.items():
-                if _find_header_row(rows) is not None:
-                    data_sheet = k
-                    break
-        if not data_sheet:
-            data_sheet = list(sheet_map.keys())[0]
-
-        dataset = _build_dataset(sheet_map[data_sheet])
-        meta = {}
-        if filters_sheet and filters_sheet in sheet_map:
-            meta = _parse_filters(sheet_map[filters_sheet])
-
-        doc = {
-            "meta": meta,
-            "dataset": {
-                "title": dataset.title,
-                "columns": dataset.columns,
-                "rows": dataset.rows,
-            },
-            "fieldTypes": dataset.field_types,
-            "source": {
-                "dataSheet": data_sheet,
-                "filtersSheet": filters_sheet or "",
-            },
-            "generatedAt": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
-        }
-        return doc
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-
-def parse_satisfaction_score_xlsx(xlsx_bytes: bytes) -> Dict[str, Any]:
-    """Parse Satisfaction Score XLSX from bytes and return simplified dict"""
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-        tmp.write(xlsx_bytes)
-        tmp_path = tmp.name
-    
-    try:
-        with zipfile.ZipFile(tmp_path, "r") as z:
-            shared = _parse_shared_strings(z)
-            sheets = _parse_workbook_sheets(z)
-            sheet_map: Dict[str, List[List[str]]] = {}
-            for name, sheet_path in sheets:
-                sheet_map[name] = _parse_sheet_rows(z, sheet_path, shared)
-
-        # Find data sheet
-        data_sheet = None
-        for k in sheet_map.keys():
-            if k.lower() == "data":
-                data_sheet = k
-                break
-        if not data_sheet:
-            data_sheet = list(sheet_map.keys())[0]
-
-        rows = sheet_map[data_sheet]
-        
-        # Parse the satisfaction score data
-        # Expected format:
-        # Row 0: Header with timestamp
-        # Row 1: Column names (empty, "Score", "National", "Region", "Area")
-        # Row 2: Data values
-        
-        if len(rows) < 3:
-            raise RuntimeError("Satisfaction Score file has insufficient rows")
-        
-        # Find the data row (row with "Overall Performance")
-        data_row = None
-        for row in rows:
-            if row and len(row) > 0 and 'overall performance' in str(row[0]).lower():
-                data_row = row
-                break
-        
-        if not data_row or len(data_row) < 5:
-            raise RuntimeError("Could not find Overall Performance data row")
-        
-        # Extract scores
-        try:
-            score = float(data_row[1]) if data_row[1] else 0
-            national = float(data_row[2]) if data_row[2] else 0
-            region = float(data_row[3]) if data_row[3] else 0
-            area = float(data_row[4]) if data_row[4] else 0
-        except (ValueError, IndexError) as e:
-            raise RuntimeError(f"Could not parse satisfaction scores: {e}")
-
-        doc = {
-            "score": score,
-            "national": national,
-            "region": region,
-            "area": area,
-            "generatedAt": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
-        }
-        return doc
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-
-# ============================================================================
-# UTILITY FUNCTIONS (from utils.js)
-# ============================================================================
-
-def safe_number(v):
-    """Convert value to number or return None"""
-    if v is None or v == "":
-        return None
-    if isinstance(v, (int, float)):
-        return v if not (isinstance(v, float) and (v != v or v == float('inf') or v == float('-inf'))) else None
-    try:
-        n = float(v)
-        return n if not (n != n or n == float('inf') or n == float('-inf')) else None
-    except:
-        return None
-
-def format_percent(v):
-    """Format number as percentage"""
-    n = safe_number(v)
-    if n is None:
-        return "—"
-    return f"{n:.1f}%"
-
-def format_score(v):
-    """Format score with appropriate decimals"""
-    n = safe_number(v)
-    if n is None:
-        return "—"
-    if n >= 100:
-        return f"{int(n)}"
-    return f"{n:.1f}"
-
-def guess_key(columns, candidates):
-    """Find column name from candidates (case-insensitive)"""
-    lower_map = {c.lower(): c for c in columns}
-    for c in candidates:
-        hit = lower_map.get(c.lower())
-        if hit:
-            return hit
-    return None
-
-def rank_color(rank):
-    """Get color class for rank"""
-    if rank == 1:
-        return "gold"
-    if rank == 2:
-        return "silver"
-    if rank == 3:
-        return "bronze"
-    return "neutral"
-
-def normalize_column_name(name):
-    """Normalize column name for comparison"""
-    return re.sub(r"\s+", " ", str(name or "").strip().lower())
-
-def normalize_display_name(name):
-    """Normalize employee name to title case for consistent display"""
-    if not name or name == "—":
-        return name
-    # Convert to title case (first letter of each word capitalized)
-    return str(name).strip().title()
-
-def percent_threshold_for_column(column_name):
-    """Get threshold for green/red coloring"""
-    key = normalize_column_name(column_name)
-    
-    if key == "vehicle returned cleaner":
-        return 50
-    if key == "paperwork <7 minutes":
-        return 75
-    if key == "advisor provided video":
-        return 75
-    if key == "escorted to vehicle":
-        return 75
-    
-    return 100
+# Opt-in render profiling: ?profile=1 (or DASHBOARD_PROFILE=1) times each section of this run,
+# counts its st.markdown / st.columns calls and HTML bytes, and shows them in an overlay
+profiling = profiling_enabled(st.query_params.get("profile"))
+if profiling:
+    instrument(st)
+render_profile = start_run(profiling)
 
 # ============================================================================
 # UI COMPONENTS
 # ============================================================================
 
-def render_circular_progress(value, column_name=""):
-    """Render circular progress indicator for percentages"""
-    n = safe_number(value)
-    if n is None:
-        return "—"
-    
-    clamped = max(0, min(100, n))
-    r = 12
-    c = 2 * 3.14159 * r
-    dash = (clamped / 100) * c
-    threshold = percent_threshold_for_column(column_name)
-    good = n >= threshold
-    pct_color = "#10B981" if good else "#EF4444"
-    
-    # Return clean HTML without extra whitespace
-    svg = f'<div class="progress-container"><svg class="progress-svg" viewBox="0 0 36 36"><circle cx="18" cy="18" r="{r}" fill="none" stroke="#E5E7EB" stroke-width="4"/><circle cx="18" cy="18" r="{r}" fill="none" stroke="{pct_color}" stroke-width="4" stroke-linecap="round" stroke-dasharray="{dash} {c - dash}"/></svg><span class="mono progress-text">{format_percent(n)}</span></div>'
-    return svg
-
-def render_score_progress(value):
-    """Render circular progress indicator for satisfaction score (out of 1100)"""
-    n = safe_number(value)
-    if n is None:
-        return "—"
+def render_technician_leaderboard(doc, limit=None, page=0, page_size=None):
+    """Render simplified technician leaderboard showing only rank, name, and Fixed Right First Time.
     
-    # Calculate percentage out of 1100
-    percentage = (n / 1100) * 100
-    clamped = max(0, min(100, percentage))
-    
-    r = 12
-    c = 2 * 3.14159 * r
-    dash = (clamped / 100) * c
-    
-    # Red if under 895, green otherwise
-    score_color = "#EF4444" if n < 895 else "#10B981"
-    
-    # Display the raw score, not percentage
-    score_display = format_score(n)
-    
-    # Return clean HTML without extra whitespace
-    svg = f'<div class="progress-container"><svg class="progress-svg" viewBox="0 0 36 36"><circle cx="18" cy="18" r="{r}" fill="none" stroke="#E5E7EB" stroke-width="4"/><circle cx="18" cy="18" r="{r}" fill="none" stroke="{score_color}" stroke-width="4" stroke-linecap="round" stroke-dasharray="{dash} {c - dash}"/></svg><span class="mono progress-text">{score_display}</span></div>'
-    return svg
-
-def render_cell(value, cell_type, column_name=""):
-    """Render cell based on type"""
-    if cell_type == "percent":
-        return render_circular_progress(value, column_name)
-    if cell_type == "number":
-        n = safe_number(value)
-        return f'<span class="mono">{n if n is not None else "—"}</span>'
-    return f'<span>{value if value not in ["", None] else "—"}</span>'
-
-def render_technician_leaderboard(doc):
-    """Render simplified technician leaderboard showing only rank, name, and Fixed Right First Time"""
+    Returns how many pages the list spans at `page_size`.
+    """
     if doc is None:
         st.markdown("<p class='muted'>No technician data available</p>", unsafe_allow_html=True)
-        return
+        return 1
     
     dataset = doc.get('dataset', {})
     columns = dataset.get('columns', [])
@@ -847,41 +88,77 @@ def render_technician_leaderboard(doc):
     key_rank = guess_key(columns, ["Rank"])
     key_fixed_first = guess_key(columns, ["Fixed right first time"])
     
-    # Sort by rank
-    sorted_rows = sorted(rows, key=lambda r: safe_number(r.get(key_rank)) if key_rank else float('inf'))
-    sorted_rows = [r for r in sorted_rows if safe_number(r.get(key_rank) if key_rank else None) is not None]
+    # Sort by rank (index lookup for compacted rows)
+    ranked = ranked_rows(rows, key_rank, key_rank, safe_number, limit=limit)
     
-    if not sorted_rows:
+    if not ranked:
         st.warning("No technician data found")
-        return
+        return 1
+    
+    # Only the current page is rendered; shorter lists stay on their last page
+    start, stop, page, pages = page_bounds(len(ranked), page, page_size)
     
     # Render simplified cards - all in one line
-    for idx, row in enumerate(sorted_rows):
+    for idx, row in ranked[start:stop]:
         rank = safe_number(row.get(key_rank) if key_rank else None)
         name = normalize_display_name(row.get(key_employee)) if key_employee else "—"
-        fixed_first = row.get(key_fixed_first) if key_fixed_first else None
-        fixed_first_type = field_types.get(key_fixed_first, 'string') if key_fixed_first else 'string'
-        
-        # Fixed Right First Time percentage
-        if fixed_first_type == 'percent':
-            rendered_value = render_circular_progress(fixed_first, key_fixed_first or "Fixed right first time")
-        else:
-            rendered_value = f'<span class="mono" style="font-weight: 800;">{safe_number(fixed_first) if safe_number(fixed_first) is not None else "—"}</span>'
         
-        # Compact single-line card
+        # Compact single-line card with the Fixed Right First Time percentage
+        st.markdown(technician_card_html(rank, name, technician_value_html(row, key_fixed_first, field_types)), unsafe_allow_html=True)
+    
+    if pages > 1:
+        st.markdown(f"<p class='muted' style='font-size: 11px; text-align: center; margin: 4px 0 0;'>{start + 1}–{stop} of {len(ranked)}</p>", unsafe_allow_html=True)
+    return pages
+
+def render_regional_leaderboard(board, scope, limit=None, page=0, page_size=None):
+    """Render the advisors of every dealer in an Area or Region as one leaderboard.
+    
+    Returns how many pages the list spans at `page_size`.
+    """
+    # ?top=N streams just the first N out of the merge; otherwise the kept ranking is reused
+    ranked = board.ranked(scope, limit=limit)
+    if not ranked:
+        st.warning(f"No advisors found for {scope[0].title()} {scope[1].upper()}")
+        return 1
+    
+    start, stop, page, pages = page_bounds(len(ranked), page, page_size)
+    
+    for position, entry in enumerate(ranked[start:stop], start=start + 1):
+        name = normalize_display_name(entry.employee) or "—"
         st.markdown(f"""
         <div style='border: 1px solid #E5E7EB; border-radius: 8px; padding: 6px 10px; 
                     background: linear-gradient(180deg, #FFFFFF, #F9FAFB); margin-bottom: 4px;
                     box-shadow: 0 1px 3px rgba(0, 0, 0, 0.05);'>
             <div style='display: flex; align-items: center; gap: 6px; justify-content: space-between;'>
                 <div style='display: flex; align-items: center; gap: 6px; flex: 1; min-width: 0;'>
-                    <div style='font-size: 13px; font-weight: 950; min-width: 22px;'>#{int(rank) if rank else '—'}</div>
+                    <div style='font-size: 13px; font-weight: 950; min-width: 30px;'>#{position}</div>
                     <div style='font-size: 12px; font-weight: 700; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;'>{name}</div>
+                    <div class='muted' style='font-size: 11px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;'>{entry.dealer_name}</div>
                 </div>
-                <div style='flex-shrink: 0;'>{rendered_value}</div>
+                <div style='flex-shrink: 0;'>{render_score_progress(entry.score)}</div>
             </div>
         </div>
         """, unsafe_allow_html=True)
+    
+    render_leaderboard_pager(page, pages, start, stop, len(ranked))
+    return pages
+
+def render_leaderboard_pager(page, pages, start, stop, total):
+    """Prev/next controls under the advisor leaderboard (hidden when everything fits on one page)"""
+    if pages <= 1:
+        return
+    
+    col_prev, col_label, col_next = st.columns([1, 3, 1])
+    with col_prev:
+        if st.button("◂ Prev", key="leaderboard_prev", disabled=page == 0, use_container_width=True):
+            st.session_state.leaderboard_page = page - 1
+            st.rerun()
+    with col_label:
+        st.markdown(f"<p class='muted' style='font-size: 12px; text-align: center; margin: 6px 0 0;'>Page {page + 1} of {pages} <span class='dot'>•</span> {start + 1}–{stop} of {total}</p>", unsafe_allow_html=True)
+    with col_next:
+        if st.button("Next ▸", key="leaderboard_next", disabled=page >= pages - 1, use_container_width=True):
+            st.session_state.leaderboard_page = page + 1
+            st.rerun()
 
 def render_satisfaction_score_bar(doc):
     """Render horizontal satisfaction score bar with Nation/Region/Area scores"""
@@ -889,22 +166,28 @@ def render_satisfaction_score_bar(doc):
         st.markdown("<p class='muted'>No satisfaction score data available</p>", unsafe_allow_html=True)
         return
     
-    score = doc.get('score', 0)
-    national = doc.get('national', 0)
-    region = doc.get('region', 0)
-    area = doc.get('area', 0)
-    
-    # Calculate percentage for bar (out of 1000)
-    percentage = (score / 1000) * 100
-    clamped = max(0, min(100, percentage))
-    
-    # Color: red if under 895, green otherwise
-    bar_color = "#EF4444" if score < 895 else "#10B981"
-    
-    # Build the HTML string - more compact version
-    html = f"""<div style='border: 1px solid #E5E7EB; border-radius: 10px; padding: 12px 16px; background: linear-gradient(180deg, #FFFFFF, #F9FAFB); box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05); margin-bottom: 0px;'><div style='font-size: 14px; font-weight: 800; color: #111827; margin-bottom: 10px;'>Overall Service Satisfaction Score</div><div style='margin-bottom: 10px;'><div style='display: flex; align-items: center; gap: 10px;'><div style='font-family: ui-monospace, monospace; font-size: 20px; font-weight: 950; color: {bar_color}; min-width: 70px;'>{score:.1f}</div><div style='flex: 1; height: 24px; background: #E5E7EB; border-radius: 12px; position: relative; overflow: hidden;'><div style='position: absolute; top: 0; left: 0; height: 100%; background: {bar_color}; width: {clamped}%; border-radius: 12px; transition: width 0.3s ease;'></div></div><div style='font-size: 13px; font-weight: 700; color: #6B7280; min-width: 50px;'>/ 1000</div></div></div><div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 12px; border-top: 1px solid #E5E7EB; padding-top: 10px;'><div style='text-align: center;'><div style='font-size: 11px; font-weight: 700; color: #6B7280; margin-bottom: 4px;'>Nation</div><div style='display: flex; align-items: center; justify-content: center; gap: 3px;'><span style='font-size: 10px; color: #6B7280;'>{'▼' if score < national else '▲'}</span><span style='font-family: ui-monospace, monospace; font-size: 16px; font-weight: 800; color: {'#EF4444' if score < national else '#10B981'};'>{national:.1f}</span></div></div><div style='text-align: center;'><div style='font-size: 11px; font-weight: 700; color: #6B7280; margin-bottom: 4px;'>Region</div><div style='display: flex; align-items: center; justify-content: center; gap: 3px;'><span style='font-size: 10px; color: #6B7280;'>{'▼' if score < region else '▲'}</span><span style='font-family: ui-monospace, monospace; font-size: 16px; font-weight: 800; color: {'#EF4444' if score < region else '#10B981'};'>{region:.1f}</span></div></div><div style='text-align: center;'><div style='font-size: 11px; font-weight: 700; color: #6B7280; margin-bottom: 4px;'>Area</div><div style='display: flex; align-items: center; justify-content: center; gap: 3px;'><span style='font-size: 10px; color: #6B7280;'>{'▼' if score < area else '▲'}</span><span style='font-family: ui-monospace, monospace; font-size: 16px; font-weight: 800; color: {'#EF4444' if score < area else '#10B981'};'>{area:.1f}</span></div></div></div></div>"""
-    
-    st.markdown(html, unsafe_allow_html=True)
+    st.markdown(satisfaction_score_bar_html(doc), unsafe_allow_html=True)
+
+def document_version(doc):
+    """Identity of a document's contents, used as a cache key for derived data"""
+    if not doc:
+        return ""
+    rows = doc.get('dataset', {}).get('rows', [])
+    ingest_id = (doc.get('ingest') or {}).get('id', '')
+    return f"{doc.get('generatedAt', '')}|{ingest_id}|{len(rows)}"
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_team_summary(version, _doc):
+    """Team aggregates for an advisors document, computed once per document version"""
+    from dashboard.analytics import document_team_summary
+    return document_team_summary(_doc)
+
+def render_team_summary_strip(summary):
+    """Render a one-line strip of team aggregates (weighted score, distribution, KPI averages)"""
+    if summary is None:
+        return
+    from dashboard.analytics import SCORE_TARGET
+    st.markdown(team_summary_strip_html(summary, SCORE_TARGET), unsafe_allow_html=True)
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
@@ -913,56 +196,70 @@ def render_satisfaction_score_bar(doc):
 if 'page' not in st.session_state:
     st.session_state.page = 'dashboard'
 
-# Advisors data (backward compatible with 'doc')
-if 'doc_advisors' not in st.session_state:
-    # Try to load from storage/latest.json if exists
-    storage_path = Path(__file__).parent / 'storage' / 'latest.json'
-    if storage_path.exists():
-        try:
-            with open(storage_path, 'r') as f:
-                st.session_state.doc_advisors = json.load(f)
-        except:
-            st.session_state.doc_advisors = None
-    else:
-        st.session_state.doc_advisors = None
-
-# Technicians data
-if 'doc_technicians' not in st.session_state:
-    # Try to load from storage/technicians.json if exists
-    storage_path = Path(__file__).parent / 'storage' / 'technicians.json'
-    if storage_path.exists():
-        try:
-            with open(storage_path, 'r') as f:
-                st.session_state.doc_technicians = json.load(f)
-        except:
-            st.session_state.doc_technicians = None
-    else:
-        st.session_state.doc_technicians = None
-
-# Satisfaction Score data
-if 'doc_satisfaction_score' not in st.session_state:
-    # Try to load from storage/satisfaction_score.json if exists
-    storage_path = Path(__file__).parent / 'storage' / 'satisfaction_score.json'
-    if storage_path.exists():
-        try:
-            with open(storage_path, 'r') as f:
-                st.session_state.doc_satisfaction_score = json.load(f)
-        except:
-            st.session_state.doc_satisfaction_score = None
-    else:
-        st.session_state.doc_satisfaction_score = None
-
-# Backward compatibility
-if 'doc' not in st.session_state:
-    st.session_state.doc = st.session_state.doc_advisors
+@st.cache_resource
+def shared_document_cache():
+    """Document sets of the recently viewed dealers, shared by every session of this process"""
+    return DocumentCache()
+
+def load_session_documents(dealer, period=None):
+    """Show `dealer`'s advisors, technicians and satisfaction score (loaded together as one consistent set)
+
+    `period` picks that period's set; None is the set published most recently.
+    """
+    version, docs = shared_document_cache().get(dealer, period=period)
+    st.session_state.dealer = dealer
+    st.session_state.period = period
+    st.session_state.storage_version = version
+    for kind, doc in docs.items():
+        st.session_state[f'doc_{kind}'] = doc
+    st.session_state.doc = st.session_state.doc_advisors  # Backward compatibility
+
+render_profile.mark("storage")
+
+# Each dealer has its own dashboard URL: ?dealer=<id> (not needed while there is only one)
+current_dealer, all_dealers = resolve_dealer(st.query_params.get("dealer"))
+
+def resolve_period(dealer):
+    """The period a dashboard shows (?period=<id>, None for the latest), and every period the dealer has"""
+    periods = list_periods(dealer=dealer)
+    requested = valid_period(st.query_params.get("period"))
+    return (requested if requested in periods else None), periods
+
+# Each period (1D, MTD, QTD, ...) is its own cached set: ?period=<id> switches without reparsing
+current_period, dealer_periods = resolve_period(current_dealer)
+if st.session_state.get('dealer', '') != current_dealer or st.session_state.get('period') != current_period:
+    load_session_documents(current_dealer, current_period)
+
+@st.cache_resource
+def shared_regional_leaderboard():
+    """Every dealer's advisors pre-ranked for the regional leaderboard, shared by every session"""
+    from dashboard.regional import RegionalLeaderboard
+    return RegionalLeaderboard(safe_number)
+
+# Regional leaderboard across dealers: ?region=<Region> or ?area=<Area>
+regional_scope = None
+if st.query_params.get('area') or st.query_params.get('region'):
+    from dashboard.regional import SCOPE_LEVELS, make_scope
+    regional_scope = next(
+        (make_scope(level, st.query_params.get(level)) for level in SCOPE_LEVELS if st.query_params.get(level)),
+        None,
+    )
+if regional_scope is not None:
+    shared_regional_leaderboard().sync()
 
 if 'expanded_rows' not in st.session_state:
     st.session_state.expanded_rows = set()
 
+# Leaderboard page shown (advisors and technicians page together)
+if 'leaderboard_page' not in st.session_state:
+    st.session_state.leaderboard_page = 0
+
 # ============================================================================
 # MAIN APP
 # ============================================================================
 
+render_profile.mark("chrome")
+
 # Inject custom CSS
 st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
@@ -982,89 +279,159 @@ with col3:
 # ============================================================================
 
 if st.session_state.page == 'upload':
-    st.markdown("<h1 class='dashboard-title'>Upload daily XLSX</h1>", unsafe_allow_html=True)
-    st.markdown("<p class='muted dashboard-subtitle'>Choose the exported VWHub files. Upload both files, then click Display Dashboard.</p>", unsafe_allow_html=True)
-    
-    # Service Advisors Uploader
-    st.markdown("### 📊 Service Advisors")
-    uploaded_file_advisors = st.file_uploader("Upload Advisors XLSX", type=['xlsx'], key='xlsx_uploader_advisors')
-    
-    if uploaded_file_advisors is not None:
-        try:
-            with st.spinner('Processing Advisors XLSX file...'):
-                xlsx_bytes = uploaded_file_advisors.read()
-                doc = parse_xlsx_bytes(xlsx_bytes)
-                
-                # Save to session state
-                st.session_state.doc_advisors = doc
-                st.session_state.doc = doc  # Backward compatibility
-                
-                # Save to storage/latest.json
-                storage_dir = Path(__file__).parent / 'storage'
-                storage_dir.mkdir(exist_ok=True)
-                with open(storage_dir / 'latest.json', 'w') as f:
-                    json.dump(doc, f, indent=2)
-                
-                exported = doc.get('meta', {}).get('Exported Raw') or doc.get('meta', {}).get('Exported') or '—'
-                st.success(f"✅ Advisors uploaded successfully! Exported: {exported}")
-                
-        except Exception as e:
-            st.error(f"❌ Failed to process Advisors file: {str(e)}")
+    render_profile.mark("upload")
+    # The XLSX parser, alerts and snapshots are only needed here; dashboard-only sessions never import them
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from dashboard.alerts import process_alerts
+    from dashboard.snapshot import publish_snapshot
+    from parse_xlsx import (
+        ADVISOR_RANK,
+        SATISFACTION_SCORE,
+        TECHNICIAN_RANK,
+        UNKNOWN,
+        ParseLimits,
+        WorkbookLimitError,
+        parse_satisfaction_score_xlsx,
+        parse_xlsx_bytes,
+        sniff_xlsx_bytes,
+    )
     
-    # Add some spacing
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # Service Technicians Uploader
-    st.markdown("### 🔧 Service Technicians")
-    uploaded_file_technicians = st.file_uploader("Upload Technicians XLSX", type=['xlsx'], key='xlsx_uploader_technicians')
+    st.markdown("<h1 class='dashboard-title'>Upload daily XLSX</h1>", unsafe_allow_html=True)
+    st.markdown("<p class='muted dashboard-subtitle'>Choose the exported VWHub files, click Ingest to process them together, then click Display Dashboard.</p>", unsafe_allow_html=True)
     
-    if uploaded_file_technicians is not None:
-        try:
-            with st.spinner('Processing Technicians XLSX file...'):
-                xlsx_bytes = uploaded_file_technicians.read()
-                doc = parse_xlsx_bytes(xlsx_bytes)
-                
-                # Save to session state
-                st.session_state.doc_technicians = doc
-                
-                # Save to storage/technicians.json
-                storage_dir = Path(__file__).parent / 'storage'
-                storage_dir.mkdir(exist_ok=True)
-                with open(storage_dir / 'technicians.json', 'w') as f:
-                    json.dump(doc, f, indent=2)
-                
-                exported = doc.get('meta', {}).get('Exported Raw') or doc.get('meta', {}).get('Exported') or '—'
-                st.success(f"✅ Technicians uploaded successfully! Exported: {exported}")
-                
-        except Exception as e:
-            st.error(f"❌ Failed to process Technicians file: {str(e)}")
+    # Ceilings on what an upload may inflate to (XLSX_MAX_* env vars); a workbook over
+    # one is refused while it streams in instead of exhausting the kiosk's memory
+    parse_limits = ParseLimits.from_env()
     
-    # Add some spacing
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # Service Satisfaction Score Uploader
-    st.markdown("### 📈 Service Satisfaction Score")
-    uploaded_file_satisfaction = st.file_uploader("Upload Service Satisfaction Score XLSX", type=['xlsx'], key='xlsx_uploader_satisfaction')
+    # kind -> (heading, uploader label, widget key, parser)
+    upload_slots = {
+        "advisors": ("### 📊 Service Advisors", "Upload Advisors XLSX", 'xlsx_uploader_advisors', parse_xlsx_bytes),
+        "technicians": ("### 🔧 Service Technicians", "Upload Technicians XLSX", 'xlsx_uploader_technicians', parse_xlsx_bytes),
+        "satisfaction_score": ("### 📈 Service Satisfaction Score", "Upload Service Satisfaction Score XLSX", 'xlsx_uploader_satisfaction', parse_satisfaction_score_xlsx),
+    }
+    slot_titles = {
+        "advisors": "Advisors",
+        "technicians": "Technicians",
+        "satisfaction_score": "Service Satisfaction Score",
+    }
     
-    if uploaded_file_satisfaction is not None:
-        try:
-            with st.spinner('Processing Service Satisfaction Score XLSX file...'):
-                xlsx_bytes = uploaded_file_satisfaction.read()
-                doc = parse_satisfaction_score_xlsx(xlsx_bytes)
-                
-                # Save to session state
-                st.session_state.doc_satisfaction_score = doc
-                
-                # Save to storage/satisfaction_score.json
-                storage_dir = Path(__file__).parent / 'storage'
-                storage_dir.mkdir(exist_ok=True)
-                with open(storage_dir / 'satisfaction_score.json', 'w') as f:
-                    json.dump(doc, f, indent=2)
-                
-                st.success(f"✅ Service Satisfaction Score uploaded successfully! Score: {doc.get('score', '—')}")
-                
-        except Exception as e:
-            st.error(f"❌ Failed to process Service Satisfaction Score file: {str(e)}")
+    # Export kind (as sniffed by parse_xlsx) that belongs in each slot
+    slot_kinds = {
+        "advisors": ADVISOR_RANK,
+        "technicians": TECHNICIAN_RANK,
+        "satisfaction_score": SATISFACTION_SCORE,
+    }
+    kind_slots = {v: k for k, v in slot_kinds.items()}
+    
+    # file_id of the last upload ingested per slot, so reruns don't reparse the same file
+    if 'ingested_uploads' not in st.session_state:
+        st.session_state.ingested_uploads = {}
+    # Sniff result per file_id; it only reads the first rows, but reruns are frequent
+    if 'sniffed_uploads' not in st.session_state:
+        st.session_state.sniffed_uploads = {}
+    
+    def sniff_upload(uploaded):
+        sniff = st.session_state.sniffed_uploads.get(uploaded.file_id)
+        if sniff is None:
+            sniff = st.session_state.sniffed_uploads[uploaded.file_id] = sniff_xlsx_bytes(uploaded.getvalue(), parse_limits)
+        return sniff
+    
+    # Each slot's upload is sniffed first: a file of another kind is routed to the slot it
+    # belongs in, and an unrecognized file is rejected, both before the full parse
+    uploads = {}
+    for kind, (heading, label, widget_key, _parser) in upload_slots.items():
+        st.markdown(heading)
+        uploads[kind] = (st.file_uploader(label, type=['xlsx'], key=widget_key), st.empty())
+        
+        # Add some spacing
+        st.markdown("<br>", unsafe_allow_html=True)
+    
+    # slot to parse as -> (slot the file was dropped in, upload)
+    pending = {}
+    claimed = {
+        kind for kind, (uploaded, _note) in uploads.items()
+        if uploaded is not None and sniff_upload(uploaded).matches((slot_kinds[kind],))
+    }
+    for kind, (uploaded, note) in uploads.items():
+        if uploaded is None:
+            continue
+        sniff = sniff_upload(uploaded)
+        if sniff.kind == UNKNOWN:
+            note.error(f"❌ Not a recognized VWHub export: {sniff.reason}. This file will not be ingested.")
+            continue
+        target = kind if kind in claimed else kind_slots[sniff.kind]
+        if target != kind:
+            if target in claimed or target in pending:
+                note.error(f"❌ This looks like the {slot_titles[target]} export, and that slot already has a file. This file will not be ingested.")
+                continue
+            note.warning(f"↪️ This looks like the {slot_titles[target]} export; it will be ingested there.")
+        if st.session_state.ingested_uploads.get(kind) == uploaded.file_id:
+            note.caption("✅ Ingested")
+        else:
+            pending[target] = (kind, uploaded)
+    
+    # Combined ingest: parse every pending file concurrently, then publish them as one set
+    ingest_label = f"⚡ Ingest {len(pending)} file{'s' if len(pending) != 1 else ''}" if pending else "⚡ Ingest"
+    if st.button(ingest_label, use_container_width=True, disabled=not pending):
+        progress = {kind: st.empty() for kind in pending}
+        for kind, placeholder in progress.items():
+            placeholder.info(f"⏳ Processing {slot_titles[kind]} XLSX file...")
+        
+        def _ingest_one(parser, xlsx_bytes):
+            started = time.perf_counter()
+            return parser(xlsx_bytes, limits=parse_limits), time.perf_counter() - started
+        
+        docs = {}
+        failed = False
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            futures = {
+                pool.submit(_ingest_one, upload_slots[kind][3], uploaded.getvalue()): kind
+                for kind, (_dropped_in, uploaded) in pending.items()
+            }
+            for future in as_completed(futures):
+                kind = futures[future]
+                try:
+                    docs[kind], elapsed = future.result()
+                    progress[kind].info(f"✔️ {slot_titles[kind]} parsed in {elapsed:.2f}s")
+                except WorkbookLimitError as e:
+                    failed = True
+                    progress[kind].error(f"❌ {slot_titles[kind]} file is too large to ingest: {e}")
+                except Exception as e:
+                    failed = True
+                    progress[kind].error(f"❌ Failed to process {slot_titles[kind]} file: {str(e)}")
+        
+        if failed:
+            st.error("Nothing was published. Fix the file(s) above and ingest again.")
+        else:
+            # Each dealer's documents go to its own storage; the Satisfaction Score joins
+            # the dealer of the rank exports next to it, else the dealer being shown
+            groups = partition_by_dealer(docs.items(), fallback=st.session_state.dealer)
+            for dealer, group in groups.items():
+                publish_documents(group, dealer=dealer)
+                try:
+                    process_alerts(group.get("advisors"), dealer=dealer)
+                except Exception as e:
+                    st.warning(f"KPI alerts not checked: {e}")
+                try:
+                    publish_snapshot(dealer=dealer)
+                except Exception as e:
+                    st.warning(f"TV snapshot not updated: {e}")
+            for kind in docs:
+                dropped_in, uploaded = pending[kind]
+                st.session_state.ingested_uploads[dropped_in] = uploaded.file_id
+            shown = next((d for d, group in groups.items() if "advisors" in group), next(iter(groups)))
+            if shown is not None:
+                st.query_params["dealer"] = shown
+            # Show what was just published, whichever period it is
+            st.query_params.pop("period", None)
+            load_session_documents(shown)
+            
+            for kind, doc in docs.items():
+                if kind == "satisfaction_score":
+                    progress[kind].success(f"✅ Service Satisfaction Score uploaded successfully! Score: {doc.get('score', '—')}")
+                else:
+                    exported = doc.get('meta', {}).get('Exported Raw') or doc.get('meta', {}).get('Exported') or '—'
+                    progress[kind].success(f"✅ {slot_titles[kind]} uploaded successfully! Exported: {exported}")
     
     # Display Dashboard button - only show if at least one file has been uploaded
     st.markdown("<br>", unsafe_allow_html=True)
@@ -1081,7 +448,69 @@ else:
     doc_advisors = st.session_state.doc_advisors
     doc_technicians = st.session_state.doc_technicians
     
-    if doc_advisors is None and doc_technicians is None:
+    # TV mode: ?top=N shows only the first N advisors and technicians
+    try:
+        top_n = max(1, int(st.query_params.get("top", "")))
+    except ValueError:
+        top_n = None
+    
+    # Large rosters render one page at a time: ?page_size=N (default 25, 0 shows everything),
+    # and ?rotate=<seconds> advances the page on a timer for TV rotation
+    try:
+        page_size = max(0, int(st.query_params.get("page_size", DEFAULT_PAGE_SIZE)))
+    except ValueError:
+        page_size = DEFAULT_PAGE_SIZE
+    try:
+        rotate_seconds = max(5.0, float(st.query_params.get("rotate", "")))
+    except ValueError:
+        rotate_seconds = None
+    # ?period_rotate=<seconds> cycles the TV through the dealer's periods
+    try:
+        period_rotate_seconds = max(5.0, float(st.query_params.get("period_rotate", "")))
+    except ValueError:
+        period_rotate_seconds = None
+    st.session_state.leaderboard_pages = 1
+    
+    # Documents published meanwhile (watch-folder daemon, another session) are picked up
+    # within ?reload=<seconds> (default 5, 0 turns it off); each check is one stat per file
+    try:
+        reload_seconds = max(0.0, float(st.query_params.get("reload", 5)))
+    except ValueError:
+        reload_seconds = 5.0
+    if reload_seconds:
+        @st.fragment(run_every=max(1.0, reload_seconds))
+        def reload_published_documents():
+            """Rerun with the stored documents once any of them has been republished"""
+            if regional_scope is not None:
+                # Only the dealers that republished are re-read and merged in
+                if shared_regional_leaderboard().sync():
+                    st.rerun()
+                return
+            # The first upload for a dealer can also change which dealer this URL shows
+            dealer, _dealers = resolve_dealer(st.query_params.get("dealer"))
+            period, _periods = resolve_period(dealer)
+            if (
+                dealer == st.session_state.dealer
+                and period == st.session_state.period
+                and storage_version(dealer=dealer, period=period) == st.session_state.get('storage_version')
+            ):
+                return
+            load_session_documents(dealer, period)
+            st.rerun()
+        
+        reload_published_documents()
+    
+    if regional_scope is not None:
+        render_profile.mark("regional")
+        level, value = regional_scope
+        st.markdown(f"<h1 class='dashboard-title'>{level.title()} {value.upper()} Advisor Leaderboard</h1>", unsafe_allow_html=True)
+        regional_pages = render_regional_leaderboard(shared_regional_leaderboard(), regional_scope, limit=top_n, page=st.session_state.leaderboard_page, page_size=page_size)
+        st.session_state.leaderboard_pages = regional_pages
+    elif current_dealer is None and all_dealers:
+        # Several dealers and none in the URL: link to each dealer's dashboard
+        st.markdown("<h1 class='dashboard-title'>Choose a dealer</h1>", unsafe_allow_html=True)
+        st.markdown("\n".join(f"- [{dealer}](?dealer={dealer})" for dealer in all_dealers))
+    elif doc_advisors is None and doc_technicians is None:
         st.markdown("<h1 class='dashboard-title'>Service Employee Dashboard</h1>", unsafe_allow_html=True)
         st.info("📂 No data available. Please upload an XLSX file to get started.")
         st.markdown("""
@@ -1100,58 +529,41 @@ else:
         # ====================================================================
         # EXTRACT HEADER INFO FROM ADVISORS DATA (if available)
         # ====================================================================
+        render_profile.mark("header")
         if doc_advisors is not None:
-            doc = doc_advisors
-            meta = doc.get('meta', {})
-            dataset = doc.get('dataset', {})
-            title = dataset.get('title', 'Service Employee Rank')
-            columns = dataset.get('columns', [])
-            rows = dataset.get('rows', [])
-            
-            # Find key columns for header info
-            key_dealer = guess_key(columns, ["Dealer"])
-            key_area = guess_key(columns, ["Area"])
-            key_region = guess_key(columns, ["Region"])
-            
-            # Header info
-            level = meta.get('Level', '')
-            dealer_number = ""
-            dealer_name = ""
-            if ' - ' in level:
-                parts = level.split(' - ', 1)
-                dealer_number = parts[0].strip()
-                dealer_name = parts[1].strip()
-            else:
-                dealer_name = level.strip()
-            
-            first_row = rows[0] if rows else {}
-            area = str(first_row.get(key_area, '')).strip() if key_area else ""
-            region = str(first_row.get(key_region, '')).strip() if key_region else ""
-            if not dealer_number and key_dealer:
-                dealer_number = str(first_row.get(key_dealer, '')).strip()
+            # Title, dealer / area / region line and export time (shared with the TV snapshots)
+            title, subtitle, exported_display = header_info(doc_advisors)
             
             # Display Header at top of page
             st.markdown(f"<h1 class='dashboard-title'>{title}</h1>", unsafe_allow_html=True)
-            
-            subtitle_parts = []
-            if dealer_number:
-                subtitle_parts.append(f"Dealer: {dealer_number}")
-            if dealer_name:
-                subtitle_parts.append(dealer_name)
-            if area:
-                subtitle_parts.append(f"Area: {area}")
-            if region:
-                subtitle_parts.append(f"Region: {region}")
-            subtitle_parts.append("Period: 1D")
-            
-            subtitle = " <span class='dot'>•</span> ".join(subtitle_parts)
             st.markdown(f"<p class='muted dashboard-subtitle'>{subtitle}</p>", unsafe_allow_html=True)
-            
-            exported_display = meta.get('Exported Raw') or meta.get('Exported') or '—'
             st.markdown(f"<p class='muted dashboard-subtitle'>Last update: <strong>{exported_display}</strong></p>", unsafe_allow_html=True)
+            
+            # Score and KPI drop alerts raised by the export on screen
+            from dashboard.alerts import export_key, recent_alerts
+            alerts = recent_alerts(dealer=current_dealer, export=export_key(doc_advisors))
+            if alerts:
+                st.markdown(alerts_strip_html(alerts), unsafe_allow_html=True)
         else:
             st.markdown("<h1 class='dashboard-title'>Service Employee Rank</h1>", unsafe_allow_html=True)
         
+        # Period switcher once the dealer has published more than one period
+        if len(dealer_periods) > 1:
+            shown_period = current_period or document_period(doc_advisors or doc_technicians)
+            chosen_period = st.radio(
+                "Period",
+                dealer_periods,
+                index=dealer_periods.index(shown_period) if shown_period in dealer_periods else 0,
+                format_func=str.upper,
+                horizontal=True,
+                key=f"period_choice_{shown_period}",
+                label_visibility="collapsed",
+            )
+            if chosen_period != shown_period:
+                st.query_params["period"] = chosen_period
+                st.session_state.leaderboard_page = 0
+                st.rerun()
+        
         # ====================================================================
         # CREATE SINGLE ROW: LEFT COLUMN (SATISFACTION + ADVISORS) | RIGHT COLUMN (TECHNICIANS)
         # ====================================================================
@@ -1162,13 +574,40 @@ else:
             # Satisfaction Score at top of left column
             doc_satisfaction_score = st.session_state.doc_satisfaction_score
             if doc_satisfaction_score is not None:
+                render_profile.mark("satisfaction_score")
                 render_satisfaction_score_bar(doc_satisfaction_score)
             
+            # Team aggregates across all advisors (cached per document version)
+            if doc_advisors is not None:
+                render_profile.mark("team_summary")
+                render_team_summary_strip(cached_team_summary(document_version(doc_advisors), doc_advisors))
+            
             # Small spacing between satisfaction score and advisors
             st.markdown("<div style='margin-top: 8px;'></div>", unsafe_allow_html=True)
             
             # Advisors section (continues in same left column)
-            st.markdown("<h2 style='font-size: clamp(18px, 2vw, 24px); font-weight: 800; margin-bottom: 4px; margin-top: 0px;'>Advisors</h2>", unsafe_allow_html=True)
+            render_profile.mark("advisors")
+            col_heading, col_sort = st.columns([3, 2])
+            with col_heading:
+                st.markdown("<h2 style='font-size: clamp(18px, 2vw, 24px); font-weight: 800; margin-bottom: 4px; margin-top: 0px;'>Advisors</h2>", unsafe_allow_html=True)
+            advisor_sort_metric = None
+            if doc_advisors is not None:
+                advisor_columns = doc_advisors.get('dataset', {}).get('columns', [])
+                advisor_rank_key = guess_key(advisor_columns, ["Rank"])
+                sort_options = sortable_metrics(advisor_columns, doc_advisors.get('fieldTypes', {}))
+                if advisor_rank_key in sort_options:
+                    # Rank first so it is the default; ?sort=<column> preselects another metric
+                    sort_options.remove(advisor_rank_key)
+                    sort_options.insert(0, advisor_rank_key)
+                requested_sort = st.query_params.get("sort")
+                with col_sort:
+                    advisor_sort_metric = st.selectbox(
+                        "Sort by",
+                        sort_options,
+                        index=sort_options.index(requested_sort) if requested_sort in sort_options else 0,
+                        key="advisor_sort_metric",
+                        label_visibility="collapsed",
+                    ) if sort_options else None
             
             # Add column headers
             st.markdown("""
@@ -1210,20 +649,21 @@ else:
                 key_spoke_immediately = guess_key(columns, ["Spoke to advisor immediately"])
                 key_kept_informed = guess_key(columns, ["Kept informed"])
                 
-                # Sort by rank
-                sorted_rows = sorted(rows, key=lambda r: safe_number(r.get(key_rank)) if key_rank else float('inf'))
-                sorted_rows = [r for r in sorted_rows if safe_number(r.get(key_rank) if key_rank else None) is not None]
+                # Order by the selected metric (an index lookup); ?top=N shows only the first N
+                ranked = ranked_rows(rows, advisor_sort_metric or key_rank, key_rank, safe_number, limit=top_n)
                 
                 # Detail columns (exclude only collapsed view fields and metadata)
                 exclude = set([key_employee, key_dealer, key_area, key_region, key_rank, key_score, key_fixed_first, key_spoke_immediately, key_kept_informed])
                 exclude = {c for c in exclude if c}
                 detail_columns = [c for c in columns if c not in exclude]
                 
-                # Leaderboard
-                if not sorted_rows:
+                # Leaderboard: only the current page of cards is rendered
+                start, stop, page, pages = page_bounds(len(ranked), st.session_state.leaderboard_page, page_size)
+                st.session_state.leaderboard_pages = max(st.session_state.leaderboard_pages, pages)
+                if not ranked:
                     st.warning("No advisor data found in the uploaded file.")
                 else:
-                    for idx, row in enumerate(sorted_rows):
+                    for idx, row in ranked[start:stop]:
                         rank = safe_number(row.get(key_rank) if key_rank else None)
                         name = normalize_display_name(row.get(key_employee)) if key_employee else "—"
                         score = row.get(key_score) if key_score else None
@@ -1271,10 +711,7 @@ else:
                                 </div>
                                 """, unsafe_allow_html=True)
                             with col_fixed:
-                                if fixed_first_type == 'percent':
-                                    rendered_value = render_circular_progress(fixed_first, key_fixed_first or "")
-                                else:
-                                    rendered_value = f'<span class="mono chip-value">{safe_number(fixed_first) if safe_number(fixed_first) is not None else "—"}</span>'
+                                rendered_value = advisor_chip_value_html(fixed_first, fixed_first_type, key_fixed_first)
                                 st.markdown(f"""
                                 <div class='metric-chip'>
                                     <div class='chip-label'>Fixed right first time</div>
@@ -1282,10 +719,7 @@ else:
                                 </div>
                                 """, unsafe_allow_html=True)
                             with col_spoke:
-                                if spoke_immediately_type == 'percent':
-                                    rendered_value = render_circular_progress(spoke_immediately, key_spoke_immediately or "")
-                                else:
-                                    rendered_value = f'<span class="mono chip-value">{safe_number(spoke_immediately) if safe_number(spoke_immediately) is not None else "—"}</span>'
+                                rendered_value = advisor_chip_value_html(spoke_immediately, spoke_immediately_type, key_spoke_immediately)
                                 st.markdown(f"""
                                 <div class='metric-chip'>
                                     <div class='chip-label'>Spoke to advisor immediately</div>
@@ -1293,10 +727,7 @@ else:
                                 </div>
                                 """, unsafe_allow_html=True)
                             with col_kept:
-                                if kept_informed_type == 'percent':
-                                    rendered_value = render_circular_progress(kept_informed, key_kept_informed or "")
-                                else:
-                                    rendered_value = f'<span class="mono chip-value">{safe_number(kept_informed) if safe_number(kept_informed) is not None else "—"}</span>'
+                                rendered_value = advisor_chip_value_html(kept_informed, kept_informed_type, key_kept_informed)
                                 st.markdown(f"""
                                 <div class='metric-chip'>
                                     <div class='chip-label'>Kept informed</div>
@@ -1333,6 +764,8 @@ else:
                                 st.markdown(grid_html, unsafe_allow_html=True)
                             
                             st.markdown("</div>", unsafe_allow_html=True)
+                    
+                    render_leaderboard_pager(page, pages, start, stop, len(ranked))
             else:
                 st.info("📂 No advisor data available. Please upload advisor data.")
         
@@ -1344,6 +777,7 @@ else:
         
         # RIGHT COLUMN: Technicians
         with col_technicians:
+            render_profile.mark("technicians")
             st.markdown("<h2 style='font-size: clamp(14px, 1.6vw, 20px); font-weight: 800; margin-bottom: 6px;'>Technicians</h2>", unsafe_allow_html=True)
             
             # Add column headers
@@ -1358,12 +792,55 @@ else:
             </div>
             """, unsafe_allow_html=True)
             
-            render_technician_leaderboard(doc_technicians)
+            technician_pages = render_technician_leaderboard(doc_technicians, limit=top_n, page=st.session_state.leaderboard_page, page_size=page_size)
+            st.session_state.leaderboard_pages = max(st.session_state.leaderboard_pages, technician_pages)
+    
+    if rotate_seconds and st.session_state.leaderboard_pages > 1:
+        @st.fragment(run_every=rotate_seconds)
+        def rotate_leaderboard_page():
+            """Advance to the next page on each timer tick, wrapping to the first"""
+            now = time.monotonic()
+            last = st.session_state.get('leaderboard_rotated_at')
+            if last is None or now - last < rotate_seconds * 0.9:
+                # Full reruns (first load, button clicks) also run this; only timer ticks advance
+                if last is None:
+                    st.session_state.leaderboard_rotated_at = now
+                return
+            st.session_state.leaderboard_rotated_at = now
+            st.session_state.leaderboard_page = (st.session_state.leaderboard_page + 1) % st.session_state.leaderboard_pages
+            st.rerun()
+        
+        rotate_leaderboard_page()
+    
+    if period_rotate_seconds and regional_scope is None and len(dealer_periods) > 1:
+        @st.fragment(run_every=period_rotate_seconds)
+        def rotate_period():
+            """Show the dealer's next period on each timer tick (each one is already cached)"""
+            now = time.monotonic()
+            last = st.session_state.get('period_rotated_at')
+            if last is None or now - last < period_rotate_seconds * 0.9:
+                if last is None:
+                    st.session_state.period_rotated_at = now
+                return
+            st.session_state.period_rotated_at = now
+            shown = current_period or document_period(doc_advisors or doc_technicians)
+            position = dealer_periods.index(shown) if shown in dealer_periods else -1
+            st.query_params["period"] = dealer_periods[(position + 1) % len(dealer_periods)]
+            st.session_state.leaderboard_page = 0
+            st.rerun()
+        
+        rotate_period()
 
 # ============================================================================
 # FOOTER
 # ============================================================================
 
+render_profile.mark("footer")
+
 st.markdown("<br><br>", unsafe_allow_html=True)
 st.markdown("<p class='muted' style='text-align: center; font-size: 12px;'>Service Employee Dashboard • Streamlit Version</p>", unsafe_allow_html=True)
 
+if profiling:
+    render_profile.finish()
+    st.markdown(render_profile.overlay_html(), unsafe_allow_html=True)
+    render_profile.log(page=st.session_state.page, dealer=st.session_state.get('dealer'))
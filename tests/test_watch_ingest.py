@@ -0,0 +1,71 @@
+"""Watch-folder routing of Employee Rank exports that don't name their role."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for _p in (ROOT, ROOT / "server" / "scripts", ROOT / "benchmarks"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from dashboard.storage import load_documents  # noqa: E402
+from parse_xlsx import sniff_xlsx_bytes  # noqa: E402
+from synth import rank_workbook  # noqa: E402
+from watch_ingest import FolderIngest  # noqa: E402
+
+DEALER = "426085"
+
+
+def _ingest(drop: Path, storage: Path) -> FolderIngest:
+    ingest = FolderIngest(drop, storage, settle=0.0)
+    ingest.poll()  # first sighting
+    ingest.poll()
+    return ingest
+
+
+def test_role_less_exports_are_routed_by_file_name(tmp_path):
+    drop, storage = tmp_path / "drop", tmp_path / "storage"
+    drop.mkdir()
+    rank_workbook(drop / "Advisors.xlsx", 5, seed=1)
+    rank_workbook(drop / "Technicians.xlsx", 3, seed=2)
+    assert not sniff_xlsx_bytes((drop / "Advisors.xlsx").read_bytes()).role_known
+
+    _ingest(drop, storage)
+
+    docs = load_documents(storage, dealer=DEALER)
+    assert len(docs["advisors"]["dataset"]["rows"]) == 5
+    assert len(docs["technicians"]["dataset"]["rows"]) == 3
+
+
+def test_role_less_export_without_a_hint_is_held(tmp_path):
+    drop, storage = tmp_path / "drop", tmp_path / "storage"
+    drop.mkdir()
+    rank_workbook(drop / "export_1.xlsx", 5, seed=1)
+    rank_workbook(drop / "export_2.xlsx", 3, seed=2)
+
+    _ingest(drop, storage)
+
+    docs = load_documents(storage, dealer=DEALER)
+    assert docs.get("advisors") is None
+    assert docs.get("technicians") is None
+
+    # Renamed with a hint, it is picked up on the next polls
+    (drop / "export_2.xlsx").rename(drop / "tech_export.xlsx")
+    _ingest(drop, storage)
+    docs = load_documents(storage, dealer=DEALER)
+    assert docs.get("advisors") is None
+    assert len(docs["technicians"]["dataset"]["rows"]) == 3
+
+
+def test_folder_name_is_the_fallback_hint(tmp_path):
+    drop, storage = tmp_path / "technicians", tmp_path / "storage"
+    drop.mkdir()
+    rank_workbook(drop / "export.xlsx", 4)
+
+    _ingest(drop, storage)
+
+    docs = load_documents(storage, dealer=DEALER)
+    assert docs.get("advisors") is None
+    assert len(docs["technicians"]["dataset"]["rows"]) == 4
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Watch-folder ingest: publish VWHub exports dropped into a folder without the upload page.
+
+Usage:
+  python3 watch_ingest.py /path/to/drop-folder [--interval 1] [--settle 2] [--once]
+
+The folder is polled (no OS file notifications, so it works on network shares). A new
+or changed `.xlsx` is picked up once its size and mtime have held still for `--settle`
+seconds, so a file still being copied is never read. It is then hashed, sniffed to
+find which export it is, parsed and published into `storage/` with the same atomic
+set publish as the Streamlit upload page, under the dealer named in each export; files
+that become ready together are published as one set per dealer. The dashboard reloads
+published documents within a few seconds. A file that fails to parse is not recorded
+as ingested: it stays pending and is retried, after a backoff that doubles from
+`RETRY_BASE_SECONDS` up to `RETRY_MAX_SECONDS`, until it parses or changes. Each new
+advisors export is checked for score and KPI drops (`dashboard.alerts`), and each
+dealer's TV snapshot (`dashboard.snapshot`) is re-rendered.
+
+An Employee Rank export often doesn't say whether it ranks advisors or technicians.
+Such a file goes where its name says ("Advisors.xlsx", "tech_export.xlsx"), else where
+the watched folder's name says; with neither it is held, with a warning, until it is
+renamed or replaced. It is never published as advisors by default.
+
+Nothing is redone for unchanged files: a file whose size and mtime match what was last
+ingested is only stat'ed, and a file whose bytes hash the same as an export currently
+published for its kind is not parsed again. That record is kept in
+`storage/.watch_state.json` so a restart doesn't reparse the folder. Parse limits come
+from the XLSX_MAX_* variables.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+_SCRIPTS_DIR = str(Path(__file__).resolve().parent / "server" / "scripts")
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+from dashboard.alerts import process_alerts  # noqa: E402
+from dashboard.snapshot import publish_snapshot  # noqa: E402
+from dashboard.storage import default_storage_dir, partition_by_dealer, publish_documents, valid_dealer  # noqa: E402
+from parse_xlsx import (  # noqa: E402
+    ADVISOR_RANK,
+    RANK_KINDS,
+    SATISFACTION_SCORE,
+    TECHNICIAN_RANK,
+    UNKNOWN,
+    ParseLimits,
+    parse_satisfaction_score_xlsx,
+    parse_xlsx_bytes,
+    sniff_xlsx_bytes,
+)
+
+log = logging.getLogger("watch_ingest")
+
+STATE_FILE = ".watch_state.json"
+
+# Sniffed export kind -> (storage kind, parser)
+KIND_SLOTS: Dict[str, Tuple[str, Callable[..., Dict[str, Any]]]] = {
+    ADVISOR_RANK: ("advisors", parse_xlsx_bytes),
+    TECHNICIAN_RANK: ("technicians", parse_xlsx_bytes),
+    SATISFACTION_SCORE: ("satisfaction_score", parse_satisfaction_score_xlsx),
+}
+
+# Wait before retrying a file that could not be read or parsed, doubled on each failure
+RETRY_BASE_SECONDS = 5.0
+RETRY_MAX_SECONDS = 300.0
+
+# (size, mtime_ns) of a file as last stat'ed
+Signature = Tuple[int, int]
+
+# (signature, path, sha256, sniffed kind, role known, storage kind, xlsx bytes) of a file to parse
+Chosen = Tuple[Signature, str, str, str, bool, str, bytes]
+
+
+@dataclass
+class _Pending:
+    """A file seen to change; ready once its signature has held for the settle time.
+
+    After a failed read or parse it is not ready again before `retry_at`.
+    """
+
+    signature: Signature
+    since: float
+    failures: int = 0
+    retry_at: float = 0.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(name, "")))
+    except ValueError:
+        return default
+
+
+def _role_hint(name: str) -> Optional[str]:
+    """Rank kind named by a file or folder name ("Technicians", "tech_export", "adv-1D"), if any."""
+    words = [w for w in re.split(r"[^a-z]+", name.lower()) if w]
+    technician = any(w.startswith("tech") for w in words)
+    advisor = any(w.startswith("adv") for w in words)
+    if technician == advisor:
+        return None
+    return TECHNICIAN_RANK if technician else ADVISOR_RANK
+
+
+def _is_export(entry: os.DirEntry) -> bool:
+    # Excel's lock files (~$name.xlsx) and hidden partial copies are never exports
+    name = entry.name
+    return name.lower().endswith(".xlsx") and not name.startswith(("~$", ".")) and entry.is_file()
+
+
+class FolderIngest:
+    """Polls `watch_dir` and publishes settled exports into `storage_dir`."""
+
+    def __init__(
+        self,
+        watch_dir: Path,
+        storage_dir: Path,
+        settle: float = 2.0,
+        limits: Optional[ParseLimits] = None,
+        clock: Callable[[], float] = time.monotonic,
+        dealer: Optional[str] = None,
+    ):
+        self.watch_dir = watch_dir
+        self.storage_dir = storage_dir
+        self.settle = settle
+        self.dealer = dealer
+        self.limits = limits or ParseLimits.from_env()
+        self._clock = clock
+        self._pending: Dict[str, _Pending] = {}
+        state = self._load_state()
+        # path -> {"size", "mtime_ns", "sha256", "kind", "roleKnown"} of the last version handled
+        self._handled: Dict[str, Dict[str, Any]] = state.get("files", {})
+        # dealer -> storage kind -> sha256 of the export last published for it
+        self._published: Dict[str, Dict[str, str]] = state.get("published", {})
+        # Dealer of the last rank export published; a lone Satisfaction Score goes there
+        self._last_dealer: Optional[str] = state.get("lastDealer")
+
+    @property
+    def _state_path(self) -> Path:
+        return self.storage_dir / STATE_FILE
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save_state(self) -> None:
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._state_path.with_name(f"{STATE_FILE}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(
+                {"files": self._handled, "published": self._published, "lastDealer": self._last_dealer}, f, indent=2
+            )
+        os.replace(tmp, self._state_path)
+
+    def _scan(self) -> Dict[str, Signature]:
+        seen: Dict[str, Signature] = {}
+        try:
+            entries = list(os.scandir(self.watch_dir))
+        except OSError as e:
+            log.warning("Cannot list %s: %s", self.watch_dir, e)
+            return seen
+        for entry in entries:
+            try:
+                if not _is_export(entry):
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue  # removed between listing and stat
+            seen[entry.path] = (st.st_size, st.st_mtime_ns)
+        return seen
+
+    def _settled(self, seen: Dict[str, Signature]) -> List[str]:
+        """Paths whose new signature has held still for `settle` seconds."""
+        now = self._clock()
+        for path in list(self._pending):
+            if path not in seen:
+                del self._pending[path]
+        ready = []
+        for path, signature in seen.items():
+            handled = self._handled.get(path)
+            if handled is not None and (handled["size"], handled["mtime_ns"]) == signature:
+                self._pending.pop(path, None)
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending.signature != signature:
+                self._pending[path] = _Pending(signature, now)
+            elif now - pending.since >= self.settle and now >= pending.retry_at:
+                ready.append(path)
+        return ready
+
+    def _mark(self, path: str, signature: Signature, sha256: str, kind: str, role_known: bool) -> None:
+        self._pending.pop(path, None)
+        self._handled[path] = {
+            "size": signature[0],
+            "mtime_ns": signature[1],
+            "sha256": sha256,
+            "kind": kind,
+            "roleKnown": role_known,
+        }
+
+    def _route(self, path: str, kind: str, role_known: bool) -> Optional[str]:
+        """Export kind to publish a file as; None for a rank export whose role nothing names."""
+        if kind not in RANK_KINDS or role_known:
+            return kind
+        return _role_hint(Path(path).stem) or _role_hint(self.watch_dir.name)
+
+    def _back_off(self, path: str) -> None:
+        """Keep a failed file pending, to be retried once its backoff has passed."""
+        pending = self._pending.get(path)
+        if pending is None:
+            return
+        pending.failures += 1
+        delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (pending.failures - 1))
+        pending.retry_at = self._clock() + delay
+        log.info("Retrying %s in %gs", path, delay)
+
+    def poll(self) -> List[int]:
+        """Run one scan; returns the ingest ids published (one per dealer)."""
+        seen = self._scan()
+        ready = self._settled(seen)
+        if not ready:
+            return []
+
+        chosen: List[Chosen] = []
+        for path in ready:
+            signature = seen[path]
+            try:
+                xlsx_bytes = Path(path).read_bytes()
+            except OSError as e:
+                log.warning("Cannot read %s: %s", path, e)
+                self._back_off(path)
+                continue
+            sha256 = hashlib.sha256(xlsx_bytes).hexdigest()
+            known = self._kind_of(sha256)
+            if known is None:
+                sniff = sniff_xlsx_bytes(xlsx_bytes, self.limits)
+                known = (sniff.kind, sniff.role_known)
+                if sniff.kind == UNKNOWN:
+                    log.warning("%s is not a recognized VWHub export: %s", path, sniff.reason)
+            kind, role_known = known
+            if kind == UNKNOWN:
+                # A rejected file is retried only once it changes again
+                self._mark(path, signature, sha256, kind, role_known)
+                continue
+            target = self._route(path, kind, role_known)
+            if target is None:
+                # Held like a rejected file: renaming it makes it a new path, so it is seen again
+                log.warning(
+                    "%s is an Employee Rank export that names no role; held. Put Advisor or Technician "
+                    "in its file name (or the watched folder's) to ingest it.",
+                    path,
+                )
+                self._mark(path, signature, sha256, kind, role_known)
+                continue
+            slot = KIND_SLOTS[target][0]
+            if sha256 in self._published_hashes(slot):
+                log.info("%s is already published; skipped", path)
+                self._mark(path, signature, sha256, kind, role_known)
+                continue
+            chosen.append((signature, path, sha256, kind, role_known, slot, xlsx_bytes))
+
+        # Oldest first, so the newest file of a kind wins within each dealer
+        chosen.sort(key=lambda c: c[0][1])
+        parsed, failed = self._parse(chosen)
+        for signature, path, sha256, kind, role_known, _slot, _bytes in chosen:
+            if path in failed:
+                self._back_off(path)
+            else:
+                self._mark(path, signature, sha256, kind, role_known)
+        hashes = {id(doc): sha256 for _slot, doc, sha256 in parsed}
+        ingest_ids = []
+        fallback = self.dealer or self._last_dealer
+        for dealer, group in partition_by_dealer(((slot, doc) for slot, doc, _sha in parsed), fallback).items():
+            ingest_ids.append(publish_documents(group, self.storage_dir, dealer))
+            for slot, doc in group.items():
+                self._published.setdefault(dealer or "", {})[slot] = hashes[id(doc)]
+            if any(slot != "satisfaction_score" for slot in group):
+                self._last_dealer = dealer
+            log.info("Published %s for dealer %s (ingest %d)", ", ".join(sorted(group)), dealer or "-", ingest_ids[-1])
+            try:
+                alerts = process_alerts(group.get("advisors"), self.storage_dir, dealer)
+                if alerts:
+                    log.warning("%d KPI alert(s) for dealer %s", len(alerts), dealer or "-")
+            except Exception as e:
+                log.warning("KPI alerts for dealer %s not checked: %s", dealer or "-", e)
+            try:
+                publish_snapshot(self.storage_dir, dealer)
+            except Exception as e:
+                log.warning("TV snapshot for dealer %s not updated: %s", dealer or "-", e)
+        self._save_state()
+        return ingest_ids
+
+    def _published_hashes(self, slot: str) -> Set[str]:
+        return {hashes[slot] for hashes in self._published.values() if slot in hashes}
+
+    def _kind_of(self, sha256: str) -> Optional[Tuple[str, bool]]:
+        """(kind, role known) of a file already sniffed with these exact bytes, if any."""
+        return next(
+            ((h["kind"], h.get("roleKnown", False)) for h in self._handled.values() if h["sha256"] == sha256), None
+        )
+
+    def _parse(self, chosen: List[Chosen]) -> Tuple[List[Tuple[str, Dict[str, Any], str]], Set[str]]:
+        """Parse the chosen files concurrently into (storage kind, document, sha256), in order.
+
+        A file that fails is logged and left out; the paths that failed are returned with them.
+        """
+        parsers = {slot: parser for slot, parser in KIND_SLOTS.values()}
+        parsed: List[Tuple[str, Dict[str, Any], str]] = []
+        failed: Set[str] = set()
+        if not chosen:
+            return parsed, failed
+        with ThreadPoolExecutor(max_workers=min(len(chosen), 4)) as pool:
+            futures = [
+                (slot, path, sha256, pool.submit(parsers[slot], xlsx_bytes, limits=self.limits))
+                for _signature, path, sha256, _kind, _role_known, slot, xlsx_bytes in chosen
+            ]
+            for slot, path, sha256, future in futures:
+                try:
+                    parsed.append((slot, future.result(), sha256))
+                except Exception as e:
+                    log.error("Failed to parse %s: %s", path, e)
+                    failed.add(path)
+        return parsed, failed
+
+    def run(self, interval: float = 1.0) -> None:
+        log.info("Watching %s every %gs (settle %gs)", self.watch_dir, interval, self.settle)
+        while True:
+            started = self._clock()
+            try:
+                self.poll()
+            except Exception:
+                log.exception("Poll failed")
+            time.sleep(max(0.0, interval - (self._clock() - started)))
+
+
+def _arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument(
+        "watch_dir",
+        nargs="?",
+        default=os.environ.get("INGEST_WATCH_DIR"),
+        help="folder the exports land in (env INGEST_WATCH_DIR)",
+    )
+    p.add_argument(
+        "--storage",
+        default=None,
+        help="where documents are published (default: DASHBOARD_STORAGE_DIR or ./storage)",
+    )
+    p.add_argument(
+        "--interval",
+        type=float,
+        default=_env_float("INGEST_POLL_SECONDS", 1.0),
+        help="seconds between scans (default: %(default)s; env INGEST_POLL_SECONDS)",
+    )
+    p.add_argument(
+        "--settle",
+        type=float,
+        default=_env_float("INGEST_SETTLE_SECONDS", 2.0),
+        help="seconds a file must stay unchanged before it is read (default: %(default)s; env INGEST_SETTLE_SECONDS)",
+    )
+    p.add_argument(
+        "--dealer",
+        default=os.environ.get("INGEST_DEALER"),
+        help="dealer id for a Satisfaction Score dropped without a rank export "
+        "(default: the dealer of the last rank export; env INGEST_DEALER)",
+    )
+    p.add_argument(
+        "--once",
+        action="store_true",
+        help="ingest what is already in the folder (ignoring --settle) and exit",
+    )
+    return p
+
+
+def main(argv: List[str]) -> int:
+    args = _arg_parser().parse_args(argv[1:])
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if not args.watch_dir:
+        print("No folder to watch: pass one or set INGEST_WATCH_DIR.", file=sys.stderr)
+        return 2
+    watch_dir = Path(args.watch_dir).expanduser().resolve()
+    if not watch_dir.is_dir():
+        print(f"Not a folder: {watch_dir}", file=sys.stderr)
+        return 2
+    storage_dir = Path(args.storage).expanduser().resolve() if args.storage else default_storage_dir()
+    dealer = valid_dealer(args.dealer) if args.dealer else None
+    if args.dealer and dealer is None:
+        print(f"Not a dealer id: {args.dealer}", file=sys.stderr)
+        return 2
+
+    if args.once:
+        ingest = FolderIngest(watch_dir, storage_dir, settle=0.0, dealer=dealer)
+        ingest.poll()  # first sighting of each file
+        ingest.poll()
+        return 0
+    try:
+        FolderIngest(watch_dir, storage_dir, settle=args.settle, dealer=dealer).run(args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))